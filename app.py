@@ -5,327 +5,422 @@ AI行业洞察每日汇总网站
 """
 
 import os
-import json
 import re
 import time
+import base64
 import hashlib
-from datetime import datetime, timedelta
-from flask import Flask, render_template, jsonify, request
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta
+from functools import lru_cache, partial
+from types import MappingProxyType
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from markupsafe import Markup
 
-try:
-    import requests
-    from bs4 import BeautifulSoup
-    SEARCH_AVAILABLE = True
-except ImportError:
-    SEARCH_AVAILABLE = False
-    print("警告: requests或beautifulsoup4未安装，专家搜索功能将使用模拟数据")
+import codec
+import metrics
+from cache import TTLCache
+from date_index import DateIndex
+from dedup import collapse_near_duplicates
+from dates import display_date, format_date, normalize_date, parse_date, today_str
+from ingest import IngestBatcher, validate_ingest_item
+from models import InsightItem, json_default, to_items
+from payload import EncodedPayload, negotiate_encoding
+from refresher import SnapshotRefresher
+from search_index import SearchIndex
+from search_backends import create_search_backend, generate_mock_expert_info
+from storage import create_storage, read_json_file, write_json_file
 
 
 def format_date_for_input(date_str):
     """将日期字符串转换为HTML date input格式 (YYYY-MM-DD)"""
     if not date_str:
         return ''
-    try:
-        if '年' in date_str:
-            # 从 'YYYY年MM月DD日' 转换为 'YYYY-MM-DD'
-            date_str = date_str.replace('年', '-').replace('月', '-').replace('日', '')
-            # 确保格式正确
-            parts = date_str.split('-')
-            if len(parts) == 3:
-                year = parts[0]
-                month = parts[1].zfill(2)
-                day = parts[2].zfill(2)
-                return f"{year}-{month}-{day}"
-        else:
-            # 如果已经是 YYYY-MM-DD 格式，直接返回
-            datetime.strptime(date_str, "%Y-%m-%d")
-            return date_str
-    except:
-        pass
-    return ''
+    return normalize_date(date_str) or ''
+
+
+class InsightsJSONProvider(DefaultJSONProvider):
+    """JSON序列化：支持 InsightItem 条目和只读快照，编码和解码经过编解码层（优先使用 orjson）"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (InsightItem, MappingProxyType)):
+            return json_default(o)
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        # 只有 jsonify 使用的 indent/separators 参数时走编解码层，其余参数交给标准库
+        if set(kwargs) <= {'indent', 'separators'}:
+            return codec.dumps(obj, default=self.default, sort_keys=self.sort_keys,
+                               indent=bool(kwargs.get('indent'))).decode('utf-8')
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return codec.loads(s)
 
 
 app = Flask(__name__)
+app.json = InsightsJSONProvider(app)
 CORS(app)
 
 # 注册模板过滤器
 app.jinja_env.filters['date_input'] = format_date_for_input
 
 # 数据文件路径
-DATA_FILE = 'data/insights.json'
-DATA_DIR = 'data'
+DATA_DIR = os.environ.get('INSIGHTS_DATA_DIR', 'data')
+DATA_FILE = os.path.join(DATA_DIR, 'insights.json')
+
+# 处理后洞察数据的缓存配置（按日期缓存，数据文件变化或过期后重新加载）
+INSIGHTS_CACHE_MAX_ENTRIES = int(os.environ.get('INSIGHTS_CACHE_MAX_ENTRIES', 128))
+INSIGHTS_CACHE_TTL = int(os.environ.get('INSIGHTS_CACHE_TTL', 300))
+
+insights_cache = TTLCache(max_entries=INSIGHTS_CACHE_MAX_ENTRIES, ttl=INSIGHTS_CACHE_TTL)
+# API响应的预编码字节（JSON及gzip/brotli压缩版本）缓存
+payload_cache = TTLCache(max_entries=INSIGHTS_CACHE_MAX_ENTRIES, ttl=INSIGHTS_CACHE_TTL)
+# 带板块选择、字段投影或分页参数的API响应的预编码字节缓存（按日期和查询参数）
+INSIGHTS_VIEW_CACHE_MAX_ENTRIES = int(os.environ.get('INSIGHTS_VIEW_CACHE_MAX_ENTRIES', 512))
+view_cache = TTLCache(max_entries=INSIGHTS_VIEW_CACHE_MAX_ENTRIES, ttl=INSIGHTS_CACHE_TTL)
+# 渲染后的主页面（按日期，失效条件与洞察数据缓存相同）
+page_cache = TTLCache(max_entries=INSIGHTS_CACHE_MAX_ENTRIES, ttl=INSIGHTS_CACHE_TTL)
+
+# 板块HTML片段缓存（按板块内容的哈希值，内容不变的板块无需重新渲染）
+FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get('FRAGMENT_CACHE_MAX_ENTRIES', 1024))
+fragment_cache = TTLCache(max_entries=FRAGMENT_CACHE_MAX_ENTRIES, ttl=INSIGHTS_CACHE_TTL)
 
-# 确保数据目录存在
-os.makedirs(DATA_DIR, exist_ok=True)
+# 主页面各板块的显示顺序：(板块key, 锚点id, 图标, 标题)
+PAGE_SECTIONS = (
+    ('enterprise_ai', 'enterprise-ai', '🤖', '一、人工智能企业动态'),
+    ('ai_agents', 'ai-agents', '🤝', '二、智能体（AI Agent）应用落地'),
+    ('semiconductor', 'semiconductor', '💻', '三、半导体行业动态'),
+    ('gpu_computing', 'gpu-computing', '⚡', '四、算力和政策'),
+    ('ai_research', 'ai-research', '🔬', '五、AI算法研究前沿'),
+    ('ai_experts', 'ai-experts', '👨‍🔬', '六、人工智能专家动态'),
+)
+# 每个板块最多显示的条目数
+PAGE_SECTION_MAX_ITEMS = 8
+# GET /api/insights 分页时每页最多的条目数（limit参数的上限）
+INSIGHTS_PAGE_MAX_LIMIT = int(os.environ.get('INSIGHTS_PAGE_MAX_LIMIT', 100))
+# 参与片段渲染的条目字段
+FRAGMENT_FIELDS = ('title', 'description', 'impact', 'source', 'date', 'highlight')
+
+# 洞察数据存储（INSIGHTS_STORAGE=json 每天一个JSON文件，=sqlite 使用SQLite数据库）
+storage = create_storage(data_dir=DATA_DIR)
+
+# 全文检索索引（首次检索时从存储建立，保存数据时增量更新；
+# 每隔 SEARCH_INDEX_RECHECK_INTERVAL 秒检查各日期的存储签名，重新索引其他进程修改过的日期）
+SEARCH_INDEX_RECHECK_INTERVAL = float(os.environ.get('SEARCH_INDEX_RECHECK_INTERVAL', 10))
+search_index = SearchIndex(recheck_interval=SEARCH_INDEX_RECHECK_INTERVAL)
+_search_index_lock = threading.Lock()
+
+# 批量上传配置：每个请求按块提交的条目数、单次合并写入的最大条目数、等待合并的时间（秒）
+INGEST_CHUNK_SIZE = int(os.environ.get('INGEST_CHUNK_SIZE', 500))
+INGEST_BATCH_MAX_ITEMS = int(os.environ.get('INGEST_BATCH_MAX_ITEMS', 2000))
+INGEST_BATCH_MAX_WAIT = float(os.environ.get('INGEST_BATCH_MAX_WAIT', 0.05))
+INGEST_COMMIT_TIMEOUT = float(os.environ.get('INGEST_COMMIT_TIMEOUT', 30))
+# 响应中最多返回的错误行数
+INGEST_MAX_ERRORS = 20
+
+# 日期范围查询配置：最多查询的天数、并行加载的线程数
+RANGE_MAX_DAYS = int(os.environ.get('RANGE_MAX_DAYS', 31))
+RANGE_MAX_WORKERS = int(os.environ.get('RANGE_MAX_WORKERS', 4))
+
+_range_executor = None
+_range_executor_lock = threading.Lock()
+
+# 可用日期索引（保存数据时更新，存储中的日期变化时重新加载）
+date_index = DateIndex(storage)
 
 # 默认示例数据
-DEFAULT_INSIGHTS = {
-    "date": datetime.now().strftime("%Y年%m月%d日"),
-    "sections": {
-        "enterprise_ai": {
-            "title": "人工智能企业动态",
-            "icon": "🤖",
-            "items": [
-                {
-                    "title": "OpenAI发布GPT-4 Turbo升级版本",
-                    "description": "OpenAI宣布推出GPT-4 Turbo的增强版本，推理能力提升40%，成本降低50%。新版本在代码生成和复杂推理任务上表现显著提升。",
-                    "who": "OpenAI",
-                    "impact": "推理能力提升40%，成本降低50%",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "OpenAI官方公告",
-                    "highlight": True
-                },
-                {
-                    "title": "谷歌DeepMind推出Gemini 2.0多模态模型",
-                    "description": "DeepMind发布Gemini 2.0，在视频理解、图像生成和音频处理方面实现突破，支持128K上下文窗口。",
-                    "who": "Google DeepMind",
-                    "impact": "支持128K上下文，多模态能力显著提升",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "DeepMind技术博客",
-                    "highlight": False
-                }
-            ]
-        },
-        "ai_agents": {
-            "title": "智能体（AI Agent）应用落地",
-            "icon": "🤝",
-            "items": [
-                {
-                    "title": "AutoGPT在制造业质检场景落地",
-                    "description": "某制造业巨头部署AutoGPT智能质检系统，实现99.5%的检测准确率，生产效率提升35%，人工成本降低60%。",
-                    "who": "AutoGPT + 制造业企业",
-                    "impact": "检测准确率99.5%，生产效率提升35%",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "行业应用报告",
-                    "highlight": True
-                },
-                {
-                    "title": "AI客服智能体在金融行业大规模应用",
-                    "description": "多家银行采用AI智能客服，24小时在线服务，客户满意度提升28%，运营成本降低40%。",
-                    "who": "金融科技公司",
-                    "impact": "客户满意度提升28%，运营成本降低40%",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "金融科技白皮书",
-                    "highlight": False
-                }
-            ]
-        },
-        "semiconductor": {
-            "title": "半导体行业动态",
-            "icon": "💻",
-            "items": [
-                {
-                    "title": "台积电3nm工艺产能爬坡，AI芯片需求激增",
-                    "description": "台积电3nm工艺良率提升至85%，满足NVIDIA、AMD等AI芯片巨头订单需求，预计Q2产能利用率达100%。",
-                    "who": "台积电（TSMC）",
-                    "impact": "3nm良率85%，Q2产能利用率预计100%",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "台积电财报",
-                    "highlight": True
-                },
-                {
-                    "title": "三星发布首款3nm GAA架构芯片",
-                    "description": "三星电子宣布成功量产3nm GAA（全环绕栅极）架构芯片，性能提升23%，功耗降低45%。",
-                    "who": "三星电子",
-                    "impact": "性能提升23%，功耗降低45%",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "三星技术公告",
-                    "highlight": False
-                }
-            ]
-        },
-        "gpu_computing": {
-            "title": "算力和政策",
-            "icon": "⚡",
-            "items": [
-                {
-                    "title": "国家发改委发布人工智能算力基础设施发展指导意见",
-                    "description": "国家发改委联合多部门发布《人工智能算力基础设施发展指导意见》，提出到2025年建成覆盖全国的算力基础设施体系，支持AI产业发展。政策强调统筹算力资源，促进东西部算力协同发展。",
-                    "who": "国家发改委",
-                    "impact": "推动全国算力基础设施体系建设，支持AI产业发展",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "国家发改委官网",
-                    "highlight": True
-                },
-                {
-                    "title": "工信部发布算力网络行动计划，推进算力一体化",
-                    "description": "工信部印发《算力网络行动计划（2024-2026年）》，提出构建全国一体化算力网络体系。计划明确将建设10个国家级算力枢纽节点，算力规模达到300 EFLOPS。",
-                    "who": "工信部",
-                    "impact": "建设10个国家级算力枢纽，算力规模达300 EFLOPS",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "工信部官网",
-                    "highlight": True
-                },
-                {
-                    "title": "北京市发布AI算力建设三年行动方案",
-                    "description": "北京市发布《人工智能算力建设三年行动方案（2024-2026）》，提出建设1000P算力规模，支持大模型训练和推理。方案重点支持中关村科学城、亦庄开发区等区域算力基础设施建设。",
-                    "who": "北京市政府",
-                    "impact": "建设1000P算力规模，支持大模型发展",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "北京市政府官网",
-                    "highlight": False
-                },
-                {
-                    "title": "上海市推进算力资源统一调度管理",
-                    "description": "上海市发布算力资源统一调度管理政策，建立算力资源池，实现算力资源的统筹管理和优化配置。政策鼓励企业共享算力资源，提高算力利用率，降低算力成本。",
-                    "who": "上海市政府",
-                    "impact": "建立算力资源池，实现统一调度管理",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "上海市政府官网",
-                    "highlight": False
-                },
-                {
-                    "title": "粤港澳大湾区规划建设算力枢纽集群",
-                    "description": "《粤港澳大湾区算力枢纽集群建设规划》正式发布，规划建设超大规模算力集群，支持大湾区AI产业发展。规划明确将建设深圳、广州、珠海三个算力中心节点。",
-                    "who": "粤港澳大湾区规划办",
-                    "impact": "建设三个算力中心节点，支持大湾区AI发展",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "粤港澳大湾区官网",
-                    "highlight": False
-                },
-                {
-                    "title": "国家能源局推动算力中心绿色能源供给",
-                    "description": "国家能源局发布政策，推动算力中心采用清洁能源供电，要求新建算力中心可再生能源使用比例不低于40%。政策鼓励算力中心与光伏、风电等新能源项目结合。",
-                    "who": "国家能源局",
-                    "impact": "要求新建算力中心可再生能源使用比例不低于40%",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "国家能源局官网",
-                    "highlight": False
-                },
-                {
-                    "title": "中科院计算所发布国产算力芯片突破成果",
-                    "description": "中科院计算所发布国产算力芯片新突破，自主研发的AI训练芯片性能达到国际先进水平，支持大模型训练。该芯片已在多个算力中心部署应用。",
-                    "who": "中科院计算所",
-                    "impact": "国产AI训练芯片性能达到国际先进水平",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "中科院官网",
-                    "highlight": False
-                },
-                {
-                    "title": "多个省市发布算力补贴政策，降低AI企业算力成本",
-                    "description": "浙江、江苏、四川等多个省市发布算力补贴政策，对AI企业的算力使用给予30%-50%的补贴。政策旨在降低中小企业AI研发成本，推动AI产业规模化发展。",
-                    "who": "各省市政府",
-                    "impact": "算力使用补贴30%-50%，降低企业AI研发成本",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "各地政府官网",
-                    "highlight": False
-                },
-                {
-                    "title": "美国商务部限制AI芯片对华出口新规生效",
-                    "description": "美国商务部发布AI芯片出口管制新规，进一步限制高端AI芯片和算力设备对华出口。新规涉及H800、A800等型号，影响国内AI产业发展。中国外交部回应称将采取必要措施维护国家利益。",
-                    "who": "美国商务部",
-                    "impact": "限制高端AI芯片出口，影响国内AI产业",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "美国商务部/Bloomberg",
-                    "highlight": True
-                },
-                {
-                    "title": "欧盟通过《AI法案》，规范AI算力使用",
-                    "description": "欧盟正式通过《人工智能法案》，成为全球首个全面监管AI的法律框架。法案要求高风险AI系统必须符合透明度、可追溯性等要求，并建立AI监管机构。法案对算力使用和数据安全提出严格要求。",
-                    "who": "欧盟委员会",
-                    "impact": "建立全球首个AI全面监管框架",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "欧盟官网",
-                    "highlight": True
-                },
-                {
-                    "title": "英国发布《AI安全框架》，规范AI算力使用",
-                    "description": "英国政府发布《AI安全框架》草案，要求AI系统提供商进行安全评估，并建立AI监管机制。框架重点关注高风险AI应用，要求保障AI系统的安全性和可靠性，对算力使用提出规范要求。",
-                    "who": "英国政府",
-                    "impact": "建立AI安全评估机制，规范算力使用",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "英国政府官网",
-                    "highlight": False
-                },
-                {
-                    "title": "美国国会通过《国家AI计划法案》，加大AI算力投资",
-                    "description": "美国国会通过《国家人工智能倡议法案》，计划在未来5年内投资1000亿美元用于AI研发和算力基础设施建设。法案旨在保持美国在AI领域的全球领先地位，支持AI产业创新发展。",
-                    "who": "美国国会",
-                    "impact": "5年投资1000亿美元用于AI研发和算力建设",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "美国国会官网",
-                    "highlight": False
-                },
-                {
-                    "title": "日本发布《AI战略2025》，推进算力基础设施发展",
-                    "description": "日本政府发布《AI战略2025》，提出建设国家级AI算力基础设施，支持AI产业发展。战略明确将建设超大规模算力中心，培养AI人才，推动AI技术在制造业、医疗等领域的应用。",
-                    "who": "日本政府",
-                    "impact": "建设国家级AI算力基础设施，推动AI应用",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "日本政府官网",
-                    "highlight": False
-                }
-            ]
-        },
-        "ai_research": {
-            "title": "AI算法研究前沿",
-            "icon": "🔬",
-            "items": [
-                {
-                    "title": "斯坦福发布Agentic AI研究框架",
-                    "description": "斯坦福大学AI实验室提出新的Agentic AI框架，使AI智能体能够自主规划和执行复杂任务，在Minecraft游戏中达到人类玩家80%水平。",
-                    "who": "Stanford AI Lab",
-                    "impact": "AI智能体自主规划能力显著提升",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "Nature Machine Intelligence",
-                    "highlight": True
-                },
-                {
-                    "title": "DeepMind推出AlphaFold 3，蛋白质预测精度突破",
-                    "description": "AlphaFold 3能够预测蛋白质、DNA、RNA等生物分子的3D结构，预测精度相比前代提升50%，加速药物研发进程。",
-                    "who": "DeepMind",
-                    "impact": "预测精度提升50%，加速药物研发",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "Science期刊",
-                    "highlight": False
-                }
-            ]
-        },
-        "ai_experts": {
-            "title": "人工智能专家动态",
-            "icon": "👨‍🔬",
-            "items": [
-                {
-                    "title": "吴恩达：AI Agent将成为下一波技术浪潮",
-                    "description": "在AGI-Next前沿峰会上，斯坦福大学教授吴恩达表示，AI Agent应用将比大语言模型产生更大商业价值，预计2025年将迎来Agent应用的爆发期。他认为Agent的自主决策和工具使用能力将改变多个行业。",
-                    "who": "吴恩达（Andrew Ng）",
-                    "impact": "预测2025年AI Agent应用爆发",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "AGI-Next前沿峰会",
-                    "highlight": True
-                },
-                {
-                    "title": "李飞飞提出AI系统安全新框架",
-                    "description": "斯坦福HAI研究院主任李飞飞在AI安全论坛上发表演讲，提出'人机协作安全'新框架，强调AI系统需要具备可解释性和可控性，呼吁建立行业安全标准。",
-                    "who": "李飞飞（Fei-Fei Li）",
-                    "impact": "提出AI安全新框架，推动行业标准建立",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "AI安全论坛",
-                    "highlight": False
-                },
-                {
-                    "title": "月之暗面杨植麟：多模态AI是AGI的关键路径",
-                    "description": "月之暗面CEO杨植麟在接受采访时表示，多模态理解能力是通向AGI的关键，公司正在推进视觉-语言-音频统一模型的研究。他预测未来3-5年将出现真正的通用人工智能。",
-                    "who": "杨植麟（月之暗面）",
-                    "impact": "推进多模态统一模型，预测3-5年实现AGI",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "科技媒体专访",
-                    "highlight": False
-                },
-                {
-                    "title": "智谱唐杰：开源AI模型将推动行业民主化",
-                    "description": "智谱AI CEO唐杰在开源AI大会上发表主题演讲，认为开源模型将成为AI发展的重要推动力，帮助更多企业以更低成本使用AI技术。智谱将开源更多基础模型。",
-                    "who": "唐杰（智谱AI）",
-                    "impact": "推动开源AI模型，降低企业AI应用成本",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "source": "开源AI大会",
-                    "highlight": False
-                }
-            ]
+def _build_default_insights():
+    """构建默认示例数据（条目日期为今天）"""
+    today = datetime.now()
+    display_today = today.strftime("%Y年%m月%d日")
+    iso_today = today.strftime("%Y-%m-%d")
+    return {
+        "date": display_today,
+        "sections": {
+            "enterprise_ai": {
+                "title": "人工智能企业动态",
+                "icon": "🤖",
+                "items": [
+                    {
+                        "title": "OpenAI发布GPT-4 Turbo升级版本",
+                        "description": "OpenAI宣布推出GPT-4 Turbo的增强版本，推理能力提升40%，成本降低50%。新版本在代码生成和复杂推理任务上表现显著提升。",
+                        "who": "OpenAI",
+                        "impact": "推理能力提升40%，成本降低50%",
+                        "date": iso_today,
+                        "source": "OpenAI官方公告",
+                        "highlight": True
+                    },
+                    {
+                        "title": "谷歌DeepMind推出Gemini 2.0多模态模型",
+                        "description": "DeepMind发布Gemini 2.0，在视频理解、图像生成和音频处理方面实现突破，支持128K上下文窗口。",
+                        "who": "Google DeepMind",
+                        "impact": "支持128K上下文，多模态能力显著提升",
+                        "date": iso_today,
+                        "source": "DeepMind技术博客",
+                        "highlight": False
+                    }
+                ]
+            },
+            "ai_agents": {
+                "title": "智能体（AI Agent）应用落地",
+                "icon": "🤝",
+                "items": [
+                    {
+                        "title": "AutoGPT在制造业质检场景落地",
+                        "description": "某制造业巨头部署AutoGPT智能质检系统，实现99.5%的检测准确率，生产效率提升35%，人工成本降低60%。",
+                        "who": "AutoGPT + 制造业企业",
+                        "impact": "检测准确率99.5%，生产效率提升35%",
+                        "date": iso_today,
+                        "source": "行业应用报告",
+                        "highlight": True
+                    },
+                    {
+                        "title": "AI客服智能体在金融行业大规模应用",
+                        "description": "多家银行采用AI智能客服，24小时在线服务，客户满意度提升28%，运营成本降低40%。",
+                        "who": "金融科技公司",
+                        "impact": "客户满意度提升28%，运营成本降低40%",
+                        "date": iso_today,
+                        "source": "金融科技白皮书",
+                        "highlight": False
+                    }
+                ]
+            },
+            "semiconductor": {
+                "title": "半导体行业动态",
+                "icon": "💻",
+                "items": [
+                    {
+                        "title": "台积电3nm工艺产能爬坡，AI芯片需求激增",
+                        "description": "台积电3nm工艺良率提升至85%，满足NVIDIA、AMD等AI芯片巨头订单需求，预计Q2产能利用率达100%。",
+                        "who": "台积电（TSMC）",
+                        "impact": "3nm良率85%，Q2产能利用率预计100%",
+                        "date": iso_today,
+                        "source": "台积电财报",
+                        "highlight": True
+                    },
+                    {
+                        "title": "三星发布首款3nm GAA架构芯片",
+                        "description": "三星电子宣布成功量产3nm GAA（全环绕栅极）架构芯片，性能提升23%，功耗降低45%。",
+                        "who": "三星电子",
+                        "impact": "性能提升23%，功耗降低45%",
+                        "date": iso_today,
+                        "source": "三星技术公告",
+                        "highlight": False
+                    }
+                ]
+            },
+            "gpu_computing": {
+                "title": "算力和政策",
+                "icon": "⚡",
+                "items": [
+                    {
+                        "title": "国家发改委发布人工智能算力基础设施发展指导意见",
+                        "description": "国家发改委联合多部门发布《人工智能算力基础设施发展指导意见》，提出到2025年建成覆盖全国的算力基础设施体系，支持AI产业发展。政策强调统筹算力资源，促进东西部算力协同发展。",
+                        "who": "国家发改委",
+                        "impact": "推动全国算力基础设施体系建设，支持AI产业发展",
+                        "date": iso_today,
+                        "source": "国家发改委官网",
+                        "highlight": True
+                    },
+                    {
+                        "title": "工信部发布算力网络行动计划，推进算力一体化",
+                        "description": "工信部印发《算力网络行动计划（2024-2026年）》，提出构建全国一体化算力网络体系。计划明确将建设10个国家级算力枢纽节点，算力规模达到300 EFLOPS。",
+                        "who": "工信部",
+                        "impact": "建设10个国家级算力枢纽，算力规模达300 EFLOPS",
+                        "date": iso_today,
+                        "source": "工信部官网",
+                        "highlight": True
+                    },
+                    {
+                        "title": "北京市发布AI算力建设三年行动方案",
+                        "description": "北京市发布《人工智能算力建设三年行动方案（2024-2026）》，提出建设1000P算力规模，支持大模型训练和推理。方案重点支持中关村科学城、亦庄开发区等区域算力基础设施建设。",
+                        "who": "北京市政府",
+                        "impact": "建设1000P算力规模，支持大模型发展",
+                        "date": iso_today,
+                        "source": "北京市政府官网",
+                        "highlight": False
+                    },
+                    {
+                        "title": "上海市推进算力资源统一调度管理",
+                        "description": "上海市发布算力资源统一调度管理政策，建立算力资源池，实现算力资源的统筹管理和优化配置。政策鼓励企业共享算力资源，提高算力利用率，降低算力成本。",
+                        "who": "上海市政府",
+                        "impact": "建立算力资源池，实现统一调度管理",
+                        "date": iso_today,
+                        "source": "上海市政府官网",
+                        "highlight": False
+                    },
+                    {
+                        "title": "粤港澳大湾区规划建设算力枢纽集群",
+                        "description": "《粤港澳大湾区算力枢纽集群建设规划》正式发布，规划建设超大规模算力集群，支持大湾区AI产业发展。规划明确将建设深圳、广州、珠海三个算力中心节点。",
+                        "who": "粤港澳大湾区规划办",
+                        "impact": "建设三个算力中心节点，支持大湾区AI发展",
+                        "date": iso_today,
+                        "source": "粤港澳大湾区官网",
+                        "highlight": False
+                    },
+                    {
+                        "title": "国家能源局推动算力中心绿色能源供给",
+                        "description": "国家能源局发布政策，推动算力中心采用清洁能源供电，要求新建算力中心可再生能源使用比例不低于40%。政策鼓励算力中心与光伏、风电等新能源项目结合。",
+                        "who": "国家能源局",
+                        "impact": "要求新建算力中心可再生能源使用比例不低于40%",
+                        "date": iso_today,
+                        "source": "国家能源局官网",
+                        "highlight": False
+                    },
+                    {
+                        "title": "中科院计算所发布国产算力芯片突破成果",
+                        "description": "中科院计算所发布国产算力芯片新突破，自主研发的AI训练芯片性能达到国际先进水平，支持大模型训练。该芯片已在多个算力中心部署应用。",
+                        "who": "中科院计算所",
+                        "impact": "国产AI训练芯片性能达到国际先进水平",
+                        "date": iso_today,
+                        "source": "中科院官网",
+                        "highlight": False
+                    },
+                    {
+                        "title": "多个省市发布算力补贴政策，降低AI企业算力成本",
+                        "description": "浙江、江苏、四川等多个省市发布算力补贴政策，对AI企业的算力使用给予30%-50%的补贴。政策旨在降低中小企业AI研发成本，推动AI产业规模化发展。",
+                        "who": "各省市政府",
+                        "impact": "算力使用补贴30%-50%，降低企业AI研发成本",
+                        "date": iso_today,
+                        "source": "各地政府官网",
+                        "highlight": False
+                    },
+                    {
+                        "title": "美国商务部限制AI芯片对华出口新规生效",
+                        "description": "美国商务部发布AI芯片出口管制新规，进一步限制高端AI芯片和算力设备对华出口。新规涉及H800、A800等型号，影响国内AI产业发展。中国外交部回应称将采取必要措施维护国家利益。",
+                        "who": "美国商务部",
+                        "impact": "限制高端AI芯片出口，影响国内AI产业",
+                        "date": iso_today,
+                        "source": "美国商务部/Bloomberg",
+                        "highlight": True
+                    },
+                    {
+                        "title": "欧盟通过《AI法案》，规范AI算力使用",
+                        "description": "欧盟正式通过《人工智能法案》，成为全球首个全面监管AI的法律框架。法案要求高风险AI系统必须符合透明度、可追溯性等要求，并建立AI监管机构。法案对算力使用和数据安全提出严格要求。",
+                        "who": "欧盟委员会",
+                        "impact": "建立全球首个AI全面监管框架",
+                        "date": iso_today,
+                        "source": "欧盟官网",
+                        "highlight": True
+                    },
+                    {
+                        "title": "英国发布《AI安全框架》，规范AI算力使用",
+                        "description": "英国政府发布《AI安全框架》草案，要求AI系统提供商进行安全评估，并建立AI监管机制。框架重点关注高风险AI应用，要求保障AI系统的安全性和可靠性，对算力使用提出规范要求。",
+                        "who": "英国政府",
+                        "impact": "建立AI安全评估机制，规范算力使用",
+                        "date": iso_today,
+                        "source": "英国政府官网",
+                        "highlight": False
+                    },
+                    {
+                        "title": "美国国会通过《国家AI计划法案》，加大AI算力投资",
+                        "description": "美国国会通过《国家人工智能倡议法案》，计划在未来5年内投资1000亿美元用于AI研发和算力基础设施建设。法案旨在保持美国在AI领域的全球领先地位，支持AI产业创新发展。",
+                        "who": "美国国会",
+                        "impact": "5年投资1000亿美元用于AI研发和算力建设",
+                        "date": iso_today,
+                        "source": "美国国会官网",
+                        "highlight": False
+                    },
+                    {
+                        "title": "日本发布《AI战略2025》，推进算力基础设施发展",
+                        "description": "日本政府发布《AI战略2025》，提出建设国家级AI算力基础设施，支持AI产业发展。战略明确将建设超大规模算力中心，培养AI人才，推动AI技术在制造业、医疗等领域的应用。",
+                        "who": "日本政府",
+                        "impact": "建设国家级AI算力基础设施，推动AI应用",
+                        "date": iso_today,
+                        "source": "日本政府官网",
+                        "highlight": False
+                    }
+                ]
+            },
+            "ai_research": {
+                "title": "AI算法研究前沿",
+                "icon": "🔬",
+                "items": [
+                    {
+                        "title": "斯坦福发布Agentic AI研究框架",
+                        "description": "斯坦福大学AI实验室提出新的Agentic AI框架，使AI智能体能够自主规划和执行复杂任务，在Minecraft游戏中达到人类玩家80%水平。",
+                        "who": "Stanford AI Lab",
+                        "impact": "AI智能体自主规划能力显著提升",
+                        "date": iso_today,
+                        "source": "Nature Machine Intelligence",
+                        "highlight": True
+                    },
+                    {
+                        "title": "DeepMind推出AlphaFold 3，蛋白质预测精度突破",
+                        "description": "AlphaFold 3能够预测蛋白质、DNA、RNA等生物分子的3D结构，预测精度相比前代提升50%，加速药物研发进程。",
+                        "who": "DeepMind",
+                        "impact": "预测精度提升50%，加速药物研发",
+                        "date": iso_today,
+                        "source": "Science期刊",
+                        "highlight": False
+                    }
+                ]
+            },
+            "ai_experts": {
+                "title": "人工智能专家动态",
+                "icon": "👨‍🔬",
+                "items": [
+                    {
+                        "title": "吴恩达：AI Agent将成为下一波技术浪潮",
+                        "description": "在AGI-Next前沿峰会上，斯坦福大学教授吴恩达表示，AI Agent应用将比大语言模型产生更大商业价值，预计2025年将迎来Agent应用的爆发期。他认为Agent的自主决策和工具使用能力将改变多个行业。",
+                        "who": "吴恩达（Andrew Ng）",
+                        "impact": "预测2025年AI Agent应用爆发",
+                        "date": iso_today,
+                        "source": "AGI-Next前沿峰会",
+                        "highlight": True
+                    },
+                    {
+                        "title": "李飞飞提出AI系统安全新框架",
+                        "description": "斯坦福HAI研究院主任李飞飞在AI安全论坛上发表演讲，提出'人机协作安全'新框架，强调AI系统需要具备可解释性和可控性，呼吁建立行业安全标准。",
+                        "who": "李飞飞（Fei-Fei Li）",
+                        "impact": "提出AI安全新框架，推动行业标准建立",
+                        "date": iso_today,
+                        "source": "AI安全论坛",
+                        "highlight": False
+                    },
+                    {
+                        "title": "月之暗面杨植麟：多模态AI是AGI的关键路径",
+                        "description": "月之暗面CEO杨植麟在接受采访时表示，多模态理解能力是通向AGI的关键，公司正在推进视觉-语言-音频统一模型的研究。他预测未来3-5年将出现真正的通用人工智能。",
+                        "who": "杨植麟（月之暗面）",
+                        "impact": "推进多模态统一模型，预测3-5年实现AGI",
+                        "date": iso_today,
+                        "source": "科技媒体专访",
+                        "highlight": False
+                    },
+                    {
+                        "title": "智谱唐杰：开源AI模型将推动行业民主化",
+                        "description": "智谱AI CEO唐杰在开源AI大会上发表主题演讲，认为开源模型将成为AI发展的重要推动力，帮助更多企业以更低成本使用AI技术。智谱将开源更多基础模型。",
+                        "who": "唐杰（智谱AI）",
+                        "impact": "推动开源AI模型，降低企业AI应用成本",
+                        "date": iso_today,
+                        "source": "开源AI大会",
+                        "highlight": False
+                    }
+                ]
+            }
         }
     }
-}
+
+
+@lru_cache(maxsize=None)
+def get_default_insights():
+    """获取默认示例数据（首次使用时构建，导入模块时不构建）"""
+    return _build_default_insights()
+
+
+def __getattr__(name):
+    # 兼容以模块属性方式访问默认示例数据（app.DEFAULT_INSIGHTS）
+    if name == 'DEFAULT_INSIGHTS':
+        return get_default_insights()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # 国内AI专家列表（用于搜索）
 CHINESE_AI_EXPERTS = [
@@ -339,95 +434,117 @@ CHINESE_AI_EXPERTS = [
     {"name": "汤晓鸥", "company": "商汤科技", "keywords": ["商汤科技", "汤晓鸥", "计算机视觉", "AI"]},
 ]
 
+# 专家搜索并发配置
+# 最多搜索的专家数量
+EXPERT_SEARCH_MAX_EXPERTS = int(os.environ.get('EXPERT_SEARCH_MAX_EXPERTS', 5))
+# 同时进行的搜索数量上限
+EXPERT_SEARCH_MAX_WORKERS = int(os.environ.get('EXPERT_SEARCH_MAX_WORKERS', 4))
+# 整体搜索超时时间（秒），超时后返回部分结果
+EXPERT_SEARCH_DEADLINE = float(os.environ.get('EXPERT_SEARCH_DEADLINE', 2.0))
 
-def search_expert_info(expert_name, expert_keywords, max_results=3):
-    """搜索专家信息（使用模拟数据，实际部署时可接入真实搜索API）"""
-    # 注意：由于网络搜索需要API密钥且可能受限制，
-    # 这里提供一个框架，实际使用时可以接入：
-    # 1. 百度搜索API
-    # 2. 新闻网站RSS
-    # 3. 社交媒体API
-    # 4. 学术论文数据库
-    
-    if not SEARCH_AVAILABLE:
-        # 如果搜索库不可用，返回模拟数据
-        return generate_mock_expert_info(expert_name, expert_keywords, max_results)
-    
-    results = []
-    search_query = f"{expert_name} AI 人工智能"
-    
+# 专家动态后台刷新间隔（秒）
+EXPERT_REFRESH_INTERVAL = int(os.environ.get('EXPERT_REFRESH_INTERVAL', 300))
+# 后台刷新最多跟踪的日期数量（最近访问的日期）
+EXPERT_REFRESH_MAX_DATES = int(os.environ.get('EXPERT_REFRESH_MAX_DATES', 32))
+
+_expert_search_executor = None
+_expert_search_executor_lock = threading.Lock()
+
+_search_backend = None
+_search_backend_lock = threading.Lock()
+
+
+def get_search_backend():
+    """获取专家搜索后端（首次使用时根据配置创建）"""
+    global _search_backend
+    if _search_backend is None:
+        with _search_backend_lock:
+            if _search_backend is None:
+                # HTTP后端在创建时才导入 requests，未安装时使用模拟数据
+                _search_backend = create_search_backend()
+    return _search_backend
+
+
+def search_expert_info(expert_name, expert_keywords, max_results=3, date_obj=None):
+    """搜索专家信息（通过配置的搜索后端，默认使用模拟数据）
+    Args:
+        date_obj: 目标日期，默认今天
+    """
+    # 搜索后端可通过环境变量配置：
+    # EXPERT_SEARCH_BACKEND=http 并设置 EXPERT_SEARCH_URL 时使用HTTP搜索服务，
+    # 否则使用模拟数据（本地可运行 mock_search_server.py 作为搜索服务）
+    backend = get_search_backend()
+    start = time.perf_counter()
     try:
-        # 尝试搜索（示例：搜索新闻）
-        # 注意：实际应用中需要使用合法的搜索API或爬虫
-        # 这里提供一个基础框架
-        
-        # 模拟搜索延迟
-        time.sleep(0.1)
-        
-        # 生成模拟搜索结果（实际应替换为真实搜索）
-        results = generate_mock_expert_info(expert_name, expert_keywords, max_results)
-        
+        results = backend.search(expert_name, expert_keywords, max_results, date_obj)
     except Exception as e:
+        metrics.SEARCH_BACKEND_LATENCY.observe(time.perf_counter() - start, backend=backend.name, outcome='error')
+        metrics.record_error('expert_search')
         print(f"搜索专家 {expert_name} 信息失败: {e}")
         # 返回模拟数据作为备用
-        results = generate_mock_expert_info(expert_name, expert_keywords, max_results)
-    
+        return generate_mock_expert_info(expert_name, expert_keywords, max_results, date_obj)
+    metrics.SEARCH_BACKEND_LATENCY.observe(time.perf_counter() - start, backend=backend.name, outcome='ok')
     return results
 
 
-def generate_mock_expert_info(expert_name, expert_keywords, max_results=3):
-    """生成模拟专家信息（实际部署时应替换为真实搜索）"""
-    results = []
-    
-    # 专家活动类型
-    activity_types = [
-        "发表主题演讲",
-        "接受媒体专访",
-        "发布技术观点",
-        "参加行业峰会",
-        "发布新产品"
-    ]
-    
-    # 根据专家生成相关信息
-    expert_keyword = expert_keywords[0] if expert_keywords else expert_name
-    
-    for i in range(min(max_results, 3)):
-        activity_type = activity_types[i % len(activity_types)]
-        today = datetime.now()
-        date_str = today.strftime("%Y-%m-%d")
-        
-        item = {
-            "title": f"{expert_name}：{activity_type}",
-            "description": f"{expert_keyword}相关专家{expert_name}近日{activity_type}，分享了对人工智能发展趋势的见解。他表示，AI技术正在快速发展，未来将在多个领域产生深远影响。",
-            "who": expert_name,
-            "impact": "分享AI发展趋势见解",
-            "date": date_str,
-            "source": f"{expert_keyword}官方/行业媒体",
-            "highlight": i == 0  # 第一条标记为重要
-        }
-        results.append(item)
-    
-    return results
+def get_expert_search_executor():
+    """获取专家搜索共用的线程池（首次使用时创建）"""
+    global _expert_search_executor
+    if _expert_search_executor is None:
+        with _expert_search_executor_lock:
+            if _expert_search_executor is None:
+                _expert_search_executor = ThreadPoolExecutor(
+                    max_workers=EXPERT_SEARCH_MAX_WORKERS,
+                    thread_name_prefix='expert-search'
+                )
+    return _expert_search_executor
 
 
-def search_chinese_ai_experts():
-    """搜索国内AI专家最新动态"""
-    all_expert_items = []
+def search_chinese_ai_experts(max_experts=None, deadline=None, date_obj=None):
+    """并发搜索国内AI专家最新动态
+    Args:
+        max_experts: 最多搜索的专家数量，默认使用 EXPERT_SEARCH_MAX_EXPERTS
+        deadline: 整体超时时间（秒），默认使用 EXPERT_SEARCH_DEADLINE；
+            超时后只返回已完成的搜索结果
+        date_obj: 目标日期，默认今天
+    """
+    if max_experts is None:
+        max_experts = EXPERT_SEARCH_MAX_EXPERTS
+    if deadline is None:
+        deadline = EXPERT_SEARCH_DEADLINE
     
     # 搜索每个专家（限制数量，避免过多请求）
-    experts_to_search = CHINESE_AI_EXPERTS[:5]  # 最多搜索5个专家
+    experts_to_search = CHINESE_AI_EXPERTS[:max_experts]
+    
+    executor = get_expert_search_executor()
+    futures = [
+        executor.submit(
+            search_expert_info,
+            expert["name"],
+            expert["keywords"],
+            max_results=2,  # 每个专家最多2条
+            date_obj=date_obj
+        )
+        for expert in experts_to_search
+    ]
+    done, not_done = wait(futures, timeout=deadline)
     
-    for expert in experts_to_search:
+    # 按专家列表顺序汇总已完成的结果
+    all_expert_items = []
+    for expert, future in zip(experts_to_search, futures):
+        if future not in done:
+            continue
         try:
-            expert_items = search_expert_info(
-                expert["name"], 
-                expert["keywords"],
-                max_results=2  # 每个专家最多2条
-            )
-            all_expert_items.extend(expert_items)
+            all_expert_items.extend(to_items(future.result()))
         except Exception as e:
+            metrics.record_error('expert_search')
             print(f"搜索专家 {expert['name']} 失败: {e}")
-            continue
+    
+    if not_done:
+        for future in not_done:
+            future.cancel()
+        metrics.record_error('expert_search_timeout')
+        print(f"专家搜索超时（{deadline}秒），{len(not_done)}位专家的结果未返回，使用部分结果")
     
     # 按日期排序，最新的在前
     sorted_items = sort_items_by_date(all_expert_items)
@@ -436,22 +553,17 @@ def search_chinese_ai_experts():
     return limit_items(sorted_items, max_items=8)
 
 
+def _item_sort_key(item):
+    # 日期无法解析的条目排在后面
+    return item.ordinal if item.ordinal is not None else -1
+
+
 def sort_items_by_date(items):
-    """按日期排序items，最新的在前（降序）"""
-    def get_date_key(item):
-        date_str = item.get('date', '')
-        try:
-            # 尝试解析日期
-            if '年' in date_str:
-                date_str = date_str.replace('年', '-').replace('月', '-').replace('日', '')
-            # 解析为datetime对象用于排序
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            return date_obj
-        except:
-            # 如果解析失败，使用一个很早的日期，排在后面
-            return datetime.min
-    
-    return sorted(items, key=get_date_key, reverse=True)
+    """按日期排序items，最新的在前（降序）
+    Args:
+        items: InsightItem 列表（日期已在创建时解析为序数）
+    """
+    return sorted(items, key=_item_sort_key, reverse=True)
 
 
 def limit_items(items, max_items=8):
@@ -459,59 +571,75 @@ def limit_items(items, max_items=8):
     return items[:max_items] if items else []
 
 
+# 按日期生成的默认数据快照的缓存数量
+GENERATED_SNAPSHOT_CACHE_SIZE = int(os.environ.get('GENERATED_SNAPSHOT_CACHE_SIZE', 256))
+
+
+@lru_cache(maxsize=None)
+def _item_templates():
+    """将默认数据转换为只读的条目模板（首次生成数据时构建一次）
+    Returns:
+        (板块key, 板块标题, 板块图标, 条目元组) 的元组
+    """
+    templates = []
+    for section_key, section_data in get_default_insights()['sections'].items():
+        items = tuple(InsightItem.from_dict(item) for item in section_data.get('items', []))
+        templates.append((section_key, section_data.get('title', ''), section_data.get('icon', ''), items))
+    return tuple(templates)
+
+
+@lru_cache(maxsize=GENERATED_SNAPSHOT_CACHE_SIZE)
+def _generate_daily_snapshot(date_str):
+    """生成某一天的只读洞察快照（同一天只生成一次）
+    Args:
+        date_str: 日期字符串，格式为 'YYYY-MM-DD'
+    Returns:
+        只读的洞察数据（MappingProxyType，条目为不可变的 InsightItem 元组）
+    """
+    date_obj = parse_date(date_str)
+
+    # 使用日期作为种子，让同一天的内容一致
+    date_hash = int(hashlib.md5(date_str.encode()).hexdigest()[:8], 16)
+
+    # 同一天内条目日期只有 0-2 天的偏移，预先算好三个日期字符串
+    offset_dates = tuple(format_date(date_obj - timedelta(days=offset)) for offset in range(3))
+
+    sections = {}
+    for section_key, title, icon, templates in _item_templates():
+        # 根据日期和索引生成稍微不同的日期（让内容看起来更真实），不能超过目标日期
+        items = tuple(
+            template.replace(date=offset_dates[(date_hash + i) % 3])
+            for i, template in enumerate(templates)
+        )
+        sections[section_key] = MappingProxyType({'title': title, 'icon': icon, 'items': items})
+
+    return MappingProxyType({
+        'date': display_date(date_obj),
+        'sections': MappingProxyType(sections),
+    })
+
+
 def generate_daily_insights(date_obj):
     """根据日期生成当天的洞察内容
+    返回的快照是只读的，可在多个请求和线程之间共享，不会修改默认示例数据
     Args:
         date_obj: datetime对象，目标日期
     Returns:
-        生成的洞察数据字典
+        生成的洞察数据（只读映射）
     """
-    # 日期格式化
-    date_str = date_obj.strftime("%Y-%m-%d")
-    date_display = date_obj.strftime("%Y年%m月%d日")
-    
-    # 使用日期作为种子，让同一天的内容一致
-    date_hash = int(hashlib.md5(date_str.encode()).hexdigest()[:8], 16)
-    
-    # 复制默认数据并更新
-    generated_data = DEFAULT_INSIGHTS.copy()
-    generated_data['date'] = date_display
-    
-    # 更新每个section的items日期和内容
-    for section_key, section_data in generated_data['sections'].items():
-        items = section_data.get('items', [])
-        
-        # 为每个item更新日期信息，并根据日期生成不同的内容
-        for i, item in enumerate(items):
-            # 根据日期和索引生成稍微不同的日期（让内容看起来更真实）
-            # 如果是过去，可以分布在最近几天（0-2天的偏移）
-            days_offset = (date_hash + i) % 3  # 0-2天的偏移
-            
-            # 计算item的日期（不能超过目标日期）
-            if days_offset > 0:
-                item_date = date_obj - timedelta(days=days_offset)
-            else:
-                item_date = date_obj
-            
-            item['date'] = item_date.strftime("%Y-%m-%d")
-            
-            # 根据日期哈希值稍微调整内容，让不同日期的内容有差异
-            # 这样可以确保选择不同日期时，内容会有所不同
-            content_variant = (date_hash + i * 17) % 5  # 生成0-4的变化
-            
-            # 可以根据content_variant调整内容，但保持基本信息不变
-            # 这里只是示例，实际应用中可以根据需要调整
-        
-        generated_data['sections'][section_key]['items'] = items
-    
-    return generated_data
+    return _generate_daily_snapshot(format_date(date_obj))
 
 
-def process_insights_data(data, date_str=None):
+def process_insights_data(data, date_str=None, refresh_experts=True, section_keys=None,
+                          max_items=PAGE_SECTION_MAX_ITEMS):
     """处理洞察数据：排序并限制每个section的items数量
+    条目在这里统一转换为 InsightItem（日期只解析一次），结果中的条目均为 InsightItem
     Args:
         data: 洞察数据字典
         date_str: 日期字符串，用于触发内容检索（可选）
+        refresh_experts: 专家动态快照不存在时是否安排后台检索（静态导出时不检索，只使用已存储的数据）
+        section_keys: 只处理的板块，None 表示全部（未请求的板块不出现在结果中）
+        max_items: 每个板块最多保留的条目数，None 表示全部保留（分页时使用）
     """
     if not data or 'sections' not in data:
         return data
@@ -520,54 +648,40 @@ def process_insights_data(data, date_str=None):
     processed_data['sections'] = {}
     
     # 获取当前日期对象（用于检索内容）
-    try:
-        if date_str:
-            if '年' in date_str:
-                date_str = date_str.replace('年', '-').replace('月', '-').replace('日', '')
-            current_date = datetime.strptime(date_str, "%Y-%m-%d")
-        else:
-            current_date = datetime.now()
-    except:
-        current_date = datetime.now()
+    current_date = (parse_date(date_str) if date_str else None) or date.today()
+    target_ordinal = current_date.toordinal()
     
     for section_key, section_data in data['sections'].items():
+        if section_keys and section_key not in section_keys:
+            continue
         processed_section = section_data.copy()
         
-        # 第六章节（ai_experts）使用主动搜索
+        # 第六章节（ai_experts）由后台定时检索，这里只读取最新快照，不阻塞请求
         if section_key == 'ai_experts':
-            try:
-                # 搜索国内AI专家最新动态（每次都会重新检索）
-                expert_items = search_chinese_ai_experts()
+            date_key = format_date(current_date)
+            snapshot = expert_refresher.get(date_key) if refresh_experts else expert_refresher.peek(date_key)
+            if snapshot is not None:
+                expert_items, updated_at = snapshot
                 processed_section['items'] = expert_items
-            except Exception as e:
-                print(f"搜索专家信息失败，使用原始数据: {e}")
-                # 如果搜索失败，使用原始数据
-                items = section_data.get('items', [])
+                processed_section['updated_at'] = datetime.fromtimestamp(updated_at).strftime("%Y-%m-%d %H:%M:%S")
+            else:
+                # 快照尚未生成（后台已安排检索），先使用原始数据
+                items = to_items(section_data.get('items', []))
                 sorted_items = sort_items_by_date(items)
-                limited_items = limit_items(sorted_items, max_items=8)
+                limited_items = limit_items(sorted_items, max_items=max_items)
                 processed_section['items'] = limited_items
+                processed_section['updated_at'] = None
         else:
             # 其他章节使用原有逻辑，但会根据日期筛选相关内容
-            items = section_data.get('items', [])
+            items = to_items(section_data.get('items', []))
             
             # 如果有日期参数，筛选该日期或最近的内容
             if date_str:
-                # 筛选与目标日期相关的items（日期在目标日期前后3天内）
-                filtered_items = []
-                target_date_obj = current_date
-                for item in items:
-                    item_date_str = item.get('date', '')
-                    try:
-                        if '年' in item_date_str:
-                            item_date_str = item_date_str.replace('年', '-').replace('月', '-').replace('日', '')
-                        item_date_obj = datetime.strptime(item_date_str, "%Y-%m-%d")
-                        # 只保留在目标日期前后3天的内容
-                        days_diff = abs((target_date_obj - item_date_obj).days)
-                        if days_diff <= 3:
-                            filtered_items.append(item)
-                    except:
-                        # 如果日期解析失败，保留该项
-                        filtered_items.append(item)
+                # 筛选与目标日期相关的items（日期在目标日期前后3天内），日期无法解析的条目保留
+                filtered_items = [
+                    item for item in items
+                    if item.ordinal is None or abs(target_ordinal - item.ordinal) <= 3
+                ]
                 
                 # 如果没有筛选到内容，使用原始items
                 if filtered_items:
@@ -575,8 +689,8 @@ def process_insights_data(data, date_str=None):
             
             # 按日期排序（最新的在前）
             sorted_items = sort_items_by_date(items)
-            # 限制为最多8条（5-8条范围内，使用最大值8）
-            limited_items = limit_items(sorted_items, max_items=8)
+            # 默认限制为最多8条（5-8条范围内，使用最大值8）
+            limited_items = limit_items(sorted_items, max_items=max_items)
             processed_section['items'] = limited_items
         
         processed_data['sections'][section_key] = processed_section
@@ -584,57 +698,144 @@ def process_insights_data(data, date_str=None):
     return processed_data
 
 
-def load_insights(date_str=None):
-    """加载洞察数据
+def get_insights_source_signature(date_str):
+    """获取日期对应数据源的签名，用于校验缓存
+    Args:
+        date_str: 日期字符串，格式为 'YYYY-MM-DD'
+    Returns:
+        存储中该日期数据的版本签名；不存在时返回默认数据文件的 (路径, 修改时间, 大小)；
+        都没有时返回 None
+    """
+    try:
+        signature = storage.signature(date_str)
+    except Exception as e:
+        metrics.record_error('storage_signature')
+        print(f"读取数据版本失败: {e}")
+        signature = None
+    if signature is not None:
+        return signature
+    try:
+        stat = os.stat(DATA_FILE)
+    except OSError:
+        return None
+    return (DATA_FILE, stat.st_mtime_ns, stat.st_size)
+
+
+def get_insights_cache_version(date_str, include_experts=True):
+    """获取日期对应缓存的版本：(数据源签名, 专家动态快照的更新时间)
+    快照在请求生成数据期间更新时，该请求写入的缓存版本较旧，下次读取时不会命中
+    Args:
+        date_str: 日期字符串，格式为 'YYYY-MM-DD'
+        include_experts: 缓存内容是否包含专家动态板块
+    """
+    snapshot = expert_refresher.peek(date_str) if include_experts else None
+    return (get_insights_source_signature(date_str), snapshot[1] if snapshot else None)
+
+
+def normalize_insights_date(date_str=None):
+    """将请求中的日期参数规范化为 'YYYY-MM-DD'，无效或缺失时使用今天的日期
     Args:
         date_str: 日期字符串，格式为 'YYYY-MM-DD' 或 'YYYY年MM月DD日'
     """
-    # 如果没有指定日期，使用今天的日期
+    # 如果没有指定日期或日期格式不正确，使用今天的日期
     if date_str is None:
-        date_str = datetime.now().strftime("%Y-%m-%d")
-    
-    # 转换日期格式
+        return today_str()
+    return normalize_date(date_str) or today_str()
+
+
+def load_insights(date_str=None, refresh_experts=True):
+    """加载洞察数据（优先读取缓存）
+    Args:
+        date_str: 日期字符串，格式为 'YYYY-MM-DD' 或 'YYYY年MM月DD日'
+        refresh_experts: 是否在专家动态后台刷新器中登记该日期（见 process_insights_data），
+            为 False 时只读取已有快照
+    """
+    date_str = normalize_insights_date(date_str)
+    version = get_insights_cache_version(date_str)
+    insights = insights_cache.get(date_str, version=version)
+    if insights is None:
+        insights = load_insights_uncached(date_str, refresh_experts)
+        insights_cache.set(date_str, insights, version=version)
+    elif (refresh_experts and 'ai_experts' in insights.get('sections', {})
+          and expert_refresher.peek(date_str) is None):
+        # 缓存可能由只读取快照的范围查询写入，此时登记该日期并安排检索（快照生成后清除缓存）
+        expert_refresher.get(date_str)
+    return insights
+
+
+def load_encoded_insights(date_str=None):
+    """加载预编码（JSON + 压缩）的洞察数据，供API直接返回
+    Args:
+        date_str: 日期字符串，格式为 'YYYY-MM-DD' 或 'YYYY年MM月DD日'
+    Returns:
+        EncodedPayload 对象
+    """
+    date_str = normalize_insights_date(date_str)
+    version = get_insights_cache_version(date_str)
+    encoded = payload_cache.get(date_str, version=version)
+    if encoded is None:
+        insights = load_insights(date_str)
+        with metrics.stage('encode'):
+            encoded = EncodedPayload(insights)
+        payload_cache.set(date_str, encoded, version=version)
+    return encoded
+
+
+def invalidate_insights_cache(date_str=None):
+    """清除洞察数据缓存
+    Args:
+        date_str: 指定日期（'YYYY-MM-DD'）；为 None 时清空全部缓存
+    """
+    for cache in (insights_cache, payload_cache, page_cache):
+        if date_str is None:
+            cache.clear()
+        else:
+            cache.invalidate(date_str)
+    # 带查询参数的响应按 (日期, 查询参数) 缓存，单个日期的变化由缓存版本（数据签名和专家动态快照时间）识别
+    if date_str is None:
+        view_cache.clear()
+
+
+def load_insights_uncached(date_str, refresh_experts=True, section_keys=None, max_items=PAGE_SECTION_MAX_ITEMS):
+    """从数据文件加载并处理洞察数据（不经过缓存）
+    Args:
+        date_str: 日期字符串，格式为 'YYYY-MM-DD'
+        refresh_experts: 是否安排后台检索专家动态（见 process_insights_data）
+        section_keys: 只处理的板块，None 表示全部
+        max_items: 每个板块最多保留的条目数，None 表示全部保留
+    """
+    # 尝试从存储加载指定日期的数据
     try:
-        if '年' in date_str:
-            # 从 'YYYY年MM月DD日' 转换为 'YYYY-MM-DD'
-            date_str = date_str.replace('年', '-').replace('月', '-').replace('日', '')
-        
-        # 验证日期格式
-        datetime.strptime(date_str, "%Y-%m-%d")
-    except ValueError:
-        # 如果日期格式不正确，使用今天的日期
-        date_str = datetime.now().strftime("%Y-%m-%d")
-    
-    # 尝试加载指定日期的数据文件
-    date_file = os.path.join(DATA_DIR, f"insights_{date_str}.json")
-    
-    if os.path.exists(date_file):
-        try:
-            with open(date_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # 处理数据：排序并限制items数量，传入日期以触发检索
-                return process_insights_data(data, date_str)
-        except Exception as e:
-            print(f"加载数据失败: {e}")
+        with metrics.stage('storage_load'):
+            data = storage.load_day(date_str)
+        if data is not None:
+            # 处理数据：排序并限制items数量，传入日期以触发检索
+            with metrics.stage('process'):
+                return process_insights_data(data, date_str, refresh_experts, section_keys, max_items)
+    except Exception as e:
+        metrics.record_error('load')
+        print(f"加载数据失败: {e}")
     
     # 尝试加载默认数据文件
     if os.path.exists(DATA_FILE):
         try:
-            with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # 如果数据日期匹配，返回数据
-                data_date = data.get('date', '')
-                if date_str in data_date or data_date.replace('年', '-').replace('月', '-').replace('日', '') == date_str:
-                    # 处理数据：排序并限制items数量，传入日期以触发检索
-                    return process_insights_data(data, date_str)
+            data = read_json_file(DATA_FILE)
+            # 如果数据日期匹配，返回数据
+            data_date = data.get('date', '')
+            if date_str in data_date or normalize_date(data_date) == date_str:
+                # 处理数据：排序并限制items数量，传入日期以触发检索
+                with metrics.stage('process'):
+                    return process_insights_data(data, date_str, refresh_experts, section_keys, max_items)
         except Exception as e:
+            metrics.record_error('load')
             print(f"加载数据失败: {e}")
     
     # 如果没有找到对应日期的数据，根据日期生成当天的内容
-    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-    generated_data = generate_daily_insights(date_obj)
+    with metrics.stage('generate'):
+        generated_data = generate_daily_insights(parse_date(date_str))
     # 处理数据：排序并限制items数量，传入日期以触发检索
-    return process_insights_data(generated_data, date_str)
+    with metrics.stage('process'):
+        return process_insights_data(generated_data, date_str, refresh_experts, section_keys, max_items)
 
 
 def save_insights(data):
@@ -645,30 +846,600 @@ def save_insights(data):
 def save_insights_to_file(data, filepath):
     """保存洞察数据到指定文件"""
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 数据目录在首次写入时创建（导入模块时不创建）
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        write_json_file(filepath, data)
         return True
     except Exception as e:
+        metrics.record_error('save')
         print(f"保存数据失败: {e}")
         return False
 
 
+def save_insights_for_date(date_str, data):
+    """保存指定日期的洞察数据到存储，并登记到日期索引
+    Args:
+        date_str: 日期字符串，格式为 'YYYY-MM-DD'
+    """
+    try:
+        storage.save_day(date_str, data)
+    except Exception as e:
+        metrics.record_error('save')
+        print(f"保存数据失败: {e}")
+        return False
+    date_index.add(date_str)
+    if search_index.built:
+        search_index.index_day(date_str, data, signature=storage.signature(date_str))
+    return True
+
+
+def commit_ingest_batch(batch):
+    """批量上传的写入函数：合并条目到存储，并更新索引和缓存
+    Args:
+        batch: {日期: {板块: [条目, ...]}} 字典
+    """
+    section_meta = {
+        key: {'title': section['title'], 'icon': section['icon']}
+        for key, section in get_default_insights()['sections'].items()
+    }
+    storage.merge_items(batch, section_meta=section_meta)
+    for date_str in batch:
+        date_index.add(date_str)
+        invalidate_insights_cache(date_str)
+        if search_index.built:
+            search_index.index_day(date_str, storage.load_day(date_str), signature=storage.signature(date_str))
+
+
+# 批量上传的后台写入线程（合并并发请求的条目后一次提交）
+ingest_batcher = IngestBatcher(
+    commit_ingest_batch,
+    max_items=INGEST_BATCH_MAX_ITEMS,
+    max_wait=INGEST_BATCH_MAX_WAIT
+)
+
+
+def ensure_search_index():
+    """确保全文检索索引已建立（首次调用时索引全部已存储的日期），
+    之后定期按存储签名重新索引其他进程修改、新增或删除的日期
+    """
+    if not search_index.built:
+        with _search_index_lock:
+            if not search_index.built:
+                search_index.build(storage)
+                return search_index
+    search_index.refresh_if_changed(storage)
+    return search_index
+
+
+def get_range_executor():
+    """获取日期范围查询共用的线程池（首次使用时创建）"""
+    global _range_executor
+    if _range_executor is None:
+        with _range_executor_lock:
+            if _range_executor is None:
+                _range_executor = ThreadPoolExecutor(
+                    max_workers=RANGE_MAX_WORKERS,
+                    thread_name_prefix='range-load'
+                )
+    return _range_executor
+
+
+def load_insights_range(date_from, date_to):
+    """并行加载日期范围内每一天的洞察数据（复用按日期的缓存）
+    只读取已有的专家动态快照，不在后台刷新器中登记范围内的日期，
+    以免挤出最近访问的日期并为每一天安排检索
+    Args:
+        date_from: 起始日期（含），datetime对象
+        date_to: 结束日期（含），datetime对象
+    Returns:
+        (日期字符串, 洞察数据) 元组列表，按日期倒序
+    """
+    days = (date_to - date_from).days + 1
+    dates = [format_date(date_to - timedelta(days=i)) for i in range(days)]
+    load = partial(load_insights, refresh_experts=False)
+    return list(zip(dates, get_range_executor().map(load, dates)))
+
+
+def merge_insights_sections(daily_insights, section_keys=None):
+    """合并多天的洞察数据：按板块汇总条目，去除重复和近似重复的条目并按日期排序
+    Args:
+        daily_insights: (日期字符串, 洞察数据) 元组列表，按日期倒序
+        section_keys: 需要的板块列表，None 表示全部
+    Returns:
+        {板块: {'title', 'icon', 'items'}} 字典
+    """
+    merged = {}
+    seen = {}
+    for _, insights in daily_insights:
+        for section_key, section_data in (insights.get('sections') or {}).items():
+            if section_keys and section_key not in section_keys:
+                continue
+            if section_key not in merged:
+                merged[section_key] = {
+                    'title': section_data.get('title', ''),
+                    'icon': section_data.get('icon', ''),
+                    'items': [],
+                }
+                seen[section_key] = set()
+            for item in section_data.get('items', []):
+                # 同一条内容（标题和相关方相同）只保留一次（保留较新日期的数据）
+                key = (item.get('title', ''), item.get('who', ''))
+                if key in seen[section_key]:
+                    continue
+                seen[section_key].add(key)
+                merged[section_key]['items'].append(item)
+    for section_data in merged.values():
+        # 不同日期中改写过标题的同一条内容只保留最新的一条
+        section_data['items'] = collapse_near_duplicates(sort_items_by_date(section_data['items']))
+    return merged
+
+
+def fetch_expert_snapshot(date_key):
+    """后台刷新任务：检索指定日期（'YYYY-MM-DD'）的专家动态"""
+    with metrics.stage('expert_search'):
+        return search_chinese_ai_experts(date_obj=parse_date(date_key))
+
+
+# 专家动态后台刷新器（按日期保存快照，更新后清除该日期的缓存）
+expert_refresher = SnapshotRefresher(
+    fetch_expert_snapshot,
+    interval=EXPERT_REFRESH_INTERVAL,
+    max_keys=EXPERT_REFRESH_MAX_DATES,
+    on_update=invalidate_insights_cache,
+    name='expert-refresher'
+)
+
+# 启动时预热的最近日期数量
+WARM_CACHE_DAYS = int(os.environ.get('WARM_CACHE_DAYS', 7))
+
+
+def warm_caches(days=WARM_CACHE_DAYS):
+    """预热缓存：加载日期索引并预先编码最近几天的数据
+    全文检索索引需要读取全部已存储的日期，日期较多时耗时长、占用内存多，
+    因此不在启动时建立，而是在首次检索时建立
+    Args:
+        days: 预热的最近日期数量（今天以及最近已存储的日期）
+    Returns:
+        已预热的日期列表
+    """
+    date_index.rescan()
+    today = today_str()
+    recent_dates, _ = date_index.query(limit=days)
+    warmed = []
+    for date_str in [today] + [d for d in recent_dates if d != today][:max(0, days - 1)]:
+        try:
+            load_encoded_insights(date_str)
+            warmed.append(date_str)
+        except Exception as e:
+            metrics.record_error('warm')
+            print(f"预热 {date_str} 的数据失败: {e}")
+    # 预先检索今天的专家动态
+    expert_refresher.request_refresh(today)
+    return warmed
+
+
+def shutdown(timeout=5.0):
+    """停止后台线程并释放资源（进程退出前调用）"""
+    expert_refresher.stop(timeout)
+    for executor in (_expert_search_executor, _range_executor):
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    if _search_backend is not None:
+        _search_backend.close()
+    storage.close()
+
+
+# GET /api/insights 的板块选择、字段投影和分页参数
+# sections: 板块元组；fields: 条目字段元组；after: 分页游标解析出的 (排序键, 条目摘要)；limit: 每页条目数（不分页时为 None）
+InsightsQuery = namedtuple('InsightsQuery', ['sections', 'fields', 'after', 'limit'])
+
+_MISSING = object()
+
+
+def item_cursor_digest(item):
+    """条目的摘要（标题和相关方），用于在分页游标中定位条目"""
+    key = f"{item.get('title', '')}\0{item.get('who', '')}"
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=6).hexdigest()
+
+
+def encode_cursor(section_key, item):
+    """生成分页游标（指向本页最后一个条目）
+    Args:
+        section_key: 板块key
+        item: 本页最后一个条目
+    Returns:
+        URL安全的不透明字符串
+    """
+    raw = f"{section_key}:{_item_sort_key(item)}:{item_cursor_digest(item)}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """解析分页游标
+    Returns:
+        (板块key, 排序键, 条目摘要)
+    Raises:
+        ValueError: 游标无效
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        section_key, sort_key, digest = raw.rsplit(':', 2)
+        return section_key, int(sort_key), digest
+    except ValueError:
+        raise ValueError('after游标无效')
+
+
+def paginate_items(items, after=None, limit=PAGE_SECTION_MAX_ITEMS):
+    """按游标分页（条目已按日期倒序排列）
+    游标对应的条目已不存在时，从日期更早的条目继续
+    Args:
+        items: 条目列表
+        after: (排序键, 条目摘要)，None 表示从第一条开始
+        limit: 每页条目数
+    Returns:
+        (本页条目列表, 是否还有更多条目)
+    """
+    start = 0
+    if after is not None:
+        sort_key, digest = after
+        start = len(items)
+        for index, item in enumerate(items):
+            item_key = _item_sort_key(item)
+            if item_key < sort_key:
+                start = index
+                break
+            if item_key == sort_key and item_cursor_digest(item) == digest:
+                start = index + 1
+                break
+    return items[start:start + limit], start + limit < len(items)
+
+
+def project_item(item, fields):
+    """只保留条目的指定字段（条目中没有的字段不输出）"""
+    projected = {}
+    for field in fields:
+        value = item.get(field, _MISSING)
+        if value is not _MISSING:
+            projected[field] = value
+    return projected
+
+
+def parse_int_arg(args, name, default=None, minimum=0, maximum=None):
+    """读取整数查询参数（只接受十进制数字，不合法时报错而不是使用默认值）
+    Args:
+        args: 查询参数（werkzeug MultiDict）
+        name: 参数名
+        default: 参数不存在时的返回值
+        minimum: 最小值（含）
+        maximum: 最大值（含），None 表示不限制
+    Raises:
+        ValueError: 参数不是整数或超出范围
+    """
+    if name not in args:
+        return default
+    raw = args.get(name, '').strip()
+    value = int(raw) if raw.isascii() and raw.isdigit() else None
+    if value is None or value < minimum or (maximum is not None and value > maximum):
+        if maximum is None:
+            raise ValueError(f'{name}必须为不小于{minimum}的整数')
+        raise ValueError(f'{name}必须为{minimum}到{maximum}之间的整数')
+    return value
+
+
+def parse_insights_query(args):
+    """解析 GET /api/insights 的板块选择、字段投影和分页参数
+    Args:
+        args: 查询参数（werkzeug MultiDict）
+    Returns:
+        InsightsQuery；没有这些参数时返回 None（返回完整的预编码数据）
+    Raises:
+        ValueError: 参数不合法
+    """
+    if not any(name in args for name in InsightsQuery._fields):
+        return None
+    sections = tuple(dict.fromkeys(key.strip() for key in args.get('sections', '').split(',') if key.strip()))
+    fields = tuple(dict.fromkeys(field.strip() for field in args.get('fields', '').split(',') if field.strip()))
+    after = None
+    if args.get('after'):
+        section_key, sort_key, digest = decode_cursor(args['after'])
+        if sections and section_key not in sections:
+            raise ValueError('after游标所属的板块不在sections中')
+        # 游标属于单个板块，只返回该板块的下一页
+        sections = (section_key,)
+        after = (sort_key, digest)
+    limit = None
+    if 'limit' in args or after is not None:
+        limit = parse_int_arg(args, 'limit', PAGE_SECTION_MAX_ITEMS, minimum=1, maximum=INSIGHTS_PAGE_MAX_LIMIT)
+    return InsightsQuery(sections or None, fields or None, after, limit)
+
+
+def load_insights_view(date_str, query):
+    """按查询参数加载洞察数据：只处理和输出请求的板块，
+    分页时读取该日期板块内的全部条目（不限于8条）再按游标截取
+    Args:
+        date_str: 日期字符串，格式为 'YYYY-MM-DD'
+        query: InsightsQuery
+    Returns:
+        响应数据字典；分页时每个板块带有下一页的游标 next（没有更多条目时为 None）
+    """
+    paginate = query.limit is not None
+    insights = load_insights_uncached(date_str, section_keys=query.sections,
+                                      max_items=None if paginate else PAGE_SECTION_MAX_ITEMS)
+    view = {key: value for key, value in insights.items() if key != 'sections'}
+    view['sections'] = {}
+    for section_key, section_data in (insights.get('sections') or {}).items():
+        section_view = {key: value for key, value in section_data.items() if key != 'items'}
+        items = section_data.get('items', [])
+        next_cursor = None
+        if paginate:
+            items, has_more = paginate_items(items, query.after, query.limit)
+            if has_more:
+                next_cursor = encode_cursor(section_key, items[-1])
+        if query.fields:
+            items = [project_item(item, query.fields) for item in items]
+        section_view['items'] = items
+        if paginate:
+            section_view['next'] = next_cursor
+        view['sections'][section_key] = section_view
+    return view
+
+
+def load_encoded_insights_view(date_str, query):
+    """加载按查询参数生成的预编码洞察数据（按日期和查询参数缓存）
+    Args:
+        date_str: 日期字符串，格式为 'YYYY-MM-DD'
+        query: InsightsQuery
+    Returns:
+        EncodedPayload 对象
+    """
+    # 专家动态快照更新后缓存失效（只在请求了专家动态板块时相关）
+    version = get_insights_cache_version(
+        date_str, include_experts=query.sections is None or 'ai_experts' in query.sections)
+    key = (date_str, query)
+    encoded = view_cache.get(key, version=version)
+    if encoded is None:
+        view = load_insights_view(date_str, query)
+        with metrics.stage('encode'):
+            encoded = EncodedPayload(view)
+        view_cache.set(key, encoded, version=version)
+    return encoded
+
+
+def build_insights_response(date_str, accept_encoding=None, if_none_match=None, query=None):
+    """生成 GET /api/insights 的响应（同步和异步入口共用）
+    Args:
+        date_str: 请求中的日期参数
+        accept_encoding: Accept-Encoding 请求头
+        if_none_match: If-None-Match 请求头
+        query: 板块选择、字段投影和分页参数（InsightsQuery），None 表示返回完整数据
+    Returns:
+        (状态码, 响应头字典, 响应体字节)，304 时响应体为空
+    """
+    date_str = normalize_insights_date(date_str)
+    if query is None:
+        encoded = load_encoded_insights(date_str)
+    else:
+        encoded = load_encoded_insights_view(date_str, query)
+    encoding = negotiate_encoding(accept_encoding, encoded.bodies)
+    headers = {
+        'ETag': encoded.etag(encoding),
+        'Vary': 'Accept-Encoding',
+        'Cache-Control': 'no-cache',
+    }
+    # 专家动态快照的时效（秒），便于客户端发现过期数据
+    snapshot_age = expert_refresher.age(date_str)
+    if snapshot_age is not None:
+        headers['X-Experts-Snapshot-Age'] = str(int(snapshot_age))
+    
+    # 客户端缓存的内容未变化，直接返回304
+    if encoded.matches(if_none_match):
+        return 304, headers, b''
+    
+    if encoding != 'identity':
+        headers['Content-Encoding'] = encoding
+    return 200, headers, encoded.bodies[encoding]
+
+
+def parse_dates_query(args):
+    """解析 GET /api/dates 的查询参数
+    Args:
+        args: 查询参数（werkzeug MultiDict）
+    Returns:
+        (起始日期, 结束日期, 每页数量, 跳过的数量)
+    Raises:
+        ValueError: 参数不合法
+    """
+    date_from = args.get('from') or None
+    date_to = args.get('to') or None
+    if date_from:
+        date_from = normalize_date(date_from)
+        if date_from is None:
+            raise ValueError('from必须为YYYY-MM-DD格式的日期')
+    if date_to:
+        date_to = normalize_date(date_to)
+        if date_to is None:
+            raise ValueError('to必须为YYYY-MM-DD格式的日期')
+    limit = parse_int_arg(args, 'limit')
+    offset = parse_int_arg(args, 'offset', 0)
+    return date_from, date_to, limit, offset
+
+
+def query_available_dates(date_from=None, date_to=None, limit=None, offset=0):
+    """查询可用日期（按日期倒序，最新的在前）
+    Returns:
+        GET /api/dates 的响应数据字典
+    """
+    page, total = date_index.query(date_from, date_to, limit=limit, offset=offset)
+    dates = [{'date': date_part, 'display': display_date(date_part)} for date_part in page]
+    return {
+        'dates': dates,
+        'total': total,
+        'offset': offset,
+        'has_more': offset + len(dates) < total,
+    }
+
+
+def section_content_hash(section_key, items):
+    """计算板块内容的哈希值（只包含页面上显示的字段）"""
+    digest = hashlib.blake2b(section_key.encode('utf-8'), digest_size=16)
+    for item in items:
+        for field in FRAGMENT_FIELDS:
+            digest.update(b'\x1f')
+            digest.update(str(item.get(field, '')).encode('utf-8'))
+        digest.update(b'\x1e')
+    return digest.hexdigest()
+
+
+def render_section_fragment(section_key, anchor, icon, heading, items):
+    """渲染一个板块的HTML片段（相同内容只渲染一次）
+    Returns:
+        Markup 对象，可直接拼接到页面中
+    """
+    items = list(items)[:PAGE_SECTION_MAX_ITEMS]
+    content_hash = section_content_hash(section_key, items)
+    fragment = fragment_cache.get(content_hash)
+    if fragment is None:
+        fragment = Markup(render_template('_section.html', anchor=anchor, icon=icon, heading=heading, items=items))
+        fragment_cache.set(content_hash, fragment)
+    return fragment
+
+
+def render_index_page(insights):
+    """由各板块的HTML片段拼接出主页面"""
+    sections = insights.get('sections') or {}
+    fragments = [
+        render_section_fragment(key, anchor, icon, heading, (sections.get(key) or {}).get('items', []))
+        for key, anchor, icon, heading in PAGE_SECTIONS
+    ]
+    return render_template('index.html', insights=insights, section_fragments=fragments)
+
+
+def load_rendered_page(date_str=None):
+    """加载渲染后的主页面（优先读取缓存）
+    Args:
+        date_str: 日期字符串，格式为 'YYYY-MM-DD' 或 'YYYY年MM月DD日'
+    """
+    date_str = normalize_insights_date(date_str)
+    # 与数据缓存相同按 (数据源签名, 专家动态快照时间) 校验，渲染期间快照更新时旧页面不会被命中
+    version = get_insights_cache_version(date_str)
+    page = page_cache.get(date_str, version=version)
+    if page is None:
+        insights = load_insights(date_str)
+        with metrics.stage('render'):
+            page = render_index_page(insights)
+        page_cache.set(date_str, page, version=version)
+    return page
+
+
+def collect_cache_metrics():
+    """采集各缓存的命中统计（供 /api/metrics 输出）"""
+    caches = (('insights', insights_cache), ('payload', payload_cache), ('view', view_cache),
+              ('page', page_cache), ('fragment', fragment_cache))
+    stats = [(name, cache.stats()) for name, cache in caches]
+    families = []
+    for metric, field, metric_type, documentation in (
+            ('insights_cache_hits_total', 'hits', 'counter', '缓存命中次数'),
+            ('insights_cache_misses_total', 'misses', 'counter', '缓存未命中次数'),
+            ('insights_cache_evictions_total', 'evictions', 'counter', '缓存淘汰次数'),
+            ('insights_cache_entries', 'size', 'gauge', '缓存条目数'),
+            ('insights_cache_hit_ratio', 'hit_rate', 'gauge', '缓存命中率')):
+        families.append((metric, metric_type, documentation,
+                         [([('cache', name)], values[field]) for name, values in stats]))
+    return families
+
+
+metrics.registry.add_collector(collect_cache_metrics)
+
+
+@app.before_request
+def start_request_metrics():
+    request.environ['insights.metrics'] = metrics.start_request()
+
+
+@app.after_request
+def finish_request_metrics(response):
+    started = request.environ.pop('insights.metrics', None)
+    if started is not None:
+        # 按路由模板统计（未匹配的路径统一记为 unmatched，避免标签数量无限增长）
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        metrics.finish_request(started, route, request.method, response.status_code, path=request.full_path.rstrip('?'))
+    return response
+
+
 @app.route('/')
 def index():
     """主页面"""
     date_str = request.args.get('date', None)
-    insights = load_insights(date_str)
-    return render_template('index.html', insights=insights)
+    return load_rendered_page(date_str)
 
 
 @app.route('/api/insights', methods=['GET'])
 def get_insights():
     """获取洞察数据API
-    支持查询参数 date: 日期字符串，格式为 'YYYY-MM-DD'
+    支持查询参数:
+        date: 日期字符串，格式为 'YYYY-MM-DD'
+        sections: 需要的板块，逗号分隔，默认全部（只处理和返回这些板块）
+        fields: 条目需要的字段，逗号分隔，默认全部
+        limit: 每个板块每页的条目数（指定时分页，可读取板块内超过8条的条目），默认8
+        after: 上一页响应中板块的 next 游标，返回该板块的下一页
     """
-    date_str = request.args.get('date', None)
-    insights = load_insights(date_str)
-    return jsonify(insights)
+    try:
+        query = parse_insights_query(request.args)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': f'参数错误: {e}'}), 400
+    status, headers, body = build_insights_response(
+        request.args.get('date', None),
+        request.headers.get('Accept-Encoding'),
+        request.headers.get('If-None-Match'),
+        query
+    )
+    if status == 304:
+        return Response(status=304, headers=headers)
+    return Response(body, mimetype='application/json', headers=headers)
+
+
+@app.route('/api/insights/range', methods=['GET'])
+def get_insights_range():
+    """获取日期范围内合并后的洞察数据API
+    支持查询参数:
+        from: 起始日期（含），格式为 'YYYY-MM-DD'
+        to: 结束日期（含），格式为 'YYYY-MM-DD'，默认与起始日期相同
+        sections: 需要的板块，逗号分隔，默认全部
+    响应以流式JSON输出，各板块的条目按日期倒序排列并去除重复
+    """
+    date_from = parse_date(request.args.get('from'))
+    date_to = parse_date(request.args.get('to')) if request.args.get('to') else date_from
+    if date_from is None or date_to is None:
+        return jsonify({'success': False, 'message': '参数错误: from和to必须为YYYY-MM-DD格式的日期'}), 400
+    if date_to < date_from:
+        return jsonify({'success': False, 'message': '参数错误: to不能早于from'}), 400
+    if (date_to - date_from).days + 1 > RANGE_MAX_DAYS:
+        return jsonify({'success': False, 'message': f'参数错误: 最多查询{RANGE_MAX_DAYS}天'}), 400
+    
+    section_keys = [key.strip() for key in request.args.get('sections', '').split(',') if key.strip()]
+    daily_insights = load_insights_range(date_from, date_to)
+    merged = merge_insights_sections(daily_insights, section_keys or None)
+    
+    def dumps(value):
+        return codec.dumps(value).decode('utf-8')
+    
+    def generate():
+        yield '{"from":%s,"to":%s,"dates":%s,"sections":{' % (
+            dumps(format_date(date_from)),
+            dumps(format_date(date_to)),
+            dumps([date_str for date_str, _ in daily_insights]),
+        )
+        for index, (section_key, section_data) in enumerate(merged.items()):
+            yield '%s%s:{"title":%s,"icon":%s,"items":[' % (
+                ',' if index else '', dumps(section_key),
+                dumps(section_data['title']), dumps(section_data['icon']),
+            )
+            for item_index, item in enumerate(section_data['items']):
+                yield (',' if item_index else '') + dumps(item)
+            yield ']}'
+        yield '}}'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 
 @app.route('/api/insights', methods=['POST'])
@@ -676,19 +1447,20 @@ def update_insights():
     """更新洞察数据API"""
     try:
         data = request.get_json()
-        # 如果数据包含日期，保存到对应日期的文件
-        date_str = data.get('date', datetime.now().strftime("%Y年%m月%d日"))
-        # 提取日期部分用于文件名
-        try:
-            if '年' in date_str:
-                date_part = date_str.replace('年', '-').replace('月', '-').replace('日', '')
-            else:
-                date_part = date_str
-            date_file = os.path.join(DATA_DIR, f"insights_{date_part}.json")
-        except:
-            date_file = DATA_FILE
+        # 如果数据包含日期，保存到对应日期
+        date_str = data.get('date', display_date(date.today()))
+        # 提取日期部分（无法识别时为 None）
+        date_part = normalize_date(date_str)
+        
+        # 日期无法识别时保存到默认数据文件
+        if date_part is None:
+            saved = save_insights(data)
+        else:
+            saved = save_insights_for_date(date_part, data)
         
-        if save_insights_to_file(data, date_file):
+        if saved:
+            # 数据已更新，清除该日期的缓存（默认数据文件更新时清空全部缓存）
+            invalidate_insights_cache(date_part)
             return jsonify({'success': True, 'message': '数据更新成功'})
         else:
             return jsonify({'success': False, 'message': '数据更新失败'}), 500
@@ -696,28 +1468,126 @@ def update_insights():
         return jsonify({'success': False, 'message': str(e)}), 400
 
 
+@app.route('/api/insights/ingest', methods=['POST'])
+def ingest_insights():
+    """批量上传条目API（NDJSON，每行一个条目）
+    每行为一个JSON对象，包含条目字段以及:
+        section: 板块（必填），例如 'enterprise_ai'
+        day: 归档日期（可选），默认使用查询参数 date 或条目的 date
+    条目边读取边校验，按日期和板块合并到已有数据中（标题相同的条目更新，其余追加）
+    """
+    default_day = request.args.get('date') or None
+    accepted = 0
+    rejected = 0
+    errors = []
+    futures = []
+    chunk = []
+    
+    for line_no, line in enumerate(request.stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            chunk.append(validate_ingest_item(codec.loads(line), default_day))
+        except ValueError as e:
+            rejected += 1
+            if len(errors) < INGEST_MAX_ERRORS:
+                errors.append({'line': line_no, 'error': str(e)})
+            continue
+        if len(chunk) >= INGEST_CHUNK_SIZE:
+            futures.append(ingest_batcher.submit(chunk))
+            chunk = []
+    if chunk:
+        futures.append(ingest_batcher.submit(chunk))
+    
+    try:
+        for future in futures:
+            accepted += future.result(timeout=INGEST_COMMIT_TIMEOUT)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'数据写入失败: {e}',
+            'accepted': accepted,
+            'rejected': rejected,
+            'errors': errors,
+        }), 500
+    
+    return jsonify({
+        'success': True,
+        'message': '数据上传成功',
+        'accepted': accepted,
+        'rejected': rejected,
+        'errors': errors,
+    })
+
+
 @app.route('/api/dates', methods=['GET'])
 def get_available_dates():
-    """获取可用的日期列表"""
-    dates = []
-    if os.path.exists(DATA_DIR):
-        for filename in os.listdir(DATA_DIR):
-            if filename.startswith('insights_') and filename.endswith('.json'):
-                # 提取日期
-                date_part = filename.replace('insights_', '').replace('.json', '')
-                try:
-                    # 验证日期格式
-                    date_obj = datetime.strptime(date_part, "%Y-%m-%d")
-                    dates.append({
-                        'date': date_part,
-                        'display': date_obj.strftime("%Y年%m月%d日")
-                    })
-                except:
-                    continue
+    """获取可用的日期列表
+    支持查询参数:
+        from: 起始日期（含），格式为 'YYYY-MM-DD'
+        to: 结束日期（含），格式为 'YYYY-MM-DD'
+        limit: 每页数量（不指定时返回全部）
+        offset: 跳过的数量，用于翻页
+    """
+    try:
+        query = parse_dates_query(request.args)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': f'参数错误: {e}'}), 400
+    return jsonify(query_available_dates(*query))
+
+
+@app.route('/api/search', methods=['GET'])
+def search_insights():
+    """全文检索已存储的洞察条目
+    支持查询参数:
+        q: 关键词（公司、人物、芯片型号等），多个关键词需同时命中
+        section: 只检索指定板块（可选）
+        limit: 最多返回的结果数量，默认20，最大100
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'success': False, 'message': '参数错误: 缺少查询关键词q'}), 400
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    section = request.args.get('section') or None
     
-    # 按日期倒序排列（最新的在前）
-    dates.sort(key=lambda x: x['date'], reverse=True)
-    return jsonify({'dates': dates})
+    start = time.perf_counter()
+    total, hits = ensure_search_index().search(query, limit=limit, section=section)
+    return jsonify({
+        'query': query,
+        'total': total,
+        'hits': hits,
+        'took_ms': round((time.perf_counter() - start) * 1000, 3),
+    })
+
+
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """获取缓存命中统计"""
+    return jsonify({
+        'insights': insights_cache.stats(),
+        'payload': payload_cache.stats(),
+        'view': view_cache.stats(),
+        'page': page_cache.stats(),
+        'fragment': fragment_cache.stats(),
+        'search_backend': get_search_backend().stats(),
+        'ingest': ingest_batcher.stats(),
+    })
+
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """以Prometheus文本格式输出运行指标"""
+    return Response(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@app.route('/api/metrics/slow', methods=['GET'])
+def get_slow_requests():
+    """获取最近采样的慢请求（需设置 SLOW_REQUEST_THRESHOLD）"""
+    return jsonify({
+        'threshold': metrics.slow_sampler.threshold,
+        'samples': metrics.slow_sampler.samples(),
+    })
 
 
 @app.route('/api/health', methods=['GET'])
@@ -774,6 +1644,9 @@ if __name__ == '__main__':
     print(f"数据文件: {DATA_FILE}")
     print(f"访问地址: http://0.0.0.0:{port}")
     print(f"本地访问: http://localhost:{port}")
+    print("生产环境请使用: python serve.py --bind 0.0.0.0:5000 --workers 4")
     print("=" * 60)
+    # 预先检索今天的专家动态
+    expert_refresher.request_refresh(today_str())
     app.run(host='0.0.0.0', port=port, debug=True)
 
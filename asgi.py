@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+ASGI入口
+主页、GET /api/insights 和 GET /api/dates 由异步处理函数直接处理：
+读取文件、查询数据库和渲染模板放到有上限的线程池中执行，事件循环只负责收发数据，
+因此慢速客户端只占用一个连接，不会占用工作线程，单个进程可以同时保持大量连接；
+其余路由通过 asgiref 的 WsgiToAsgi 交给 Flask 应用处理
+
+用法:
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+    python serve.py --asgi --workers 4
+"""
+
+import asyncio
+import contextvars
+import functools
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.datastructures import MultiDict
+
+import app as insights_app
+import metrics
+
+# 执行阻塞操作（文件读取、数据库查询、模板渲染）的线程数上限
+ASGI_IO_WORKERS = int(os.environ.get('ASGI_IO_WORKERS', 16))
+
+
+def build_environ(scope, body=b''):
+    """根据ASGI请求信息构造WSGI environ（用于在Flask请求上下文中渲染模板）"""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': str(server[0]),
+        'SERVER_PORT': str(server[1]) if server[1] is not None else '80',
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name == 'CONTENT_LENGTH':
+            environ['CONTENT_LENGTH'] = value
+        else:
+            key = f'HTTP_{name}'
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class InsightsASGIApplication:
+    """异步处理读取类接口，其余请求交给Flask应用"""
+
+    def __init__(self, flask_app, io_workers=ASGI_IO_WORKERS):
+        self.flask_app = flask_app
+        self.fallback = WsgiToAsgi(flask_app)
+        self.io_workers = io_workers
+        self._executor = None
+        self.routes = {
+            '/': self.index,
+            '/api/insights': self.get_insights,
+            '/api/dates': self.get_available_dates,
+        }
+
+    def get_executor(self):
+        """获取执行阻塞操作的线程池（首次使用时创建）"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix='asgi-io')
+        return self._executor
+
+    async def run_blocking(self, func, *args):
+        """在线程池中执行阻塞函数，不阻塞事件循环（沿用当前上下文，阶段耗时计入当前请求）"""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self.get_executor(), functools.partial(context.run, func, *args))
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD'):
+            handler = self.routes.get(scope['path'])
+            if handler is not None:
+                await handler(scope, send)
+                return
+        await self.fallback(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        """启动时预热缓存，退出时停止后台线程"""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await self.run_blocking(insights_app.warm_caches)
+                except Exception as e:
+                    print(f"预热缓存失败: {e}")
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                insights_app.shutdown()
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    def request_headers(scope):
+        """返回小写名称的请求头字典"""
+        return {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope.get('headers', [])}
+
+    @staticmethod
+    def query_args(scope):
+        return MultiDict(parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True))
+
+    async def respond(self, scope, send, status, headers, body=b'', content_type=None):
+        """发送响应（HEAD请求不发送响应体）"""
+        headers = dict(headers)
+        if content_type:
+            headers['Content-Type'] = content_type
+        if status != 304:
+            headers['Content-Length'] = str(len(body))
+        # 与 Flask-CORS 的默认配置一致：允许任意来源
+        if 'origin' in self.request_headers(scope):
+            headers['Access-Control-Allow-Origin'] = '*'
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(name.encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()],
+        })
+        send_body = body if scope['method'] != 'HEAD' and status != 304 else b''
+        await send({'type': 'http.response.body', 'body': send_body})
+
+    async def respond_json(self, scope, send, status, data):
+        """发送JSON响应（与Flask的 jsonify 使用同一个JSON provider，键排序和格式相同，两个入口返回的字节一致）"""
+        with self.flask_app.app_context():
+            body = self.flask_app.json.response(data).get_data()
+        await self.respond(scope, send, status, {}, body, content_type='application/json')
+
+    async def index(self, scope, send):
+        """主页面：在线程池中按Flask的方式处理请求（包括模板渲染）"""
+        def dispatch():
+            with self.flask_app.request_context(build_environ(scope)):
+                response = self.flask_app.full_dispatch_request()
+                return response.status_code, list(response.headers.items()), response.get_data()
+
+        status, headers, body = await self.run_blocking(dispatch)
+        headers = {name: value for name, value in headers if name.lower() != 'content-length'}
+        await self.respond(scope, send, status, headers, body)
+
+    @staticmethod
+    def request_path(scope):
+        query_string = scope.get('query_string', b'').decode('latin-1')
+        return f"{scope['path']}?{query_string}" if query_string else scope['path']
+
+    async def get_insights(self, scope, send):
+        """获取洞察数据API（异步版本）"""
+        started = metrics.start_request()
+        status = 500
+        try:
+            args = self.query_args(scope)
+            try:
+                query = insights_app.parse_insights_query(args)
+            except ValueError as e:
+                status = 400
+                await self.respond_json(scope, send, status, {'success': False, 'message': f'参数错误: {e}'})
+                return
+            headers = self.request_headers(scope)
+            status, response_headers, body = await self.run_blocking(
+                insights_app.build_insights_response,
+                args.get('date', None),
+                headers.get('accept-encoding'),
+                headers.get('if-none-match'),
+                query
+            )
+            await self.respond(scope, send, status, response_headers, body, content_type='application/json')
+        finally:
+            metrics.finish_request(started, scope['path'], scope['method'], status, path=self.request_path(scope))
+
+    async def get_available_dates(self, scope, send):
+        """获取可用的日期列表（异步版本）"""
+        started = metrics.start_request()
+        status = 500
+        try:
+            try:
+                query = insights_app.parse_dates_query(self.query_args(scope))
+            except ValueError as e:
+                status = 400
+                await self.respond_json(scope, send, status, {'success': False, 'message': f'参数错误: {e}'})
+                return
+            data = await self.run_blocking(insights_app.query_available_dates, *query)
+            status = 200
+            await self.respond_json(scope, send, status, data)
+        finally:
+            metrics.finish_request(started, scope['path'], scope['method'], status, path=self.request_path(scope))
+
+
+application = InsightsASGIApplication(insights_app.app)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+同步/异步入口负载对比
+分别启动同步入口（gunicorn gthread）和异步入口（uvicorn + asgi.py），
+先建立大量慢速客户端连接（请求头分多次缓慢发送），再并发发起正常请求，
+统计正常请求的延迟（p50/p99）、吞吐量和失败数
+
+用法:
+    python benchmarks/bench_async.py [--slow-clients 500] [--requests 500] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REQUEST_PATHS = ('/api/insights', '/api/dates?limit=10')
+
+
+def percentile(values, pct):
+    """计算百分位数（values需已排序）"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, port, threads):
+    """启动被测服务，返回子进程"""
+    if mode == 'sync':
+        command = [sys.executable, 'serve.py', '--bind', f'127.0.0.1:{port}', '--workers', '1',
+                   '--threads', str(threads), '--timeout', '120']
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'asgi:application', '--host', '127.0.0.1',
+                   '--port', str(port), '--log-level', 'warning', '--backlog', '4096']
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'{mode} 服务启动失败')
+
+
+async def slow_client(port, hold, stop):
+    """慢速客户端：请求头分多次发送，每次间隔 hold 秒，直到测试结束"""
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    except OSError:
+        return
+    try:
+        writer.write(b'GET /api/insights HTTP/1.1\r\nHost: localhost\r\n')
+        await writer.drain()
+        while not stop.is_set():
+            await asyncio.sleep(hold)
+            writer.write(b'X-Slow: 1\r\n')
+            await writer.drain()
+    except OSError:
+        pass
+    finally:
+        writer.close()
+
+
+async def fetch(port, path, timeout):
+    """发起一个正常请求，返回延迟（秒），失败或超时时返回 None"""
+    start = time.perf_counter()
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        status = await asyncio.wait_for(reader.readline(), timeout=timeout)
+        await asyncio.wait_for(reader.read(), timeout=timeout)
+        writer.close()
+    except (OSError, asyncio.TimeoutError):
+        return None
+    if b' 200 ' not in status:
+        return None
+    return time.perf_counter() - start
+
+
+async def run_load(port, slow_clients, requests, concurrency, hold, timeout):
+    stop = asyncio.Event()
+    slow_tasks = [asyncio.create_task(slow_client(port, hold, stop)) for _ in range(slow_clients)]
+    # 等待慢速连接建立
+    await asyncio.sleep(1.0)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(i):
+        async with semaphore:
+            return await fetch(port, REQUEST_PATHS[i % len(REQUEST_PATHS)], timeout)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(limited(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await asyncio.gather(*slow_tasks, return_exceptions=True)
+    return results, elapsed
+
+
+def report(name, results, elapsed):
+    latencies = sorted(r for r in results if r is not None)
+    failed = len(results) - len(latencies)
+    print(f"{name:<6} p50={percentile(latencies, 50) * 1000:8.2f}ms "
+          f"p99={percentile(latencies, 99) * 1000:8.2f}ms "
+          f"吞吐={len(latencies) / elapsed:8.1f}次/秒 失败={failed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='同步/异步入口负载对比')
+    parser.add_argument('--slow-clients', type=int, default=500, help='慢速客户端连接数')
+    parser.add_argument('--requests', type=int, default=500, help='正常请求数')
+    parser.add_argument('--concurrency', type=int, default=20, help='正常请求并发数')
+    parser.add_argument('--threads', type=int, default=8, help='同步入口的线程数')
+    parser.add_argument('--timeout', type=float, default=3.0, help='正常请求的超时（秒）')
+    parser.add_argument('--hold', type=float, default=0.5, help='慢速客户端每次发送的间隔（秒）')
+    args = parser.parse_args()
+
+    for mode in ('sync', 'async'):
+        port = free_port()
+        process = start_server(mode, port, args.threads)
+        try:
+            results, elapsed = asyncio.run(
+                run_load(port, args.slow_clients, args.requests, args.concurrency, args.hold, args.timeout))
+            report(mode, results, elapsed)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    main()
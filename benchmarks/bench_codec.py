@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+序列化编解码基准测试
+用合成的单日数据对比标准库 json、orjson 和 msgpack（内存映射读取）的编码、解码耗时和数据大小
+
+用法:
+    python benchmarks/bench_codec.py [--items 60] [--rounds 200]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import codec  # noqa: E402
+from run import SECTIONS  # noqa: E402
+
+
+def synthetic_day(items_per_section):
+    """合成一天的数据"""
+    sections = {}
+    for key, title, icon in SECTIONS:
+        sections[key] = {
+            'title': title,
+            'icon': icon,
+            'items': [{
+                'title': f'某公司发布第{i}代人工智能模型，推理速度提升{i % 50}%',
+                'description': f'该模型在多项基准测试中取得领先成绩，训练成本降低{i % 30}%，预计将在下季度向企业客户开放。' * 2,
+                'who': f'公司{i % 7}',
+                'impact': f'性能提升{i % 50}%',
+                'date': '2026-10-01',
+                'source': '官方公告',
+                'highlight': i % 5 == 0,
+            } for i in range(items_per_section)],
+        }
+    return {'date': '2026-10-01', 'sections': sections}
+
+
+def timed(func, rounds):
+    """平均每次耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='序列化编解码基准测试')
+    parser.add_argument('--items', type=int, default=60, help='每个板块的条目数')
+    parser.add_argument('--rounds', type=int, default=200, help='计时轮数')
+    args = parser.parse_args()
+
+    data = synthetic_day(args.items)
+    results = []
+
+    text = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    results.append(('json（标准库）',
+                    timed(lambda: json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'), args.rounds),
+                    timed(lambda: json.loads(text), args.rounds),
+                    len(text)))
+
+    if codec.ORJSON_AVAILABLE:
+        encoded = codec.dumps(data, indent=True)
+        results.append(('orjson',
+                        timed(lambda: codec.dumps(data, indent=True), args.rounds),
+                        timed(lambda: codec.loads(encoded), args.rounds),
+                        len(encoded)))
+    else:
+        print("orjson未安装，跳过")
+
+    if codec.MSGPACK_AVAILABLE:
+        msgpack_codec = codec.CODECS['msgpack']
+        encoded = msgpack_codec.encode(data)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'insights_2026-10-01.msgpack')
+            with open(path, 'wb') as f:
+                f.write(encoded)
+            results.append(('msgpack（内存映射）',
+                            timed(lambda: msgpack_codec.encode(data), args.rounds),
+                            timed(lambda: codec.read_mapped(path), args.rounds),
+                            len(encoded)))
+    else:
+        print("msgpack未安装，跳过")
+
+    print(f"{'格式':<20}{'编码(ms)':>10}{'解码(ms)':>10}{'大小(KB)':>10}")
+    for name, encode_ms, decode_ms, size in results:
+        print(f"{name:<20}{encode_ms:>10.3f}{decode_ms:>10.3f}{size / 1024:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+日期解析基准测试
+模拟一次请求中的日期处理（请求参数 + 每个条目的日期），对比旧的
+replace + strptime 方式与 dates 模块（正则解析 + 缓存）的单次请求耗时
+
+用法:
+    python benchmarks/bench_dates.py [--requests 2000] [--items 48]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dates import cache_info, date_to_ordinal, normalize_date, parse_date  # noqa: E402
+
+
+def legacy_parse(date_str):
+    """旧实现：替换中文字符后使用 strptime 解析"""
+    try:
+        if '年' in date_str:
+            date_str = date_str.replace('年', '-').replace('月', '-').replace('日', '')
+        return datetime.strptime(date_str, "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def legacy_request(date_param, item_dates):
+    target = legacy_parse(date_param)
+    # 排序和 ±3 天筛选各解析一次条目日期
+    parsed = [legacy_parse(value) or datetime.min for value in item_dates]
+    sorted(parsed, reverse=True)
+    return [d for d in (legacy_parse(value) for value in item_dates) if d and abs((target - d).days) <= 3]
+
+
+def unified_request(date_param, item_dates):
+    target = parse_date(date_param).toordinal()
+    ordinals = [date_to_ordinal(value) for value in item_dates]
+    sorted((o if o is not None else -1 for o in ordinals), reverse=True)
+    return [o for o in ordinals if o is not None and abs(target - o) <= 3]
+
+
+def measure(name, handler, requests):
+    start = time.perf_counter()
+    for date_param, item_dates in requests:
+        handler(date_param, item_dates)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<10} 单次请求={elapsed / len(requests) * 1e6:8.2f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='日期解析基准测试')
+    parser.add_argument('--requests', type=int, default=2000, help='模拟请求数')
+    parser.add_argument('--items', type=int, default=48, help='每个请求的条目数')
+    args = parser.parse_args()
+
+    today = date.today()
+    requests = []
+    for i in range(args.requests):
+        day = today - timedelta(days=i % 60)
+        date_param = f"{day.year}年{day.month:02d}月{day.day:02d}日" if i % 2 else day.isoformat()
+        item_dates = [(day - timedelta(days=j % 5)).isoformat() for j in range(args.items)]
+        requests.append((date_param, item_dates))
+
+    # 两种实现的结果应一致
+    for date_param, _ in requests[:100]:
+        assert legacy_parse(date_param).date().isoformat() == normalize_date(date_param)
+
+    measure('legacy', legacy_request, requests)
+    measure('unified', unified_request, requests)
+    print(f"{'':<10} {cache_info()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+近似重复条目去重基准测试
+合成一段日期范围的数据（同一条内容在多天中以改写过的标题重复出现），
+对比只按标题和相关方精确去重与近似重复去重后的条目数、响应大小和耗时；
+用人工标注的新闻标题对（同一条内容的改写、同一公司的不同产品或版本）统计各阈值的准确率和召回率，
+当前阈值误合并了不同内容，或默认的专家动态板块不足8条时以非零状态退出
+
+用法:
+    python benchmarks/bench_dedup.py [--days 31] [--stories 40] [--repeat 4]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 专家动态使用不带延迟的模拟搜索
+os.environ.setdefault('EXPERT_SEARCH_MOCK_DELAY', '0')
+
+from dedup import NEAR_DUPLICATE_SIMILARITY, collapse_near_duplicates, fingerprint, is_near_duplicate  # noqa: E402
+from models import json_default, to_items  # noqa: E402
+
+COMPANIES = ('OpenAI', '谷歌DeepMind', '英伟达', '百度', '阿里巴巴', '腾讯', '字节跳动', '华为')
+PRODUCTS = ('大模型', '推理芯片', '智能体平台', '多模态模型', '训练集群', '开源框架')
+VERBS = ('发布', '推出', '正式发布', '宣布推出', '上线')
+SUFFIXES = ('', '新版本', '升级版', '（附详细参数）')
+# 默认专家动态板块应有的条目数
+EXPECTED_EXPERT_ITEMS = 8
+# 校准时统计的阈值
+CALIBRATION_THRESHOLDS = (0.3, 0.4, 0.5, 0.55, 0.6, 0.7, 0.8)
+
+# 人工标注的标题对：(标题A, 标题B, 相关方, 是否为同一条内容)
+LABELED_PAIRS = [
+    ('英伟达发布H100芯片', '英伟达发布H200芯片', '英伟达', False),
+    ('百度发布文心一言4.0', '百度发布文心一言3.5', '百度', False),
+    ('台积电3nm工艺量产', '台积电2nm工艺量产', '台积电', False),
+    ('OpenAI发布GPT-4 Turbo', 'OpenAI发布GPT-4o', 'OpenAI', False),
+    ('阿里巴巴开源通义千问Qwen2.5', '阿里巴巴开源通义千问Qwen3', '阿里巴巴', False),
+    ('谷歌发布Gemini 1.5 Pro', '谷歌发布Gemini 2.0 Flash', '谷歌', False),
+    ('华为发布昇腾910B芯片', '华为发布昇腾910C芯片', '华为', False),
+    ('英伟达发布Blackwell架构GPU', '英伟达发布新一代机器人平台', '英伟达', False),
+    ('百度文心一言用户数突破1亿', '百度文心一言开放API接口', '百度', False),
+    ('字节跳动发布豆包大模型', '字节跳动发布豆包视频生成模型', '字节跳动', False),
+    ('腾讯混元大模型正式开源', '腾讯混元大模型接入微信', '腾讯', False),
+    ('OpenAI发布o1推理模型', 'OpenAI发布Sora视频模型', 'OpenAI', False),
+    ('Meta开源Llama 3模型', 'Meta开源Llama 3.1模型', 'Meta', False),
+    ('智谱AI发布GLM-4', '智谱AI完成新一轮融资', '智谱AI', False),
+    ('华为发布盘古大模型5.0', '华为发布鸿蒙操作系统5.0', '华为', False),
+    ('微软发布Copilot新功能', '微软发布Phi-3小模型', '微软', False),
+    ('英伟达发布H100芯片', '英伟达正式发布H100芯片', '英伟达', True),
+    ('英伟达发布H100芯片', '英伟达H100芯片正式发布', '英伟达', True),
+    ('百度发布文心一言4.0', '百度正式发布文心一言4.0版本', '百度', True),
+    ('台积电3nm工艺量产', '台积电3nm工艺正式量产', '台积电', True),
+    ('OpenAI发布GPT-4 Turbo', 'OpenAI正式推出GPT-4 Turbo', 'OpenAI', True),
+    ('字节跳动发布豆包大模型', '字节跳动正式发布豆包大模型', '字节跳动', True),
+    ('腾讯混元大模型正式开源', '腾讯宣布开源混元大模型', '腾讯', True),
+    ('阿里巴巴开源通义千问Qwen2.5', '阿里巴巴宣布开源通义千问Qwen2.5系列模型', '阿里巴巴', True),
+    ('谷歌发布Gemini 1.5 Pro', '谷歌推出Gemini 1.5 Pro', '谷歌', True),
+    ('Meta开源Llama 3模型', 'Meta正式开源Llama 3大模型', 'Meta', True),
+    ('华为发布昇腾910B芯片', '华为昇腾910B芯片发布', '华为', True),
+    ('智谱AI完成新一轮融资', '智谱AI宣布完成新一轮融资', '智谱AI', True),
+    ('微软发布Phi-3小模型', '微软推出Phi-3小模型', '微软', True),
+    ('OpenAI发布Sora视频模型', 'OpenAI发布视频生成模型Sora', 'OpenAI', True),
+    ('百度文心一言用户数突破1亿', '文心一言用户数突破1亿', '百度', True),
+    ('英伟达发布Blackwell架构GPU', '英伟达推出Blackwell架构GPU', '英伟达', True),
+]
+
+
+def calibrate(threshold):
+    """在标注的标题对上统计各阈值的准确率和召回率
+    Returns:
+        [(阈值, 准确率, 召回率, 误合并的标题对列表), ...]
+    """
+    results = []
+    for value in sorted(set(CALIBRATION_THRESHOLDS) | {threshold}):
+        merged = [(a, b, same) for a, b, who, same in LABELED_PAIRS
+                  if is_near_duplicate(fingerprint(a, '', who), fingerprint(b, '', who), value)]
+        true_positive = sum(1 for _, _, same in merged if same)
+        positives = sum(1 for *_, same in LABELED_PAIRS if same)
+        precision = true_positive / len(merged) if merged else 1.0
+        recall = true_positive / positives if positives else 1.0
+        results.append((value, precision, recall, [(a, b) for a, b, same in merged if not same]))
+    return results
+
+
+def synthetic_items(days, stories, repeat, rng):
+    """合成条目：每条内容在 repeat 天中出现，标题措辞和描述略有不同"""
+    end = date.today()
+    items = []
+    for story in range(stories):
+        company = rng.choice(COMPANIES)
+        product = f'{rng.choice(PRODUCTS)}{story}号'
+        gain = rng.randint(10, 90)
+        first_day = rng.randint(0, max(0, days - repeat))
+        for offset in range(repeat):
+            item_date = end - timedelta(days=first_day + offset)
+            items.append({
+                'title': f'{company}{rng.choice(VERBS)}{product}{rng.choice(SUFFIXES)}',
+                'description': f'{company}{rng.choice(VERBS)}{product}，性能提升{gain}%，'
+                               f'成本降低{gain // 2}%，{rng.choice(("首批客户已开始测试", "预计下季度商用", "已开放申请"))}。',
+                'who': company,
+                'impact': f'性能提升{gain}%',
+                'date': item_date.isoformat(),
+                'source': f'{company}官方公告',
+                'highlight': False,
+            })
+    rng.shuffle(items)
+    return items
+
+
+def exact_dedup(items):
+    """只按标题和相关方去重（原有逻辑）"""
+    seen = set()
+    kept = []
+    for item in items:
+        key = (item.get('title', ''), item.get('who', ''))
+        if key in seen:
+            continue
+        seen.add(key)
+        kept.append(item)
+    return kept
+
+
+def payload_size(items):
+    return len(json.dumps(items, ensure_ascii=False, separators=(',', ':'), default=json_default).encode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='近似重复条目去重基准测试')
+    parser.add_argument('--days', type=int, default=31, help='日期范围天数')
+    parser.add_argument('--stories', type=int, default=40, help='不同内容的数量')
+    parser.add_argument('--repeat', type=int, default=4, help='每条内容重复出现的天数')
+    parser.add_argument('--rounds', type=int, default=50, help='计时轮数')
+    args = parser.parse_args()
+
+    items = sorted(to_items(synthetic_items(args.days, args.stories, args.repeat, random.Random(0))),
+                   key=lambda item: -(item.ordinal or 0))
+    exact = exact_dedup(items)
+    near = collapse_near_duplicates(exact)
+
+    # 首次计算指纹（未缓存）
+    fingerprint.cache_clear()
+    start = time.perf_counter()
+    collapse_near_duplicates(exact)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        collapse_near_duplicates(exact)
+    warm = (time.perf_counter() - start) / args.rounds
+
+    print(f"合成条目: {len(items)} 条（{args.stories} 条不同内容，各重复 {args.repeat} 天）")
+    print(f"精确去重: {len(exact):5d} 条，{payload_size(exact):8d} 字节")
+    print(f"近似去重: {len(near):5d} 条，{payload_size(near):8d} 字节")
+    print(f"去重耗时: 首次 {cold * 1000:.2f}ms，指纹已缓存 {warm * 1000:.2f}ms")
+
+    failed = False
+    print(f"标注的标题对: {len(LABELED_PAIRS)} 对")
+    print(f"{'阈值':>6}{'准确率':>8}{'召回率':>8}")
+    for value, precision, recall, false_merges in calibrate(NEAR_DUPLICATE_SIMILARITY):
+        marker = '  <- 当前' if value == NEAR_DUPLICATE_SIMILARITY else ''
+        print(f"{value:>8.2f}{precision:>10.2f}{recall:>10.2f}{marker}")
+        if value == NEAR_DUPLICATE_SIMILARITY and false_merges:
+            for a, b in false_merges:
+                print(f"未通过: 不同内容被合并: {a} / {b}")
+            failed = True
+
+    import app
+    experts = app.search_chinese_ai_experts()
+    print(f"专家动态板块: {len(experts)} 条（{'、'.join(sorted({item.who for item in experts}))}）")
+    if len(experts) != EXPECTED_EXPERT_ITEMS:
+        print(f"未通过: 专家动态板块应有 {EXPECTED_EXPERT_ITEMS} 条")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
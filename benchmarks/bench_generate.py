@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+默认数据生成基准测试
+对比旧实现（每次请求浅拷贝 DEFAULT_INSIGHTS 并原地逐条改写共享条目的日期）与
+按日期缓存的只读快照，统计单次生成耗时和内存分配（tracemalloc）
+
+用法:
+    python benchmarks/bench_generate.py [--requests 2000] [--dates 30]
+"""
+
+import argparse
+import copy
+import hashlib
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import DEFAULT_INSIGHTS, _generate_daily_snapshot, generate_daily_insights  # noqa: E402
+
+
+# 旧实现原地改写的默认数据（启动时复制一份，避免改动应用共享的默认数据，不计入耗时）
+LEGACY_DEFAULT_INSIGHTS = copy.deepcopy(DEFAULT_INSIGHTS)
+
+
+def legacy_generate_daily_insights(date_obj):
+    """旧实现（逐行保留原代码）：浅拷贝默认数据，原地改写共享条目的日期
+    条目被所有请求共享，返回的数据在下一次生成后即被改写
+    """
+    # 日期格式化
+    date_str = date_obj.strftime("%Y-%m-%d")
+    date_display = date_obj.strftime("%Y年%m月%d日")
+
+    # 使用日期作为种子，让同一天的内容一致
+    date_hash = int(hashlib.md5(date_str.encode()).hexdigest()[:8], 16)
+
+    # 复制默认数据并更新
+    generated_data = LEGACY_DEFAULT_INSIGHTS.copy()
+    generated_data['date'] = date_display
+
+    # 更新每个section的items日期和内容
+    for section_key, section_data in generated_data['sections'].items():
+        items = section_data.get('items', [])
+        for i, item in enumerate(items):
+            days_offset = (date_hash + i) % 3  # 0-2天的偏移
+            if days_offset > 0:
+                item_date = date_obj - timedelta(days=days_offset)
+            else:
+                item_date = date_obj
+            item['date'] = item_date.strftime("%Y-%m-%d")
+            content_variant = (date_hash + i * 17) % 5  # noqa: F841（原代码计算后未使用）
+        generated_data['sections'][section_key]['items'] = items
+
+    return generated_data
+
+
+def measure(name, generate, dates, requests):
+    """按轮询日期调用生成函数，统计耗时、单次峰值分配和保留的内存"""
+    # 预热（快照实现在这里完成每个日期的首次生成）
+    for date_obj in dates:
+        generate(date_obj)
+
+    start = time.perf_counter()
+    for i in range(requests):
+        generate(dates[i % len(dates)])
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    peaks = []
+    retained = []
+    baseline = tracemalloc.get_traced_memory()[0]
+    for i in range(requests):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        # 保留返回值，模拟多个并发请求同时持有数据
+        retained.append(generate(dates[i % len(dates)]))
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    peaks.sort()
+    print(f"{name:<10} 单次={elapsed / requests * 1e6:8.2f}us "
+          f"单次分配p50={peaks[len(peaks) // 2] / 1024:7.1f}KiB "
+          f"{requests}个请求共保留={held / 1024:9.1f}KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='默认数据生成基准测试')
+    parser.add_argument('--requests', type=int, default=2000, help='模拟请求数')
+    parser.add_argument('--dates', type=int, default=30, help='轮询的不同日期数')
+    args = parser.parse_args()
+
+    today = datetime.now()
+    dates = [today - timedelta(days=i) for i in range(args.dates)]
+
+    # 两种实现的结果应一致（旧实现的返回值会被下一次生成改写，逐个日期立即比较）
+    for date_obj in dates:
+        expected = legacy_generate_daily_insights(date_obj)
+        actual = generate_daily_insights(date_obj)
+        for key, section in expected['sections'].items():
+            assert [item['date'] for item in section['items']] == \
+                [item.date for item in actual['sections'][key]['items']], key
+
+    measure('legacy', legacy_generate_daily_insights, dates, args.requests)
+    _generate_daily_snapshot.cache_clear()
+    measure('snapshot', generate_daily_insights, dates, args.requests)
+    print(f"{'':<10} {_generate_daily_snapshot.cache_info()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+专家搜索后端基准测试
+启动本地模拟搜索服务，分别用连接池会话和每次新建连接的方式发起搜索，
+统计单次搜索延迟（p50/p99）、吞吐量以及连接复用情况
+
+用法:
+    python benchmarks/bench_search_backend.py [--lookups 500] [--concurrency 8] [--latency 0.005]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+
+from app import CHINESE_AI_EXPERTS  # noqa: E402
+from mock_search_server import start_mock_search_server  # noqa: E402
+from search_backends import HTTPSearchBackend  # noqa: E402
+
+
+def percentile(values, pct):
+    """计算百分位数（values需已排序）"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def run_lookups(search, lookups, concurrency):
+    """并发执行搜索，返回 (每次延迟列表, 总耗时)"""
+    def timed(i):
+        expert = CHINESE_AI_EXPERTS[i % len(CHINESE_AI_EXPERTS)]
+        start = time.perf_counter()
+        search(expert['name'], expert['keywords'])
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = sorted(executor.map(timed, range(lookups)))
+    return latencies, time.perf_counter() - start
+
+
+def report(name, latencies, elapsed, connections):
+    print(f"{name:<12} p50={percentile(latencies, 50) * 1000:7.2f}ms "
+          f"p99={percentile(latencies, 99) * 1000:7.2f}ms "
+          f"吞吐={len(latencies) / elapsed:8.1f}次/秒 "
+          f"新建连接={connections}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='专家搜索后端基准测试')
+    parser.add_argument('--lookups', type=int, default=500, help='搜索次数')
+    parser.add_argument('--concurrency', type=int, default=8, help='并发数')
+    parser.add_argument('--latency', type=float, default=0.005, help='模拟搜索服务延迟（秒）')
+    args = parser.parse_args()
+
+    server = start_mock_search_server(latency=args.latency)
+    try:
+        # 连接池会话：连接在请求之间复用
+        backend = HTTPSearchBackend(server.url, pool_maxsize=args.concurrency)
+        before = server.connections
+        latencies, elapsed = run_lookups(
+            lambda name, keywords: backend.search(name, keywords, max_results=2),
+            args.lookups, args.concurrency)
+        report('pooled', latencies, elapsed, server.connections - before)
+        print(f"{'':<12} {backend.stats()}")
+        backend.close()
+
+        # 对照组：每次搜索新建连接
+        def unpooled(name, keywords):
+            response = requests.get(f"{server.url}/search",
+                                    params={'q': name, 'keywords': ','.join(keywords), 'max_results': 2},
+                                    headers={'Connection': 'close'}, timeout=(1.0, 3.0))
+            response.raise_for_status()
+            return response.json()
+
+        before = server.connections
+        latencies, elapsed = run_lookups(unpooled, args.lookups, args.concurrency)
+        report('unpooled', latencies, elapsed, server.connections - before)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
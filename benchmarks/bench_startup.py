@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+冷启动基准测试
+在新的解释器进程中以 python -X importtime 导入 app，统计导入耗时、进程总耗时和最耗时的模块，
+并检查可选依赖（requests、bs4、msgpack等）没有在导入时加载、导入时没有创建数据目录；
+导入耗时超过预算时以非零状态退出
+
+用法:
+    python benchmarks/bench_startup.py [--runs 7] [--budget 300] [--top 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 只应在首次使用时导入的模块
+LAZY_MODULES = ('requests', 'bs4', 'lxml', 'msgpack')
+# 导入 app 耗时的默认预算（毫秒）
+DEFAULT_BUDGET_MS = float(os.environ.get('STARTUP_BUDGET_MS', 300))
+
+
+def parse_importtime(stderr):
+    """解析 -X importtime 的输出
+    Returns:
+        [(模块名, 自身耗时微秒, 累计耗时微秒, 嵌套深度), ...]
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            # 表头行
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return modules
+
+
+def run_once(data_dir, module='app'):
+    """在新进程中导入模块
+    Returns:
+        (导入耗时毫秒, 进程总耗时毫秒, importtime解析结果)
+    """
+    env = dict(os.environ)
+    # 与生产环境一致使用字节码缓存（首次运行时写入）
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['INSIGHTS_DATA_DIR'] = data_dir
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=ROOT, env=env, capture_output=True, text=True)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f'导入 {module} 失败:\n{completed.stderr[-2000:]}')
+    modules = parse_importtime(completed.stderr)
+    import_us = next((cumulative for name, _, cumulative, depth in modules
+                      if name == module and depth == 0), 0)
+    return import_us / 1000, elapsed_ms, modules
+
+
+def measure_startup(runs=7, module='app'):
+    """多次测量冷启动（先运行一次写入字节码缓存）
+    Returns:
+        {'import_ms', 'process_ms', 'eager_lazy_modules', 'creates_data_dir', 'slowest'}
+    """
+    with tempfile.TemporaryDirectory(prefix='insights-startup-') as tmp:
+        data_dir = os.path.join(tmp, 'data')
+        run_once(data_dir, module)
+        import_times = []
+        process_times = []
+        modules = []
+        for _ in range(runs):
+            import_ms, process_ms, modules = run_once(data_dir, module)
+            import_times.append(import_ms)
+            process_times.append(process_ms)
+        creates_data_dir = os.path.exists(data_dir)
+    loaded = {name for name, _, _, _ in modules}
+    slowest = sorted(modules, key=lambda entry: entry[1], reverse=True)
+    return {
+        'import_ms': round(statistics.median(import_times), 2),
+        'process_ms': round(statistics.median(process_times), 2),
+        'eager_lazy_modules': sorted(name for name in LAZY_MODULES if name in loaded),
+        'creates_data_dir': creates_data_dir,
+        'slowest': [(name, round(self_us / 1000, 2)) for name, self_us, _, _ in slowest[:20]],
+    }
+
+
+def check_startup(result, budget_ms):
+    """检查冷启动结果
+    Returns:
+        问题描述列表（为空表示通过）
+    """
+    problems = []
+    if result['import_ms'] > budget_ms:
+        problems.append(f"导入耗时 {result['import_ms']}ms 超过预算 {budget_ms:g}ms")
+    if result['eager_lazy_modules']:
+        problems.append(f"导入时加载了可选依赖: {', '.join(result['eager_lazy_modules'])}")
+    if result['creates_data_dir']:
+        problems.append('导入时创建了数据目录')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='冷启动基准测试')
+    parser.add_argument('--runs', type=int, default=7, help='测量次数（取中位数）')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_MS, help='导入耗时预算（毫秒）')
+    parser.add_argument('--top', type=int, default=10, help='显示自身耗时最长的模块数')
+    parser.add_argument('--module', default='app', help='导入的模块')
+    args = parser.parse_args()
+
+    result = measure_startup(args.runs, args.module)
+    print(f"导入 {args.module}: {result['import_ms']}ms（进程总耗时 {result['process_ms']}ms，{args.runs} 次中位数）")
+    print(f"自身耗时最长的 {args.top} 个模块:")
+    for name, self_ms in result['slowest'][:args.top]:
+        print(f"  {name:<40} {self_ms:8.2f}ms")
+
+    problems = check_startup(result, args.budget)
+    if problems:
+        for problem in problems:
+            print(f"未通过: {problem}")
+        sys.exit(1)
+    print(f"通过: 导入耗时在预算 {args.budget:g}ms 以内，可选依赖均未在导入时加载")
+
+
+if __name__ == '__main__':
+    main()
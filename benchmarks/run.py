@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+性能测试套件
+在合成的历史数据（默认10天、1000天、10000天）上运行微基准测试
+（sort_items_by_date、process_insights_data、generate_daily_insights、load_insights），
+并启动本地服务（serve.py）以指定并发请求 /、/api/insights、/api/dates 和 POST /api/insights，
+统计 p50/p99 延迟、吞吐量和峰值内存（RSS），测量冷启动（导入 app）耗时，
+与保存的基线对比以发现性能退化，冷启动超过预算时同样返回非零退出码
+
+用法:
+    python benchmarks/run.py [--days 10,1000,10000] [--storage json] [--concurrency 16]
+    python benchmarks/run.py --save-baseline            # 将本次结果保存为基线
+    python benchmarks/run.py --tolerance 0.25           # 与基线对比，退化超过25%时返回非零退出码
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_startup import DEFAULT_BUDGET_MS, check_startup, measure_startup  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+# 合成数据的板块（与主页面的板块一致）
+SECTIONS = (
+    ('enterprise_ai', '人工智能企业动态', '🤖'),
+    ('ai_agents', '智能体（AI Agent）应用落地', '🤝'),
+    ('semiconductor', '半导体行业动态', '💻'),
+    ('gpu_computing', '算力和政策', '⚡'),
+    ('ai_research', 'AI算法研究前沿', '🔬'),
+    ('ai_experts', '人工智能专家动态', '👨‍🔬'),
+)
+# 每个板块的合成条目数（多于页面显示的8条，覆盖筛选、排序和截断）
+ITEMS_PER_SECTION = 12
+COMPANIES = ('OpenAI', 'Google DeepMind', 'Anthropic', '百度', '阿里巴巴', '腾讯', '字节跳动', '华为', 'NVIDIA', 'AMD')
+
+
+def percentile(values, pct):
+    """计算百分位数（values需已排序）"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def summarize(latencies, elapsed):
+    """汇总一组延迟（秒）：p50/p99（毫秒）和吞吐量（次/秒）"""
+    latencies = sorted(latencies)
+    return {
+        'p50_ms': round(percentile(latencies, 50) * 1000, 4),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 4),
+        'ops_per_sec': round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def synthetic_day(date_obj, rng):
+    """生成一天的合成数据"""
+    sections = {}
+    for key, title, icon in SECTIONS:
+        items = []
+        for i in range(ITEMS_PER_SECTION):
+            company = rng.choice(COMPANIES)
+            item_date = date_obj - timedelta(days=rng.randint(0, 6))
+            items.append({
+                'title': f'{company}发布{key}相关进展（第{i + 1}条）',
+                'description': f'{company}于{item_date.isoformat()}公布了新的技术成果，' * 3,
+                'who': company,
+                'impact': f'性能提升{rng.randint(5, 80)}%',
+                'date': item_date.isoformat(),
+                'source': f'{company}官方公告',
+                'highlight': rng.random() < 0.2,
+            })
+        sections[key] = {'title': title, 'icon': icon, 'items': items}
+    return {'date': date_obj.strftime('%Y年%m月%d日'), 'sections': sections}
+
+
+def build_archive(root, days, backend, seed=0):
+    """生成包含 days 天（截至昨天）合成数据的数据目录
+    Returns:
+        (数据目录, 日期列表)
+    """
+    from storage import create_storage
+
+    data_dir = os.path.join(root, f'archive_{days}_{backend}')
+    os.makedirs(data_dir, exist_ok=True)
+    storage = create_storage(backend, data_dir=data_dir, db_path=os.path.join(data_dir, 'insights.db'))
+    rng = random.Random(seed)
+    end = date.today() - timedelta(days=1)
+    dates = []
+    try:
+        for offset in range(days):
+            date_obj = end - timedelta(days=offset)
+            storage.save_day(date_obj.isoformat(), synthetic_day(date_obj, rng))
+            dates.append(date_obj.isoformat())
+    finally:
+        storage.close()
+    return data_dir, dates
+
+
+def child_env(data_dir, backend):
+    """被测进程的环境变量（数据目录指向合成数据，专家搜索不模拟延迟）"""
+    env = dict(os.environ)
+    env['INSIGHTS_DATA_DIR'] = data_dir
+    env['INSIGHTS_STORAGE'] = backend
+    env['INSIGHTS_DB'] = os.path.join(data_dir, 'insights.db')
+    env['EXPERT_SEARCH_MOCK_DELAY'] = '0'
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    return env
+
+
+def peak_rss_mb():
+    """当前进程的峰值内存（MB），平台不支持时返回 None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为KB，macOS 为字节
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def time_calls(func, args_list, iterations, warmup=20):
+    """轮询参数调用函数，逐次计时"""
+    for i in range(min(warmup, iterations)):
+        func(*args_list[i % len(args_list)])
+    latencies = []
+    start = time.perf_counter()
+    for i in range(iterations):
+        args = args_list[i % len(args_list)]
+        t0 = time.perf_counter()
+        func(*args)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def run_micro_child(iterations):
+    """微基准测试（在子进程中执行，数据目录由环境变量指定）
+    Returns:
+        结果字典
+    """
+    start = time.perf_counter()
+    import app
+    import_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    rng = random.Random(1)
+    dates = app.storage.list_dates()
+    # 日期数不超过缓存和专家动态后台刷新跟踪的容量，热缓存测试中不会被淘汰
+    sample_size = max(1, min(app.INSIGHTS_CACHE_MAX_ENTRIES // 2, app.EXPERT_REFRESH_MAX_DATES))
+    sample = rng.sample(dates, min(len(dates), sample_size))
+    raw_days = [(app.storage.load_day(d), d) for d in sample[:50]]
+    item_lists = [
+        (app.to_items([item for section in data['sections'].values() for item in section['items']]),)
+        for data, _ in raw_days
+    ]
+    # 没有存储数据的日期（生成默认数据）
+    generated_dates = [(date.today() + timedelta(days=offset),) for offset in range(1, 366)]
+
+    def load_cold(date_str):
+        app.invalidate_insights_cache(date_str)
+        return app.load_insights(date_str)
+
+    results = {
+        'import_ms': import_ms,
+        'sort_items_by_date': time_calls(app.sort_items_by_date, item_lists, iterations),
+        'process_insights_data': time_calls(
+            lambda data, d: app.process_insights_data(data, d, refresh_experts=False), raw_days, iterations),
+        'generate_daily_insights': time_calls(app.generate_daily_insights, generated_dates, iterations),
+        'load_insights_cold': time_calls(load_cold, [(d,) for d in sample], iterations),
+    }
+    # 专家动态快照生成后会清除对应日期的缓存，等全部生成后再测试热缓存
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline and any(app.expert_refresher.peek(d) is None for d in sample):
+        time.sleep(0.05)
+    results['load_insights_warm'] = time_calls(app.load_insights, [(d,) for d in sample], iterations)
+    app.shutdown()
+    results['peak_rss_mb'] = peak_rss_mb()
+    return results
+
+
+def run_micro(data_dir, backend, iterations):
+    """在独立进程中运行微基准测试（每个数据规模重新导入应用）"""
+    command = [sys.executable, os.path.abspath(__file__), '--micro-child', '--iterations', str(iterations)]
+    output = subprocess.run(command, cwd=ROOT, env=child_env(data_dir, backend),
+                            check=True, capture_output=True, text=True).stdout
+    # 应用导入时可能输出日志，结果为最后一行
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(data_dir, backend, port, threads):
+    """启动被测服务（单个工作进程），返回子进程"""
+    command = [sys.executable, 'serve.py', '--bind', f'127.0.0.1:{port}', '--workers', '1',
+               '--threads', str(threads), '--warm-days', '0', '--timeout', '120']
+    process = subprocess.Popen(command, cwd=ROOT, env=child_env(data_dir, backend),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('服务启动失败（是否已安装 gunicorn？）')
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/api/health')
+            if conn.getresponse().status == 200:
+                conn.close()
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('服务启动超时')
+
+
+def process_tree_peak_rss_mb(pid):
+    """进程及其子进程中最大的峰值内存（MB，读取 /proc，仅Linux）"""
+    peak = None
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f'/proc/{current}/status') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        value = int(line.split()[1]) / 1024
+                        peak = value if peak is None else max(peak, value)
+            with open(f'/proc/{current}/task/{current}/children') as f:
+                pending.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            continue
+    return round(peak, 1) if peak is not None else None
+
+
+def http_scenarios(dates, rng):
+    """各接口的请求生成函数：返回 (方法, 路径, 请求体)"""
+    def index():
+        return 'GET', f'/?date={rng.choice(dates)}', None
+
+    def insights():
+        return 'GET', f'/api/insights?date={rng.choice(dates)}', None
+
+    def available_dates():
+        return 'GET', f'/api/dates?limit=30&offset={rng.randint(0, max(0, len(dates) - 30))}', None
+
+    def update():
+        date_str = rng.choice(dates)
+        body = synthetic_day(date.fromisoformat(date_str), rng)
+        body['date'] = date_str
+        return 'POST', '/api/insights', json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+    return (('GET /', index), ('GET /api/insights', insights),
+            ('GET /api/dates', available_dates), ('POST /api/insights', update))
+
+
+def run_http(data_dir, dates, backend, requests, concurrency):
+    """以指定并发依次压测各接口"""
+    port = free_port()
+    process = start_server(data_dir, backend, port, concurrency)
+    results = {}
+    try:
+        for name, make_request in http_scenarios(dates, random.Random(2)):
+            # 请求内容在计时前生成，每个场景使用新的连接
+            planned = [make_request() for _ in range(requests)]
+            local = threading.local()
+
+            def send(planned_request):
+                conn = getattr(local, 'conn', None)
+                if conn is None:
+                    conn = local.conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                method, path, body = planned_request
+                headers = {'Accept-Encoding': 'gzip'}
+                if body is not None:
+                    headers['Content-Type'] = 'application/json'
+                t0 = time.perf_counter()
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    local.conn = None
+                    return None
+                if response.status >= 400:
+                    return None
+                return time.perf_counter() - t0
+
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                start = time.perf_counter()
+                latencies = list(executor.map(send, planned))
+                elapsed = time.perf_counter() - start
+            succeeded = [latency for latency in latencies if latency is not None]
+            results[name] = summarize(succeeded, elapsed)
+            results[name]['errors'] = len(latencies) - len(succeeded)
+        results['server_peak_rss_mb'] = process_tree_peak_rss_mb(process.pid)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return results
+
+
+def flatten(results, prefix=''):
+    """将嵌套的结果字典展开为 {'a/b/c': 数值}"""
+    flat = {}
+    for key, value in results.items():
+        path = f'{prefix}/{key}' if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(current, baseline, tolerance):
+    """与基线对比
+    Returns:
+        退化项列表 [(指标, 基线值, 当前值, 变化比例), ...]
+    """
+    current_flat = flatten(current['results'])
+    baseline_flat = flatten(baseline.get('results', {}))
+    regressions = []
+    for key, base in sorted(baseline_flat.items()):
+        value = current_flat.get(key)
+        if value is None or not base or key.endswith('/errors'):
+            continue
+        change = (value - base) / base
+        # 吞吐量越高越好，延迟和内存越低越好
+        higher_is_better = key.endswith('ops_per_sec')
+        if (change < -tolerance) if higher_is_better else (change > tolerance):
+            regressions.append((key, base, value, change))
+    return regressions
+
+
+def print_results(results):
+    startup = results.get('startup')
+    if startup:
+        print(f"\n== 冷启动: 导入app {startup['import_ms']}ms，进程总耗时 {startup['process_ms']}ms ==")
+    for days, micro in results.get('micro', {}).items():
+        print(f"\n== 微基准测试（{days}天）: 导入 {micro['import_ms']}ms，峰值内存 {micro['peak_rss_mb']}MB ==")
+        for name, stats in micro.items():
+            if isinstance(stats, dict):
+                print(f"  {name:<26} p50={stats['p50_ms']:9.4f}ms p99={stats['p99_ms']:9.4f}ms "
+                      f"吞吐={stats['ops_per_sec']:10.1f}次/秒")
+    http_results = results.get('http')
+    if http_results:
+        print(f"\n== HTTP压测: 服务峰值内存 {http_results['server_peak_rss_mb']}MB ==")
+        for name, stats in http_results.items():
+            if isinstance(stats, dict):
+                print(f"  {name:<20} p50={stats['p50_ms']:9.3f}ms p99={stats['p99_ms']:9.3f}ms "
+                      f"吞吐={stats['ops_per_sec']:8.1f}次/秒 失败={stats['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='性能测试套件（微基准测试 + HTTP压测）')
+    parser.add_argument('--days', default='10,1000,10000', help='合成数据的天数，逗号分隔')
+    parser.add_argument('--storage', default='json', choices=('json', 'sqlite'), help='存储方式')
+    parser.add_argument('--iterations', type=int, default=1000, help='每项微基准测试的调用次数')
+    parser.add_argument('--http-days', type=int, default=1000, help='HTTP压测使用的数据天数（0 表示不压测）')
+    parser.add_argument('--requests', type=int, default=1000, help='每个接口的请求数')
+    parser.add_argument('--concurrency', type=int, default=16, help='并发请求数（同时也是服务的线程数）')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='基线文件')
+    parser.add_argument('--save-baseline', action='store_true', help='将本次结果保存为基线')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='允许的退化比例（0.25 表示25%%）')
+    parser.add_argument('--startup-runs', type=int, default=7, help='冷启动测量次数（0 表示不测量）')
+    parser.add_argument('--startup-budget', type=float, default=DEFAULT_BUDGET_MS, help='导入app耗时预算（毫秒）')
+    parser.add_argument('--output', default=None, help='将结果写入JSON文件')
+    parser.add_argument('--micro-child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.micro_child:
+        print(json.dumps(run_micro_child(args.iterations)))
+        return
+
+    day_counts = [int(value) for value in args.days.split(',') if value.strip()]
+    if args.http_days and args.http_days not in day_counts:
+        day_counts.append(args.http_days)
+
+    results = {'micro': {}}
+    if args.startup_runs:
+        results['startup'] = measure_startup(args.startup_runs)
+    work_dir = tempfile.mkdtemp(prefix='insights-bench-')
+    try:
+        for days in day_counts:
+            start = time.perf_counter()
+            data_dir, dates = build_archive(work_dir, days, args.storage)
+            print(f"已生成 {days} 天的合成数据（{time.perf_counter() - start:.1f}秒）")
+            if days in [int(value) for value in args.days.split(',') if value.strip()]:
+                results['micro'][str(days)] = run_micro(data_dir, args.storage, args.iterations)
+            if days == args.http_days:
+                results['http'] = run_http(data_dir, dates, args.storage, args.requests, args.concurrency)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'storage': args.storage,
+            'iterations': args.iterations,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+        },
+        'results': results,
+    }
+    print_results(results)
+    failed = False
+    if args.startup_runs:
+        for problem in check_startup(results['startup'], args.startup_budget):
+            print(f"冷启动未通过: {problem}")
+            failed = True
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n已保存基线: {args.baseline}")
+    elif not os.path.exists(args.baseline):
+        print(f"\n未找到基线文件 {args.baseline}，跳过对比（使用 --save-baseline 保存）")
+    else:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if not regressions:
+            print(f"\n与基线（{baseline.get('meta', {}).get('time', '未知时间')}）对比: 无超过 {args.tolerance:.0%} 的退化")
+        else:
+            print(f"\n与基线对比发现 {len(regressions)} 项退化（超过 {args.tolerance:.0%}）:")
+            for key, base, value, change in regressions:
+                print(f"  {key:<60} 基线={base:<12} 当前={value:<12} 变化={change:+.1%}")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+进程内缓存工具
+提供带容量上限（LRU淘汰）与过期时间（TTL）的线程安全缓存
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """带LRU淘汰与TTL过期的线程安全缓存
+
+    每个条目除了值以外还记录一个版本号（例如数据文件的修改时间和大小），
+    读取时版本号不一致即视为失效，这样数据源变化后不会返回旧内容。
+    """
+
+    def __init__(self, max_entries=128, ttl=300):
+        """
+        Args:
+            max_entries: 最多缓存的条目数，超过后淘汰最久未使用的条目
+            ttl: 条目有效期（秒），为 None 或 0 时不过期
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, version=None, default=None):
+        """读取缓存，未命中、过期或版本不一致时返回 default"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, value, expires_at = entry
+                if entry_version == version and (expires_at is None or expires_at > now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                # 过期或数据源已变化，直接丢弃
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, version=None):
+        """写入缓存，必要时淘汰最久未使用的条目"""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (version, value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """使指定条目失效"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        """返回缓存统计信息"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+序列化编解码层
+JSON编码和解码优先使用 orjson（未安装时使用标准库 json），
+数据文件可选使用紧凑的 msgpack 格式（需要安装 msgpack），读取时通过内存映射直接解码
+"""
+
+import importlib.util
+import json
+import mmap
+import os
+
+from models import json_default
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# msgpack只在使用msgpack数据文件时导入（不占用启动时间）
+MSGPACK_AVAILABLE = importlib.util.find_spec('msgpack') is not None
+
+# 数据文件格式：json（默认，便于手动编辑）或 msgpack（体积更小、解码更快）
+DEFAULT_FILE_FORMAT = os.environ.get('INSIGHTS_FILE_FORMAT', 'json')
+
+
+def dumps(obj, default=json_default, sort_keys=False, indent=False):
+    """序列化为UTF-8编码的JSON字节（非ASCII字符不转义）
+    Args:
+        obj: 要序列化的数据
+        default: 无法直接序列化的对象的转换函数
+        sort_keys: 是否按键排序
+        indent: 是否缩进两个空格（否则输出紧凑格式）
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            # orjson 不支持的数据（例如超过64位的整数）使用标准库
+            pass
+    if indent:
+        text = json.dumps(obj, default=default, sort_keys=sort_keys, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(obj, default=default, sort_keys=sort_keys, ensure_ascii=False, separators=(',', ':'))
+    return text.encode('utf-8')
+
+
+def loads(data):
+    """解析JSON（字节或字符串）"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # 标准库能解析的扩展写法（NaN、Infinity）
+            pass
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode('utf-8')
+    return json.loads(data)
+
+
+class JSONCodec:
+    """JSON数据文件（缩进两个空格，便于手动编辑）"""
+
+    name = 'json'
+    extension = '.json'
+
+    def encode(self, data):
+        return dumps(data, indent=True)
+
+    def decode(self, data):
+        return loads(data)
+
+
+class MsgpackCodec:
+    """msgpack数据文件（二进制，体积更小、解码更快）"""
+
+    name = 'msgpack'
+    extension = '.msgpack'
+
+    def encode(self, data):
+        import msgpack
+        return msgpack.packb(data, default=json_default, use_bin_type=True)
+
+    def decode(self, data):
+        import msgpack
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+CODECS = {'json': JSONCodec(), 'msgpack': MsgpackCodec()}
+
+
+def get_codec(name=None):
+    """获取数据文件的编解码器
+    Args:
+        name: 'json' 或 'msgpack'，默认读取环境变量 INSIGHTS_FILE_FORMAT
+    """
+    name = name or DEFAULT_FILE_FORMAT
+    if name == 'msgpack' and not MSGPACK_AVAILABLE:
+        print("警告: msgpack未安装，数据文件使用JSON格式（pip install msgpack）")
+        name = 'json'
+    if name not in CODECS:
+        print(f"警告: 未知的数据文件格式 {name}，使用JSON格式")
+        name = 'json'
+    return CODECS[name]
+
+
+def codec_for_path(path):
+    """根据文件扩展名选择编解码器"""
+    if path.endswith(MsgpackCodec.extension):
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError(f'读取 {path} 需要安装 msgpack')
+        return CODECS['msgpack']
+    return CODECS['json']
+
+
+def read_mapped(path):
+    """通过内存映射读取并解码msgpack文件（不复制文件内容）"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f'{path} 是空文件')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return CODECS['msgpack'].decode(mapped)
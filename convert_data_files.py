@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+数据文件格式转换工具
+将数据目录中的 insights_YYYY-MM-DD 数据文件在JSON和msgpack格式之间转换
+
+用法:
+    python convert_data_files.py [--data-dir data] [--to msgpack] [--keep]
+
+转换为msgpack后设置环境变量 INSIGHTS_FILE_FORMAT=msgpack 启动应用，新写入的数据也使用msgpack格式；
+未转换的文件仍可正常读取
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from codec import CODECS, MSGPACK_AVAILABLE
+from storage import JSONFileStorage, read_data_file, write_data_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description='在JSON和msgpack格式之间转换数据文件')
+    parser.add_argument('--data-dir', default='data', help='数据目录')
+    parser.add_argument('--to', default='msgpack', choices=sorted(CODECS), help='目标格式')
+    parser.add_argument('--keep', action='store_true', help='保留原格式的文件（默认转换后删除）')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.data_dir):
+        print(f"错误: 数据目录不存在: {args.data_dir}")
+        sys.exit(1)
+    if args.to == 'msgpack' and not MSGPACK_AVAILABLE:
+        print("错误: msgpack未安装，请执行 pip install msgpack")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    storage = JSONFileStorage(args.data_dir, file_format=args.to)
+    converted = 0
+    skipped = 0
+    size_before = 0
+    size_after = 0
+    failed = []
+    for date_str in storage.list_dates():
+        source = storage.existing_path(date_str)
+        target = storage.path_for(date_str)
+        if source == target:
+            skipped += 1
+            continue
+        try:
+            # 与应用写入同一日期时使用相同的锁，避免覆盖并发写入的数据
+            with storage.lock_day(date_str):
+                write_data_file(target, read_data_file(source))
+                size_before += os.path.getsize(source)
+                size_after += os.path.getsize(target)
+                if not args.keep:
+                    os.remove(source)
+        except Exception as e:
+            failed.append((source, str(e)))
+            continue
+        converted += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"已转换 {converted} 个文件为 {args.to} 格式（跳过 {skipped} 个），耗时 {elapsed:.2f} 秒")
+    if converted:
+        print(f"文件大小: {size_before / 1024:.1f}KB -> {size_after / 1024:.1f}KB")
+    for path, error in failed:
+        print(f"转换失败: {path}: {error}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
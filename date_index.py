@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+可用日期索引
+在内存中维护按日期排序的已存储日期列表，保存数据时直接更新索引，
+外部新增或删除的日期通过存储的日期签名（例如目录修改时间）检测后重新加载，
+查询按日期范围二分定位，只处理当前页的数据
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+
+
+class DateIndex:
+    """按日期升序保存的可用日期索引"""
+
+    def __init__(self, storage, rescan_interval=2.0):
+        """
+        Args:
+            storage: 洞察数据存储（提供 list_dates 和 dates_signature）
+            rescan_interval: 检查日期集合是否变化的最小间隔（秒）
+        """
+        self.storage = storage
+        self.rescan_interval = rescan_interval
+        self._dates = []
+        self._signature = None
+        self._checked_at = 0.0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def rescan(self):
+        """从存储重新加载日期列表"""
+        signature = self.storage.dates_signature()
+        dates = self.storage.list_dates()
+        with self._lock:
+            self._dates = dates
+            self._signature = signature
+            self._checked_at = time.monotonic()
+            self._loaded = True
+
+    def _refresh_if_changed(self):
+        """日期签名变化时重新加载（最多每 rescan_interval 秒检查一次）"""
+        now = time.monotonic()
+        if self._loaded and now - self._checked_at < self.rescan_interval:
+            return
+        signature = self.storage.dates_signature()
+        if not self._loaded or signature != self._signature:
+            self.rescan()
+        else:
+            self._checked_at = now
+
+    def add(self, date_str):
+        """保存数据后登记日期"""
+        with self._lock:
+            if not self._loaded:
+                return
+            index = bisect_left(self._dates, date_str)
+            if index == len(self._dates) or self._dates[index] != date_str:
+                insort(self._dates, date_str)
+            # 本进程写入引起的变化无需重新加载
+            self._signature = self.storage.dates_signature()
+
+    def __contains__(self, date_str):
+        self._refresh_if_changed()
+        with self._lock:
+            index = bisect_left(self._dates, date_str)
+            return index < len(self._dates) and self._dates[index] == date_str
+
+    def query(self, date_from=None, date_to=None, limit=None, offset=0, descending=True):
+        """按日期范围分页查询
+        Args:
+            date_from: 起始日期（含），'YYYY-MM-DD'
+            date_to: 结束日期（含），'YYYY-MM-DD'
+            limit: 每页数量，None 表示不限制
+            offset: 跳过的数量
+            descending: 是否按日期倒序（最新的在前）
+        Returns:
+            (当前页日期列表, 范围内日期总数)
+        """
+        self._refresh_if_changed()
+        with self._lock:
+            lo = bisect_left(self._dates, date_from) if date_from else 0
+            hi = bisect_right(self._dates, date_to) if date_to else len(self._dates)
+            total = max(0, hi - lo)
+            offset = max(0, offset)
+            if descending:
+                end = hi - offset
+                start = lo if limit is None else max(lo, end - limit)
+                page = self._dates[start:end][::-1] if end > lo else []
+            else:
+                start = lo + offset
+                end = hi if limit is None else min(hi, start + limit)
+                page = self._dates[start:end] if start < hi else []
+        return page, total
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+日期解析工具
+统一解析 'YYYY-MM-DD' 和 'YYYY年MM月DD日' 两种日期格式：
+使用正则表达式直接提取年月日（不经过 strptime），解析结果按输入字符串缓存
+"""
+
+import os
+import re
+from datetime import date
+from functools import lru_cache
+
+# 'YYYY-MM-DD' 或 'YYYY年MM月DD日'（月、日可以是一位数）
+DATE_PATTERN = re.compile(r'^(\d{4})[-年](\d{1,2})[-月](\d{1,2})日?$')
+
+# 解析结果缓存的最大条目数
+DATE_PARSE_CACHE_SIZE = int(os.environ.get('DATE_PARSE_CACHE_SIZE', 4096))
+
+
+@lru_cache(maxsize=DATE_PARSE_CACHE_SIZE)
+def _parse(value):
+    match = DATE_PATTERN.match(value)
+    if not match:
+        return None
+    try:
+        return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    except ValueError:
+        # 例如 2024-02-30
+        return None
+
+
+def parse_date(value):
+    """解析日期字符串
+    Args:
+        value: 'YYYY-MM-DD' 或 'YYYY年MM月DD日' 格式的字符串
+    Returns:
+        date对象，无法解析时返回 None
+    """
+    if not isinstance(value, str):
+        return None
+    return _parse(value.strip())
+
+
+def normalize_date(value):
+    """将日期字符串规范化为 'YYYY-MM-DD'，无法解析时返回 None"""
+    parsed = parse_date(value)
+    return parsed.isoformat() if parsed is not None else None
+
+
+def date_to_ordinal(value):
+    """将日期字符串解析为序数（date.toordinal()），无法解析时返回 None"""
+    parsed = parse_date(value)
+    return parsed.toordinal() if parsed is not None else None
+
+
+def format_date(date_obj):
+    """将 date/datetime 对象格式化为 'YYYY-MM-DD'"""
+    return f"{date_obj.year:04d}-{date_obj.month:02d}-{date_obj.day:02d}"
+
+
+def display_date(date_obj):
+    """将 date/datetime 对象或 'YYYY-MM-DD' 字符串格式化为 'YYYY年MM月DD日'"""
+    if isinstance(date_obj, str):
+        return f"{date_obj[:4]}年{date_obj[5:7]}月{date_obj[8:10]}日"
+    return f"{date_obj.year:04d}年{date_obj.month:02d}月{date_obj.day:02d}日"
+
+
+def today_str():
+    """返回今天的日期（'YYYY-MM-DD'）"""
+    return format_date(date.today())
+
+
+def cache_info():
+    """返回解析缓存的统计信息"""
+    return _parse.cache_info()
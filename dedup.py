@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+近似重复条目检测
+每个条目的标题切分为词/字的二元片段，计算MinHash签名；
+签名分段建立LSH索引，只有至少一段相同的条目才会比较，
+标题片段集合的Jaccard相似度达到阈值时视为同一条内容（例如改写过标题的同一条新闻）。
+描述经常是模板化的套话，不参与判断；相关方不同，或标题中的数字/型号（H100与H200、4.0与3.5）不同的条目不视为重复。
+阈值按 benchmarks/bench_dedup.py 中人工标注的标题对校准；只用于合并多天数据，单日数据不去重
+"""
+
+import hashlib
+import os
+import re
+import struct
+import threading
+from collections import namedtuple
+from functools import lru_cache
+
+# 视为重复的最小标题相似度（Jaccard，0-1），0 表示不去重
+# 标注的标题对中，不同内容的最高相似度为0.533，取0.6时没有误合并
+NEAR_DUPLICATE_SIMILARITY = float(os.environ.get('NEAR_DUPLICATE_SIMILARITY', 0.6))
+FINGERPRINT_CACHE_SIZE = int(os.environ.get('FINGERPRINT_CACHE_SIZE', 8192))
+
+# 英文单词和数字作为整体，中文按单字切分
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+(?:[.\-][a-z0-9]+)*|[一-鿿]')
+
+# MinHash签名长度：每个片段计算一次32字节的哈希，拆成16个16位的值，相当于16个独立的哈希函数
+MINHASH_PERMUTATIONS = 16
+_MINHASH_FORMAT = struct.Struct(f'<{MINHASH_PERMUTATIONS}H')
+# LSH分段：8段，每段2个值；相似度0.5的条目成为候选的概率约90%，0.7时超过99.9%
+LSH_BANDS = 8
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+
+# 条目指纹：标题的MinHash签名和片段集合（候选条目用片段集合计算准确的相似度）、标题中的数字/型号、相关方
+Fingerprint = namedtuple('Fingerprint', ['signature', 'features', 'numbers', 'who'])
+
+
+def _features(text):
+    """提取文本特征：相邻两个词/字组成的片段（只有一个词时使用该词）"""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    if len(tokens) < 2:
+        return tokens
+    return [a + b for a, b in zip(tokens, tokens[1:])]
+
+
+def _numbers(text):
+    """提取含数字的词（版本号、型号、工艺节点等，例如 h100、4.0、3nm、gpt-4）"""
+    return frozenset(token for token in TOKEN_PATTERN.findall(text.lower())
+                     if any(c.isdigit() for c in token))
+
+
+@lru_cache(maxsize=FINGERPRINT_CACHE_SIZE * 8)
+def _feature_hashes(feature):
+    """片段的 MINHASH_PERMUTATIONS 个哈希值（常用片段在不同条目之间重复，结果缓存）"""
+    digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=_MINHASH_FORMAT.size).digest()
+    return _MINHASH_FORMAT.unpack(digest)
+
+
+@lru_cache(maxsize=FINGERPRINT_CACHE_SIZE)
+def fingerprint(title, description='', who=''):
+    """计算条目的指纹
+    Args:
+        title: 标题
+        description: 描述
+        who: 相关方
+    Returns:
+        Fingerprint；标题没有可用文本时使用描述计算，都没有时签名为空元组
+    """
+    text = str(title or '')
+    features = frozenset(_features(text))
+    if not features:
+        text = str(description or '')
+        features = frozenset(_features(text))
+    who = str(who or '').strip()
+    numbers = _numbers(text)
+    if not features:
+        return Fingerprint((), features, numbers, who)
+    # 每个哈希函数取全部片段中的最小值
+    signature = tuple(map(min, zip(*map(_feature_hashes, features))))
+    return Fingerprint(signature, features, numbers, who)
+
+
+def item_fingerprint(item):
+    """条目的指纹（支持 InsightItem 和条目字典）"""
+    return fingerprint(item.get('title', '') or '', item.get('description', '') or '', item.get('who', '') or '')
+
+
+def _jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+def similarity(a, b):
+    """两个指纹标题（标题为空时为描述）的Jaccard相似度"""
+    return _jaccard(a.features, b.features)
+
+
+def is_near_duplicate(a, b, threshold=NEAR_DUPLICATE_SIMILARITY):
+    """判断两个指纹是否为同一条内容
+    相关方都已填写且不同、或标题中的数字/型号不同时不是重复；否则标题相似度达到阈值时视为重复
+    """
+    if a.who and b.who and a.who != b.who:
+        return False
+    if a.numbers != b.numbers:
+        return False
+    return similarity(a, b) >= threshold
+
+
+class MinHashIndex:
+    """MinHash签名的LSH索引"""
+
+    def __init__(self, threshold=NEAR_DUPLICATE_SIMILARITY):
+        self.threshold = threshold
+        self._buckets = [{} for _ in range(LSH_BANDS)]
+        self._fingerprints = {}
+        # 键 -> 登记顺序
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _band_keys(signature):
+        return [signature[i * LSH_ROWS:(i + 1) * LSH_ROWS] for i in range(LSH_BANDS)]
+
+    def add(self, key, item_fp):
+        """登记指纹（没有可用文本的条目不登记）"""
+        if not item_fp.signature:
+            return
+        with self._lock:
+            if key in self._fingerprints:
+                return
+            self._positions[key] = len(self._positions)
+            self._fingerprints[key] = item_fp
+            for buckets, band_key in zip(self._buckets, self._band_keys(item_fp.signature)):
+                buckets.setdefault(band_key, []).append(key)
+
+    def query(self, item_fp):
+        """查找相似度达到阈值的已登记条目
+        Returns:
+            键列表（按登记顺序）
+        """
+        if not item_fp.signature:
+            return []
+        with self._lock:
+            candidates = set()
+            for buckets, band_key in zip(self._buckets, self._band_keys(item_fp.signature)):
+                candidates.update(buckets.get(band_key, ()))
+            return [key for key in sorted(candidates, key=self._positions.get)
+                    if is_near_duplicate(self._fingerprints[key], item_fp, self.threshold)]
+
+    def contains(self, item_fp):
+        """是否已登记相似度达到阈值的条目（找到一个即返回）"""
+        if not item_fp.signature:
+            return False
+        with self._lock:
+            checked = set()
+            for buckets, band_key in zip(self._buckets, self._band_keys(item_fp.signature)):
+                for key in buckets.get(band_key, ()):
+                    if key in checked:
+                        continue
+                    if is_near_duplicate(self._fingerprints[key], item_fp, self.threshold):
+                        return True
+                    checked.add(key)
+        return False
+
+    def __len__(self):
+        return len(self._fingerprints)
+
+
+def collapse_near_duplicates(items, threshold=NEAR_DUPLICATE_SIMILARITY, limit=None):
+    """去除近似重复的条目，每组重复内容只保留第一条（条目需已按优先顺序排列，例如日期倒序）
+    Args:
+        items: 条目列表
+        threshold: 视为重复的最小标题相似度，0 表示不去重
+        limit: 最多保留的条目数，达到后不再计算后续条目的指纹
+    Returns:
+        去重后的条目列表
+    """
+    items = list(items)
+    if threshold <= 0 or len(items) < 2:
+        return items[:limit]
+    index = MinHashIndex(threshold)
+    kept = []
+    for item in items:
+        if limit is not None and len(kept) >= limit:
+            break
+        item_fp = item_fingerprint(item)
+        if index.contains(item_fp):
+            continue
+        index.add(len(kept), item_fp)
+        kept.append(item)
+    return kept
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+静态导出工具
+将已存储的历史日期预先渲染为静态HTML页面和预压缩的JSON文件，
+由nginx等静态服务器直接返回，历史日期的请求不再经过Python应用
+
+输出目录结构:
+    <out>/html/YYYY-MM-DD.html(.gz)             主页面（对应 /?date=YYYY-MM-DD）
+    <out>/api/insights/YYYY-MM-DD.json(.gz/.br)  洞察数据（对应 /api/insights?date=YYYY-MM-DD）
+    <out>/manifest.json                          各日期的数据签名，用于增量导出
+
+用法:
+    python export_static.py [--data-dir data] [--out dist] [--workers 4] [--force] [--include-today]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from dates import today_str
+from storage import create_storage, target_file_mode
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 影响导出结果的源文件，内容变化时全部重新导出
+BUILD_SOURCES = ('app.py', 'models.py', 'payload.py', 'dedup.py', 'dates.py', 'codec.py', 'storage.py',
+                 'templates/index.html', 'templates/_section.html')
+
+MANIFEST_NAME = 'manifest.json'
+GZIP_LEVEL = 9
+
+# 工作进程中导入的应用模块
+_app = None
+
+
+def build_fingerprint():
+    """计算导出程序和模板的指纹"""
+    digest = hashlib.sha256()
+    for name in BUILD_SOURCES:
+        path = os.path.join(BASE_DIR, name)
+        digest.update(name.encode('utf-8'))
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def normalize_signature(signature):
+    """将数据签名转换为可写入JSON并可比较的形式"""
+    return json.loads(json.dumps(signature, default=str))
+
+
+def write_bytes(path, data):
+    """原子写入文件（先写临时文件再替换，文件权限与普通新建的文件相同，nginx等其他用户可以读取）"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if hasattr(os, 'fchmod'):
+                os.fchmod(f.fileno(), target_file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def output_paths(out_dir, date_str):
+    """返回某个日期的全部输出文件路径"""
+    html = os.path.join(out_dir, 'html', f'{date_str}.html')
+    json_path = os.path.join(out_dir, 'api', 'insights', f'{date_str}.json')
+    return [html, html + '.gz', json_path, json_path + '.gz', json_path + '.br']
+
+
+def init_worker(data_dir):
+    """工作进程初始化：按指定的数据目录导入应用"""
+    global _app
+    os.environ['INSIGHTS_DATA_DIR'] = data_dir
+    import app as insights_app
+    _app = insights_app
+
+
+def export_date(date_str, out_dir):
+    """导出一个日期（在工作进程中执行）
+    Returns:
+        (日期, 数据签名, 数据摘要)
+    """
+    app = _app
+    signature = app.get_insights_source_signature(date_str)
+    # 只使用已存储的数据，不触发专家动态检索，保证导出结果可重复
+    insights = app.load_insights_uncached(date_str, refresh_experts=False)
+    with app.app.test_request_context(f'/?date={date_str}'):
+        html = app.render_index_page(insights).encode('utf-8')
+    encoded = app.EncodedPayload(insights)
+
+    html_path, html_gz_path, json_path, json_gz_path, json_br_path = output_paths(out_dir, date_str)
+    write_bytes(html_path, html)
+    write_bytes(html_gz_path, gzip.compress(html, compresslevel=GZIP_LEVEL, mtime=0))
+    write_bytes(json_path, encoded.bodies['identity'])
+    write_bytes(json_gz_path, encoded.bodies['gzip'])
+    if 'br' in encoded.bodies:
+        write_bytes(json_br_path, encoded.bodies['br'])
+    return date_str, normalize_signature(signature), encoded.digest
+
+
+def load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(out_dir, manifest):
+    data = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True).encode('utf-8')
+    write_bytes(os.path.join(out_dir, MANIFEST_NAME), data)
+
+
+def plan_export(storage, manifest, out_dir, fingerprint, force=False, include_today=False):
+    """确定需要导出和需要删除的日期
+    Returns:
+        (需要导出的日期列表, 需要删除的日期列表, 未变化的日期数)
+    """
+    today = today_str()
+    dates = [d for d in storage.list_dates() if include_today or d < today]
+    previous = manifest.get('dates', {}) if manifest.get('build') == fingerprint and not force else {}
+
+    changed = []
+    unchanged = 0
+    for date_str in dates:
+        entry = previous.get(date_str)
+        signature = normalize_signature(storage.signature(date_str))
+        if (entry is not None and signature is not None and entry.get('signature') == signature
+                and all(os.path.exists(p) for p in output_paths(out_dir, date_str)[:4])):
+            unchanged += 1
+        else:
+            changed.append(date_str)
+    removed = sorted(set(manifest.get('dates', {})) - set(dates))
+    return changed, removed, unchanged
+
+
+def main():
+    parser = argparse.ArgumentParser(description='将历史日期导出为静态HTML和预压缩JSON')
+    parser.add_argument('--data-dir', default='data', help='数据目录')
+    parser.add_argument('--out', default='dist', help='输出目录')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='并行导出的进程数')
+    parser.add_argument('--force', action='store_true', help='忽略增量记录，重新导出全部日期')
+    parser.add_argument('--include-today', action='store_true', help='同时导出今天（默认只导出已归档的历史日期）')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.data_dir):
+        print(f"错误: 数据目录不存在: {args.data_dir}")
+        sys.exit(1)
+    data_dir = os.path.abspath(args.data_dir)
+    out_dir = os.path.abspath(args.out)
+
+    start = time.perf_counter()
+    storage = create_storage(data_dir=data_dir)
+    fingerprint = build_fingerprint()
+    manifest = load_manifest(out_dir)
+    try:
+        changed, removed, unchanged = plan_export(
+            storage, manifest, out_dir, fingerprint, force=args.force, include_today=args.include_today)
+    finally:
+        storage.close()
+
+    dates_manifest = {} if manifest.get('build') != fingerprint else dict(manifest.get('dates', {}))
+    failed = []
+    if changed:
+        # 使用 spawn 启动工作进程，每个进程独立导入应用，不继承父进程的数据库连接和线程
+        context = multiprocessing.get_context('spawn')
+        workers = max(1, min(args.workers, len(changed)))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=init_worker, initargs=(data_dir,)) as executor:
+            futures = {executor.submit(export_date, date_str, out_dir): date_str for date_str in changed}
+            for future in as_completed(futures):
+                date_str = futures[future]
+                try:
+                    _, signature, digest = future.result()
+                except Exception as e:
+                    failed.append((date_str, e))
+                    dates_manifest.pop(date_str, None)
+                    continue
+                dates_manifest[date_str] = {'signature': signature, 'digest': digest}
+
+    for date_str in removed:
+        dates_manifest.pop(date_str, None)
+        for path in output_paths(out_dir, date_str):
+            if os.path.exists(path):
+                os.remove(path)
+
+    os.makedirs(out_dir, exist_ok=True)
+    save_manifest(out_dir, {'build': fingerprint, 'dates': dates_manifest})
+    elapsed = time.perf_counter() - start
+
+    print(f"导出完成: 新导出 {len(changed) - len(failed)} 天，未变化 {unchanged} 天，"
+          f"删除 {len(removed)} 天，耗时 {elapsed:.2f} 秒，输出目录: {out_dir}")
+    for date_str, error in failed:
+        print(f"导出失败: {date_str}: {error}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
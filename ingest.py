@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+条目批量上传（增量写入）
+校验逐行上传的条目，并由后台写入线程将多个请求的条目合并为一次提交（group commit），
+按日期和板块合并到已有数据中，不需要整体覆盖某一天的数据
+"""
+
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+
+from dates import normalize_date
+
+SECTION_KEY_PATTERN = re.compile(r'^[a-z][a-z0-9_]{0,63}$')
+TEXT_FIELDS = ('title', 'description', 'who', 'impact', 'source')
+
+
+def _normalize_date(value, field):
+    """将 'YYYY-MM-DD' 或 'YYYY年MM月DD日' 规范化为 'YYYY-MM-DD'"""
+    if not isinstance(value, str):
+        raise ValueError(f'{field}必须是日期字符串')
+    date_str = normalize_date(value)
+    if date_str is None:
+        raise ValueError(f'{field}格式错误: {value}')
+    return date_str
+
+
+def validate_ingest_item(record, default_day=None):
+    """校验上传的一行条目
+    Args:
+        record: 解析后的JSON对象，除条目字段外需包含 section（板块），
+            可选 day（归档日期，默认使用条目的 date）
+        default_day: 请求参数中指定的默认归档日期
+    Returns:
+        (归档日期, 板块, 条目字典)
+    Raises:
+        ValueError: 条目不合法
+    """
+    if not isinstance(record, dict):
+        raise ValueError('每行必须是JSON对象')
+    item = dict(record)
+    section = item.pop('section', None)
+    if not isinstance(section, str) or not SECTION_KEY_PATTERN.match(section):
+        raise ValueError('缺少section或格式错误')
+    title = item.get('title')
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError('缺少title')
+    for field in TEXT_FIELDS:
+        if field in item and not isinstance(item[field], str):
+            raise ValueError(f'{field}必须是字符串')
+    if 'highlight' in item:
+        item['highlight'] = bool(item['highlight'])
+
+    if item.get('date'):
+        item['date'] = _normalize_date(item['date'], 'date')
+    day = item.pop('day', None) or default_day or item.get('date')
+    if not day:
+        raise ValueError('缺少date或day')
+    day = _normalize_date(day, 'day')
+    item.setdefault('date', day)
+    return day, section, item
+
+
+class IngestBatcher:
+    """后台写入线程：将并发提交的条目合并后一次性写入"""
+
+    def __init__(self, commit, max_items=2000, max_wait=0.05, name='ingest-writer'):
+        """
+        Args:
+            commit: 写入函数，参数为 {日期: {板块: [条目, ...]}} 字典
+            max_items: 单次提交最多包含的条目数
+            max_wait: 收到第一批条目后最多等待其他请求的时间（秒）
+            name: 后台线程名称
+        """
+        self.commit = commit
+        self.max_items = max_items
+        self.max_wait = max_wait
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.commits = 0
+        self.items = 0
+
+    def submit(self, entries):
+        """提交一批已校验的条目
+        Args:
+            entries: (归档日期, 板块, 条目) 元组列表
+        Returns:
+            Future，写入完成后结果为条目数量
+        """
+        future = Future()
+        self.ensure_started()
+        self._queue.put((entries, future))
+        return future
+
+    def ensure_started(self):
+        """启动后台写入线程（如未启动）"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _collect(self):
+        """阻塞等待第一批条目，再在 max_wait 内收集更多条目"""
+        pending = [self._queue.get()]
+        count = len(pending[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while count < self.max_items:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            pending.append(entry)
+            count += len(entry[0])
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            batch = {}
+            for entries, _ in pending:
+                for day, section, item in entries:
+                    batch.setdefault(day, {}).setdefault(section, []).append(item)
+            try:
+                self.commit(batch)
+            except Exception as e:
+                print(f"批量写入失败: {e}")
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+            self.commits += 1
+            for entries, future in pending:
+                self.items += len(entries)
+                future.set_result(len(entries))
+
+    def stats(self):
+        return {
+            'commits': self.commits,
+            'items': self.items,
+            'queued': self._queue.qsize(),
+        }
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+运行指标
+请求延迟直方图、处理阶段耗时、错误计数等指标，以Prometheus文本格式输出；
+可选的慢请求采样器记录超过阈值的请求及其各阶段耗时
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# 默认的延迟分桶（秒）
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 慢请求阈值（秒），0 表示不采样
+SLOW_REQUEST_THRESHOLD = float(os.environ.get('SLOW_REQUEST_THRESHOLD', 0))
+SLOW_REQUEST_SAMPLES = int(os.environ.get('SLOW_REQUEST_SAMPLES', 50))
+
+# 当前请求的阶段耗时列表（请求之外为 None）
+_current_stages = ContextVar('insights_request_stages', default=None)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """只增不减的计数器"""
+
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self):
+        """返回 (指标名, 标签列表, 数值) 列表"""
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, list(zip(self.labelnames, key)), value) for key, value in items]
+
+
+class Histogram:
+    """分桶统计的直方图（记录次数、总和及各分桶的累计次数）"""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 标签值 -> [各分桶次数..., 总次数, 总和]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0, 0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """统计代码块的耗时"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def collect(self):
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        samples = []
+        for key, state in items:
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                samples.append((f'{self.name}_bucket', labels + [('le', _format_value(float(bound)))], cumulative))
+            samples.append((f'{self.name}_bucket', labels + [('le', '+Inf')], state[-2]))
+            samples.append((f'{self.name}_count', labels, state[-2]))
+            samples.append((f'{self.name}_sum', labels, state[-1]))
+        return samples
+
+
+class MetricsRegistry:
+    """指标注册表，输出Prometheus文本格式"""
+
+    def __init__(self):
+        self._metrics = []
+        # 采集时调用的函数，返回 (指标名, 类型, 说明, [(标签列表, 数值), ...]) 列表
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, documentation, labelnames, buckets)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        """输出Prometheus文本格式（text/plain; version=0.0.4）"""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            for name, labels, value in metric.collect():
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                print(f"采集指标失败: {e}")
+                continue
+            for name, metric_type, documentation, samples in families:
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                for labels, value in samples:
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+class SlowRequestSampler:
+    """记录超过阈值的请求及其各阶段耗时（保留最近 max_samples 条）"""
+
+    def __init__(self, threshold=SLOW_REQUEST_THRESHOLD, max_samples=SLOW_REQUEST_SAMPLES):
+        self.threshold = threshold
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def maybe_record(self, route, method, status, duration, stages, path=None):
+        if not self.threshold or duration < self.threshold:
+            return False
+        sample = {
+            'time': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'route': route,
+            'method': method,
+            'path': path,
+            'status': status,
+            'duration_ms': round(duration * 1000, 3),
+            'stages': [{'stage': name, 'duration_ms': round(value * 1000, 3)} for name, value in stages],
+        }
+        with self._lock:
+            self._samples.append(sample)
+        breakdown = ', '.join(f"{s['stage']}={s['duration_ms']}ms" for s in sample['stages']) or '无阶段记录'
+        print(f"慢请求: {method} {path or route} {status} 耗时{sample['duration_ms']}ms（{breakdown}）")
+        return True
+
+    def samples(self):
+        with self._lock:
+            return list(self._samples)
+
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram(
+    'insights_http_request_duration_seconds', '按路由统计的请求处理耗时', ('route', 'method', 'status'))
+REQUEST_ERRORS = registry.counter(
+    'insights_http_request_errors_total', '返回5xx的请求数', ('route', 'method', 'status'))
+STAGE_LATENCY = registry.histogram(
+    'insights_stage_duration_seconds', '数据加载各阶段的耗时', ('stage',))
+SEARCH_BACKEND_LATENCY = registry.histogram(
+    'insights_search_backend_duration_seconds', '专家搜索后端单次请求的耗时', ('backend', 'outcome'))
+ERRORS = registry.counter(
+    'insights_errors_total', '内部错误次数（按类型）', ('kind',))
+
+slow_sampler = SlowRequestSampler()
+
+
+@contextmanager
+def stage(name):
+    """统计一个处理阶段的耗时，并记入当前请求的阶段明细"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        STAGE_LATENCY.observe(duration, stage=name)
+        stages = _current_stages.get()
+        if stages is not None:
+            stages.append((name, duration))
+
+
+def record_error(kind):
+    """记录一次内部错误"""
+    ERRORS.inc(kind=kind)
+
+
+def start_request():
+    """开始统计一个请求
+    Returns:
+        (开始时间, 上下文令牌)，传给 finish_request
+    """
+    return time.perf_counter(), _current_stages.set([])
+
+
+def finish_request(started, route, method, status, path=None):
+    """结束统计一个请求：记录延迟和错误，并按阈值采样慢请求
+    Returns:
+        请求耗时（秒）
+    """
+    start, token = started
+    duration = time.perf_counter() - start
+    stages = _current_stages.get() or []
+    try:
+        _current_stages.reset(token)
+    except ValueError:
+        # 在其他上下文中结束（例如流式响应）时无法还原
+        _current_stages.set(None)
+    REQUEST_LATENCY.observe(duration, route=route, method=method, status=status)
+    if int(status) >= 500:
+        REQUEST_ERRORS.inc(route=route, method=method, status=status)
+    slow_sampler.maybe_record(route, method, status, duration, stages, path=path)
+    return duration
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+JSON数据迁移工具
+将数据目录中的 insights_YYYY-MM-DD.json 文件批量导入SQLite存储
+
+用法:
+    python migrate_to_sqlite.py [--data-dir data] [--db data/insights.db] [--batch-size 200]
+
+迁移完成后设置环境变量 INSIGHTS_STORAGE=sqlite（及 INSIGHTS_DB）启动应用即可使用SQLite存储
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from storage import SQLiteStorage, import_json_directory
+
+
+def main():
+    parser = argparse.ArgumentParser(description='将JSON数据文件导入SQLite存储')
+    parser.add_argument('--data-dir', default='data', help='JSON数据目录')
+    parser.add_argument('--db', default=None, help='SQLite数据库路径（默认 <data-dir>/insights.db）')
+    parser.add_argument('--batch-size', type=int, default=200, help='每个事务导入的天数')
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(args.data_dir, 'insights.db')
+    if not os.path.isdir(args.data_dir):
+        print(f"错误: 数据目录不存在: {args.data_dir}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    storage = SQLiteStorage(db_path)
+    try:
+        imported, failed = import_json_directory(args.data_dir, storage, batch_size=args.batch_size)
+    finally:
+        storage.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"已导入 {imported} 天的数据到 {db_path}，耗时 {elapsed:.2f} 秒")
+    for path, error in failed:
+        print(f"导入失败: {path}: {error}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
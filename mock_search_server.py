@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+本地模拟搜索服务
+实现 HTTPSearchBackend 使用的 /search 接口，返回模拟专家动态，
+用于本地开发、测试和基准测试，无需访问外部服务
+
+用法:
+    python mock_search_server.py [--host 127.0.0.1] [--port 8765] [--latency 0.05]
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from dates import parse_date
+from search_backends import generate_mock_expert_info
+
+
+class MockSearchHandler(BaseHTTPRequestHandler):
+    """处理 GET /search 请求（支持HTTP/1.1 keep-alive）"""
+
+    protocol_version = 'HTTP/1.1'
+    # 关闭Nagle算法，避免keep-alive连接上出现延迟确认造成的额外等待
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.record_connection()
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path != '/search':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        params = parse_qs(parsed.query)
+        query = params.get('q', [''])[0]
+        keywords = [k for k in params.get('keywords', [''])[0].split(',') if k]
+        try:
+            max_results = int(params.get('max_results', ['3'])[0])
+        except ValueError:
+            max_results = 3
+        date_obj = parse_date(params['date'][0]) if params.get('date') else None
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        expert_name = query.split(' ')[0] if query else ''
+        results = generate_mock_expert_info(expert_name, keywords, max_results, date_obj)
+        self.server.record_request()
+        self._send_json(200, {'results': results})
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 基准测试时请求量大，不输出访问日志
+        pass
+
+
+class MockSearchServer(ThreadingHTTPServer):
+    """模拟搜索服务，记录建立的连接数和处理的请求数"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, server_address, latency=0.0):
+        super().__init__(server_address, MockSearchHandler)
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self._counter_lock = threading.Lock()
+
+    def record_connection(self):
+        with self._counter_lock:
+            self.connections += 1
+
+    def record_request(self):
+        with self._counter_lock:
+            self.requests += 1
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_mock_search_server(host='127.0.0.1', port=0, latency=0.0):
+    """在后台线程中启动模拟搜索服务
+    Args:
+        port: 端口号，0 表示自动分配
+        latency: 每次搜索的模拟延迟（秒）
+    Returns:
+        MockSearchServer 对象（使用完毕后调用 shutdown() 和 server_close()）
+    """
+    server = MockSearchServer((host, port), latency=latency)
+    thread = threading.Thread(target=server.serve_forever, name='mock-search-server', daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='本地模拟搜索服务')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help='每次搜索的模拟延迟（秒）')
+    args = parser.parse_args()
+
+    server = MockSearchServer((args.host, args.port), latency=args.latency)
+    print(f"模拟搜索服务已启动: {server.url}/search")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
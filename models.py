@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+洞察数据模型
+"""
+
+import sys
+
+from dates import date_to_ordinal
+
+
+class InsightItem:
+    """洞察条目（不可变，使用 __slots__ 节省内存）
+
+    创建时将日期解析为序数 ordinal，排序和按日期筛选直接比较整数；
+    创建后不能修改，可在多个线程和多个请求之间直接共享，
+    需要修改时使用 replace() 生成新的条目
+    """
+
+    FIELDS = ('title', 'description', 'who', 'impact', 'date', 'source', 'highlight')
+
+    # ordinal: 日期序数（无法解析时为 None）；extra: 其他自定义字段（没有时为 None）
+    __slots__ = FIELDS + ('ordinal', 'extra')
+
+    def __init__(self, title='', description='', who='', impact='', date='', source='', highlight=False,
+                 extra=None):
+        setter = object.__setattr__
+        # 相关方、日期、来源等短字段重复较多，驻留后多个条目共享同一个字符串对象
+        setter(self, 'title', title)
+        setter(self, 'description', description)
+        setter(self, 'who', sys.intern(who) if type(who) is str else who)
+        setter(self, 'impact', impact)
+        setter(self, 'date', sys.intern(date) if type(date) is str else date)
+        setter(self, 'source', sys.intern(source) if type(source) is str else source)
+        setter(self, 'highlight', highlight)
+        setter(self, 'ordinal', date_to_ordinal(date))
+        setter(self, 'extra', extra or None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('InsightItem是不可变对象，请使用replace()')
+
+    def __delattr__(self, name):
+        raise AttributeError('InsightItem是不可变对象')
+
+    @classmethod
+    def from_dict(cls, data):
+        """从条目字典创建（未知字段保存在 extra 中）"""
+        values = {}
+        extra = None
+        for key, value in data.items():
+            if key in cls.FIELDS:
+                values[key] = value
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        return cls(extra=extra, **values)
+
+    @classmethod
+    def coerce(cls, item):
+        """将条目字典转换为 InsightItem（已是 InsightItem 时直接返回）"""
+        if isinstance(item, cls):
+            return item
+        return cls.from_dict(item)
+
+    def replace(self, **changes):
+        """返回修改了指定字段的新条目"""
+        values = {field: getattr(self, field) for field in self.FIELDS}
+        values['extra'] = self.extra
+        values.update(changes)
+        return InsightItem(**values)
+
+    def to_dict(self):
+        """转换为条目字典（用于JSON序列化）"""
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def get(self, key, default=None):
+        """兼容字典的读取方式"""
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __eq__(self, other):
+        if not isinstance(other, InsightItem):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, field) for field in self.FIELDS))
+
+    def __repr__(self):
+        return f"InsightItem(title={self.title!r}, date={self.date!r})"
+
+
+def to_items(items):
+    """将条目列表转换为 InsightItem 列表（加载或写入数据时调用一次）"""
+    return [InsightItem.coerce(item) for item in items or ()]
+
+
+def json_default(obj):
+    """json.dumps 的 default 钩子：序列化 InsightItem 及只读映射"""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if hasattr(obj, 'items'):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
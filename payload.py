@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+API响应预编码工具
+将洞察数据一次性序列化为JSON字节，并预先生成gzip/brotli压缩版本及强ETag，
+重复请求时直接返回已编码的字节，无需重新序列化和压缩
+"""
+
+import gzip
+import hashlib
+
+from codec import dumps
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# 服务端偏好的编码顺序（压缩率高的优先）
+PREFERRED_ENCODINGS = ('br', 'gzip', 'identity')
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 9
+
+
+class EncodedPayload:
+    """预编码的JSON响应体（identity / gzip / br）"""
+
+    __slots__ = ('digest', 'bodies')
+
+    def __init__(self, data):
+        identity = dumps(data)
+        self.digest = hashlib.sha256(identity).hexdigest()[:32]
+        self.bodies = {
+            'identity': identity,
+            'gzip': gzip.compress(identity, compresslevel=GZIP_LEVEL, mtime=0),
+        }
+        if BROTLI_AVAILABLE:
+            self.bodies['br'] = brotli.compress(identity, quality=BROTLI_QUALITY)
+
+    def etag(self, encoding='identity'):
+        """返回指定编码对应的强ETag（不同编码的字节不同，ETag也不同）"""
+        if encoding == 'identity':
+            return f'"{self.digest}"'
+        return f'"{self.digest}-{encoding}"'
+
+    def matches(self, if_none_match):
+        """判断 If-None-Match 请求头是否与当前内容匹配"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        etags = {self.etag(encoding) for encoding in self.bodies}
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            if tag.startswith('W/'):
+                tag = tag[2:]
+            if tag in etags:
+                return True
+        return False
+
+
+def negotiate_encoding(accept_encoding, available):
+    """根据 Accept-Encoding 请求头选择响应编码
+    Args:
+        accept_encoding: 请求头原始字符串
+        available: 可用编码集合
+    Returns:
+        选中的编码名称（'br' / 'gzip' / 'identity'）
+    """
+    if not accept_encoding:
+        return 'identity'
+
+    qualities = {}
+    for part in accept_encoding.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, params = part.partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[name.strip().lower()] = q
+
+    wildcard = qualities.get('*')
+    best = None
+    best_q = 0.0
+    for encoding in PREFERRED_ENCODINGS:
+        if encoding not in available:
+            continue
+        q = qualities.get(encoding, wildcard)
+        if q is None:
+            # 未声明的 identity 默认可接受
+            q = 0.001 if encoding == 'identity' else 0.0
+        if q > best_q:
+            best, best_q = encoding, q
+    return best or 'identity'
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+后台快照刷新工具
+在后台线程中定期重新获取数据并保存为快照，请求处理时只读取最新快照，
+不会因为检索而阻塞
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class SnapshotRefresher:
+    """按键（例如日期）保存快照，并在后台线程中定期刷新"""
+
+    def __init__(self, fetch, interval=300, max_keys=32, on_update=None, name='snapshot-refresher'):
+        """
+        Args:
+            fetch: 获取快照内容的函数，参数为键
+            interval: 刷新间隔（秒）
+            max_keys: 最多跟踪的键数量，超过后淘汰最久未访问的键
+            on_update: 快照内容变化后的回调函数，参数为键（重新获取的内容与原快照相同时不调用）
+            name: 后台线程名称
+        """
+        self.fetch = fetch
+        self.interval = interval
+        self.max_keys = max_keys
+        self.on_update = on_update
+        self.name = name
+        # 键 -> (快照内容, 内容最近一次变化的时间戳)；值为 None 表示尚未获取
+        self._snapshots = OrderedDict()
+        # 键 -> 最近一次成功获取的时间戳（内容未变化时也更新，用于安排刷新和计算快照时效）
+        self._fetched_at = {}
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def get(self, key):
+        """读取快照（不阻塞）
+        Returns:
+            (快照内容, 更新时间戳)；尚未获取时返回 None，并安排后台立即刷新
+        """
+        with self._lock:
+            if key in self._snapshots:
+                self._snapshots.move_to_end(key)
+                snapshot = self._snapshots[key]
+            else:
+                self._snapshots[key] = None
+                self._trim()
+                snapshot = None
+            if snapshot is None:
+                self._pending[key] = True
+        if snapshot is None:
+            self.ensure_started()
+            self._wakeup.set()
+        return snapshot
+
+    def peek(self, key):
+        """读取快照，不更新访问顺序，也不安排刷新
+        Returns:
+            (快照内容, 更新时间戳)；尚未获取时返回 None
+        """
+        with self._lock:
+            return self._snapshots.get(key)
+
+    def request_refresh(self, key):
+        """安排后台尽快刷新指定键的快照"""
+        with self._lock:
+            if key not in self._snapshots:
+                self._snapshots[key] = None
+                self._trim()
+            self._pending[key] = True
+        self.ensure_started()
+        self._wakeup.set()
+
+    def age(self, key):
+        """返回快照距上次成功获取的秒数，尚未获取时返回 None"""
+        with self._lock:
+            fetched_at = self._fetched_at.get(key)
+        if fetched_at is None:
+            return None
+        return max(0.0, time.time() - fetched_at)
+
+    def refresh(self, key):
+        """同步刷新指定键的快照，失败时保留旧快照
+        重新获取的内容与原快照相同时保留原快照（包括变化时间），不调用 on_update，
+        依赖快照的缓存和 ETag 因此保持不变
+        """
+        try:
+            value = self.fetch(key)
+        except Exception as e:
+            print(f"后台刷新 {key} 失败: {e}")
+            return False
+        now = time.time()
+        with self._lock:
+            previous = self._snapshots.get(key)
+            changed = previous is None or previous[0] != value
+            if changed:
+                self._snapshots[key] = (value, now)
+            self._fetched_at[key] = now
+            self._trim()
+        if changed and self.on_update:
+            self.on_update(key)
+        return True
+
+    def ensure_started(self):
+        """启动后台刷新线程（如未启动）"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """停止后台刷新线程"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _trim(self):
+        """淘汰最久未访问的键（调用方需持有锁）"""
+        while len(self._snapshots) > self.max_keys:
+            key, _ = self._snapshots.popitem(last=False)
+            self._pending.pop(key, None)
+            self._fetched_at.pop(key, None)
+
+    def _due_keys(self):
+        """返回需要刷新的键：先处理待刷新的键，再处理超过刷新间隔的键"""
+        now = time.time()
+        with self._lock:
+            keys = list(self._pending)
+            self._pending.clear()
+            for key, snapshot in self._snapshots.items():
+                if key in keys:
+                    continue
+                if snapshot is None or now - self._fetched_at.get(key, 0) >= self.interval:
+                    keys.append(key)
+        return keys
+
+    def _run(self):
+        while not self._stopped.is_set():
+            # 先清除唤醒标记，处理期间新到的刷新请求会让下一次等待立即返回
+            self._wakeup.clear()
+            for key in self._due_keys():
+                if self._stopped.is_set():
+                    return
+                self.refresh(key)
+            self._wakeup.wait(timeout=min(self.interval, 60))
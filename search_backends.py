@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+专家搜索后端
+定义统一的搜索后端接口，提供模拟数据后端和基于HTTP的搜索后端；
+HTTP后端使用共享的连接池会话（keep-alive、单主机连接数上限、失败重试与超时）
+"""
+
+import os
+import threading
+import time
+
+from dates import format_date, today_str
+
+
+def generate_mock_expert_info(expert_name, expert_keywords, max_results=3, date_obj=None):
+    """生成模拟专家信息（实际部署时应替换为真实搜索）
+    Args:
+        date_obj: 目标日期，默认今天
+    """
+    results = []
+
+    # 专家活动类型
+    activity_types = [
+        "发表主题演讲",
+        "接受媒体专访",
+        "发布技术观点",
+        "参加行业峰会",
+        "发布新产品"
+    ]
+
+    # 根据专家生成相关信息
+    expert_keyword = expert_keywords[0] if expert_keywords else expert_name
+
+    for i in range(min(max_results, 3)):
+        activity_type = activity_types[i % len(activity_types)]
+        date_str = format_date(date_obj) if date_obj else today_str()
+
+        item = {
+            "title": f"{expert_name}：{activity_type}",
+            "description": f"{expert_keyword}相关专家{expert_name}近日{activity_type}，分享了对人工智能发展趋势的见解。他表示，AI技术正在快速发展，未来将在多个领域产生深远影响。",
+            "who": expert_name,
+            "impact": "分享AI发展趋势见解",
+            "date": date_str,
+            "source": f"{expert_keyword}官方/行业媒体",
+            "highlight": i == 0  # 第一条标记为重要
+        }
+        results.append(item)
+
+    return results
+
+
+class SearchBackend:
+    """专家搜索后端接口"""
+
+    name = 'base'
+
+    def search(self, expert_name, expert_keywords, max_results=3, date_obj=None):
+        """搜索专家动态
+        Returns:
+            洞察条目字典列表
+        """
+        raise NotImplementedError
+
+    def stats(self):
+        """返回后端统计信息"""
+        return {'backend': self.name}
+
+    def close(self):
+        """释放后端占用的资源"""
+
+
+class MockSearchBackend(SearchBackend):
+    """模拟数据后端（无需网络）"""
+
+    name = 'mock'
+
+    def __init__(self, delay=0.0):
+        """
+        Args:
+            delay: 模拟的搜索延迟（秒）
+        """
+        self.delay = delay
+
+    def search(self, expert_name, expert_keywords, max_results=3, date_obj=None):
+        if self.delay:
+            time.sleep(self.delay)
+        return generate_mock_expert_info(expert_name, expert_keywords, max_results, date_obj)
+
+
+class HTTPSearchBackend(SearchBackend):
+    """基于HTTP的搜索后端
+
+    请求 GET {base_url}/search?q=...&keywords=...&max_results=...&date=...，
+    响应格式为 {"results": [洞察条目, ...]}。
+    所有请求共用一个 requests.Session，连接在请求之间保持复用。
+    """
+
+    name = 'http'
+
+    ITEM_FIELDS = ('title', 'description', 'who', 'impact', 'date', 'source', 'highlight')
+
+    def __init__(self, base_url, connect_timeout=1.0, read_timeout=3.0,
+                 pool_connections=4, pool_maxsize=8, max_retries=2, backoff_factor=0.2):
+        """
+        Args:
+            base_url: 搜索服务地址，例如 http://127.0.0.1:8765
+            connect_timeout: 建立连接超时（秒）
+            read_timeout: 读取响应超时（秒）
+            pool_connections: 缓存的主机连接池数量
+            pool_maxsize: 单个主机最多保持的连接数，超出时等待空闲连接
+            max_retries: 连接错误及 429/5xx 响应的重试次数
+            backoff_factor: 重试退避系数（第n次重试前等待 backoff_factor * 2^(n-1) 秒）
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False,
+        )
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+            pool_block=True,
+        )
+        self.session = requests.Session()
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        self.session.headers.update({'Accept': 'application/json', 'Connection': 'keep-alive'})
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+
+    def search(self, expert_name, expert_keywords, max_results=3, date_obj=None):
+        params = {
+            'q': f"{expert_name} AI 人工智能",
+            'keywords': ','.join(expert_keywords or []),
+            'max_results': max_results,
+        }
+        if date_obj is not None:
+            params['date'] = format_date(date_obj)
+
+        start = time.perf_counter()
+        try:
+            response = self.session.get(f"{self.base_url}/search", params=params, timeout=self.timeout)
+            response.raise_for_status()
+            results = response.json().get('results', [])
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.requests += 1
+                self.total_latency += elapsed
+
+        items = []
+        for result in results[:max_results]:
+            item = {field: result.get(field, '') for field in self.ITEM_FIELDS}
+            item['highlight'] = bool(result.get('highlight', False))
+            items.append(item)
+        return items
+
+    def stats(self):
+        """返回请求次数、平均延迟及连接池复用情况"""
+        connections = 0
+        pooled_requests = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += getattr(pool, 'num_connections', 0)
+            pooled_requests += getattr(pool, 'num_requests', 0)
+        with self._lock:
+            return {
+                'backend': self.name,
+                'requests': self.requests,
+                'errors': self.errors,
+                'avg_latency_ms': round(self.total_latency / self.requests * 1000, 3) if self.requests else 0.0,
+                'connections_opened': connections,
+                'connection_reuse_ratio': round(1 - connections / pooled_requests, 4) if pooled_requests else 0.0,
+            }
+
+    def close(self):
+        self.session.close()
+
+
+def create_search_backend(name=None, url=None):
+    """根据配置创建搜索后端
+    Args:
+        name: 后端名称（'mock' 或 'http'），默认读取环境变量 EXPERT_SEARCH_BACKEND
+        url: HTTP后端地址，默认读取环境变量 EXPERT_SEARCH_URL
+    """
+    name = name or os.environ.get('EXPERT_SEARCH_BACKEND', 'mock')
+    url = url or os.environ.get('EXPERT_SEARCH_URL')
+
+    if name == 'http':
+        if not url:
+            print("警告: 未配置 EXPERT_SEARCH_URL，专家搜索将使用模拟数据")
+            return MockSearchBackend()
+        try:
+            return HTTPSearchBackend(
+                url,
+                connect_timeout=float(os.environ.get('EXPERT_SEARCH_CONNECT_TIMEOUT', 1.0)),
+                read_timeout=float(os.environ.get('EXPERT_SEARCH_READ_TIMEOUT', 3.0)),
+                pool_maxsize=int(os.environ.get('EXPERT_SEARCH_POOL_SIZE', 8)),
+                max_retries=int(os.environ.get('EXPERT_SEARCH_RETRIES', 2)),
+            )
+        except ImportError:
+            print("警告: requests未安装，专家搜索将使用模拟数据")
+            return MockSearchBackend()
+
+    if name != 'mock':
+        print(f"警告: 未知的搜索后端 {name}，专家搜索将使用模拟数据")
+    return MockSearchBackend(delay=float(os.environ.get('EXPERT_SEARCH_MOCK_DELAY', 0.1)))
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+洞察条目全文检索索引
+对已存储的全部日期建立倒排索引（字段：标题、描述、相关方、来源），
+中文按字符二元组（bigram）切分并同时索引单字，英文和数字按单词切分并同时索引复合词（如 gpt-4）的各部分，
+查询使用BM25打分；
+保存某一天的数据时只替换该天的条目，无需重建整个索引；
+其他进程写入的数据通过各日期的存储签名检测后重新索引
+"""
+
+import math
+import re
+import threading
+import time
+from functools import lru_cache
+
+from models import InsightItem
+
+# 连续的中日韩字符，或连续的字母数字（含型号中常见的 . _ - 连接）
+TOKEN_REGEX = r'[㐀-鿿豈-﫿]+|[0-9a-zA-Z]+(?:[._-][0-9a-zA-Z]+)*'
+# 复合词的连接符
+COMPOUND_SEPARATORS = re.compile(r'[._-]')
+
+# 各字段的权重（命中标题比命中描述更相关）
+FIELD_WEIGHTS = (
+    ('title', 3),
+    ('who', 2),
+    ('source', 1),
+    ('description', 1),
+)
+
+# BM25 参数
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+@lru_cache(maxsize=None)
+def _token_pattern():
+    """分词正则（中日韩字符范围较大，编译需要数毫秒，首次分词时才编译，不占用启动时间）"""
+    return re.compile(TOKEN_REGEX)
+
+
+def tokenize(text):
+    """将查询文本切分为索引词
+    中文连续字符切分为二元组（单个汉字保留为一元组），英文和数字转为小写单词
+    """
+    tokens = []
+    if not text:
+        return tokens
+    for match in _token_pattern().finditer(str(text)):
+        word = match.group(0)
+        # 匹配结果要么全是中日韩字符，要么全是字母数字
+        if word[0] >= '\u3400':
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word.lower())
+    return tokens
+
+
+def index_tokens(text):
+    """将条目文本切分为索引词
+    在 tokenize 的基础上，中文同时索引单字（单字查询可以命中），
+    复合词同时索引各部分（查询 gpt 可以命中 GPT-4）
+    """
+    tokens = []
+    if not text:
+        return tokens
+    for match in _token_pattern().finditer(str(text)):
+        word = match.group(0)
+        if word[0] >= '\u3400':
+            tokens.extend(word)
+            if len(word) > 1:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            word = word.lower()
+            tokens.append(word)
+            parts = COMPOUND_SEPARATORS.split(word)
+            if len(parts) > 1:
+                tokens.extend(part for part in parts if part)
+    return tokens
+
+
+class SearchIndex:
+    """倒排索引，文档为某一天某个板块中的一个条目"""
+
+    def __init__(self, recheck_interval=10.0):
+        """
+        Args:
+            recheck_interval: 检查存储中各日期数据是否变化的最小间隔（秒）
+        """
+        # 文档ID -> (日期, 板块, 条目, 文档长度)
+        self._docs = {}
+        # 索引词 -> {文档ID: 加权词频}
+        self._postings = {}
+        # 日期 -> 该日期的文档ID列表
+        self._by_date = {}
+        # 日期 -> 索引时该日期数据的存储签名
+        self._signatures = {}
+        # 上次同步时存储的日期集合签名（未变化时跳过逐日比较）
+        self._dates_signature = None
+        self.recheck_interval = recheck_interval
+        self._checked_at = 0.0
+        self._sync_lock = threading.Lock()
+        self._next_id = 0
+        self._total_length = 0
+        self._lock = threading.RLock()
+        self.built = False
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _remove_day(self, date_str):
+        for doc_id in self._by_date.pop(date_str, []):
+            _, _, item, length = self._docs.pop(doc_id)
+            self._total_length -= length
+            for token in set(self._item_terms(item)):
+                postings = self._postings.get(token)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self._postings[token]
+
+    @staticmethod
+    def _item_terms(item):
+        """返回条目的加权索引词列表（权重通过重复体现）"""
+        terms = []
+        for field, weight in FIELD_WEIGHTS:
+            field_tokens = index_tokens(item.get(field, ''))
+            for _ in range(weight):
+                terms.extend(field_tokens)
+        return terms
+
+    def index_day(self, date_str, data, signature=None):
+        """索引（或重新索引）某一天的数据
+        Args:
+            date_str: 日期字符串，格式为 'YYYY-MM-DD'
+            data: 该日期的洞察数据字典
+            signature: 该日期数据的存储签名（用于检测其他进程的修改）
+        """
+        with self._lock:
+            self._remove_day(date_str)
+            self._signatures[date_str] = signature
+            doc_ids = []
+            for section_key, section_data in ((data or {}).get('sections') or {}).items():
+                for item in section_data.get('items', []):
+                    # 索引中保存紧凑的 InsightItem，减少常驻内存
+                    item = InsightItem.coerce(item)
+                    terms = self._item_terms(item)
+                    doc_id = self._next_id
+                    self._next_id += 1
+                    self._docs[doc_id] = (date_str, section_key, item, len(terms))
+                    self._total_length += len(terms)
+                    counts = {}
+                    for token in terms:
+                        counts[token] = counts.get(token, 0) + 1
+                    for token, count in counts.items():
+                        self._postings.setdefault(token, {})[doc_id] = count
+                    doc_ids.append(doc_id)
+            if doc_ids:
+                self._by_date[date_str] = doc_ids
+
+    def remove_day(self, date_str):
+        """从索引中删除某一天的数据"""
+        with self._lock:
+            self._remove_day(date_str)
+            self._signatures.pop(date_str, None)
+
+    def _index_from_storage(self, storage, date_str):
+        # 先读取签名再读取数据，读取期间数据变化时下次检查会再次索引
+        try:
+            signature = storage.signature(date_str)
+            self.index_day(date_str, storage.load_day(date_str), signature=signature)
+        except Exception as e:
+            print(f"索引 {date_str} 的数据失败: {e}")
+
+    def build(self, storage):
+        """从存储中索引全部已存储的日期"""
+        with self._lock:
+            self._dates_signature = storage.dates_signature()
+            for date_str in storage.list_dates():
+                self._index_from_storage(storage, date_str)
+            self._checked_at = time.monotonic()
+            self.built = True
+
+    def sync(self, storage):
+        """与存储同步：重新索引签名变化的日期和新增的日期，删除存储中已不存在的日期
+        先比较存储的日期集合签名（目录修改时间或数据库的更新时间，写入、新增和删除日期时都会变化），
+        未变化时不再逐日读取签名
+        Returns:
+            (重新索引的日期列表, 删除的日期列表)
+        """
+        # 在逐日比较之前读取，比较期间发生的写入会在下次同步时处理
+        dates_signature = storage.dates_signature()
+        if dates_signature is not None and dates_signature == self._dates_signature:
+            return [], []
+        dates = storage.list_dates()
+        with self._lock:
+            signatures = dict(self._signatures)
+        changed = [d for d in dates if d not in signatures or storage.signature(d) != signatures[d]]
+        removed = sorted(set(signatures) - set(dates))
+        for date_str in changed:
+            self._index_from_storage(storage, date_str)
+        for date_str in removed:
+            self.remove_day(date_str)
+        self._dates_signature = dates_signature
+        return changed, removed
+
+    def refresh_if_changed(self, storage):
+        """存储中的数据变化时增量更新索引（最多每 recheck_interval 秒检查一次；
+        其他线程正在检查时直接返回，不阻塞检索）
+        """
+        if time.monotonic() - self._checked_at < self.recheck_interval:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() - self._checked_at < self.recheck_interval:
+                return
+            self.sync(storage)
+            self._checked_at = time.monotonic()
+        except Exception as e:
+            print(f"同步检索索引失败: {e}")
+        finally:
+            self._sync_lock.release()
+
+    def search(self, query, limit=20, section=None):
+        """检索条目，返回按相关度排序的结果
+        Args:
+            query: 查询文本，所有索引词都需命中
+            limit: 最多返回的结果数量
+            section: 只检索指定板块（可选）
+        Returns:
+            (结果总数, 结果列表)，结果为 {'date', 'section', 'score', 'item'} 字典
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return 0, []
+
+        with self._lock:
+            postings = [self._postings.get(token) for token in tokens]
+            if not all(postings):
+                return 0, []
+            # 从最短的倒排表开始求交集
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for doc_postings in postings[1:]:
+                candidates.intersection_update(doc_postings)
+                if not candidates:
+                    return 0, []
+
+            doc_count = len(self._docs)
+            avg_length = self._total_length / doc_count if doc_count else 1
+            idfs = [math.log(1 + (doc_count - len(p) + 0.5) / (len(p) + 0.5)) for p in postings]
+
+            scored = []
+            for doc_id in candidates:
+                date_str, section_key, item, length = self._docs[doc_id]
+                if section and section_key != section:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                score = 0.0
+                for idf, doc_postings in zip(idfs, postings):
+                    tf = doc_postings[doc_id]
+                    score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+                scored.append((score, date_str, section_key, item))
+
+        # 相关度相同时较新的日期优先
+        scored.sort(key=lambda hit: (hit[0], hit[1]), reverse=True)
+        hits = [
+            {'date': date_str, 'section': section_key, 'score': round(score, 4), 'item': item}
+            for score, date_str, section_key, item in scored[:limit]
+        ]
+        return len(scored), hits
+
+    def stats(self):
+        with self._lock:
+            return {
+                'documents': len(self._docs),
+                'terms': len(self._postings),
+                'dates': len(self._by_date),
+            }
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+生产环境启动入口
+使用 gunicorn 以多进程（每个进程多线程）方式运行应用，直接绑定指定地址；
+指定 --asgi 时使用 uvicorn 工作进程运行异步入口（asgi.py）；
+每个工作进程启动后预热缓存，收到 SIGTERM 后停止接收新连接，
+等待正在处理的请求完成（最长 graceful-timeout 秒）再退出
+
+用法:
+    python serve.py --bind 0.0.0.0:5000 --workers 4 --threads 8
+    python serve.py --bind 0.0.0.0:5000 --workers 4 --asgi
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+try:
+    from gunicorn.app.base import BaseApplication
+    GUNICORN_AVAILABLE = True
+except ImportError:
+    BaseApplication = object
+    GUNICORN_AVAILABLE = False
+
+DEFAULT_BIND = os.environ.get('SERVE_BIND', '0.0.0.0:5000')
+DEFAULT_WORKERS = int(os.environ.get('SERVE_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+DEFAULT_THREADS = int(os.environ.get('SERVE_THREADS', 4))
+DEFAULT_TIMEOUT = int(os.environ.get('SERVE_TIMEOUT', 30))
+DEFAULT_GRACEFUL_TIMEOUT = int(os.environ.get('SERVE_GRACEFUL_TIMEOUT', 30))
+
+
+class InsightsApplication(BaseApplication):
+    """以 gunicorn 运行的应用（配置来自命令行参数，而不是配置文件）"""
+
+    def __init__(self, options, warm_days=7, asgi=False):
+        """
+        Args:
+            options: gunicorn 配置项字典
+            warm_days: 每个工作进程启动后预热的最近日期数量，0 表示不预热
+            asgi: 是否运行异步入口（预热和退出由 ASGI lifespan 处理）
+        """
+        self.options = options
+        self.warm_days = warm_days
+        self.asgi = asgi
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+        if not self.asgi:
+            self.cfg.set('post_worker_init', self.post_worker_init)
+            self.cfg.set('worker_exit', self.worker_exit)
+
+    def load(self):
+        # 在工作进程中导入应用，后台线程和数据库连接不会跨 fork 共享
+        if self.asgi:
+            from asgi import application
+            return application
+        from app import app
+        return app
+
+    def post_worker_init(self, worker):
+        """工作进程启动后预热缓存"""
+        if self.warm_days <= 0:
+            return
+        from app import warm_caches
+        try:
+            warmed = warm_caches(self.warm_days)
+            worker.log.info("预热缓存完成: %d 个日期", len(warmed))
+        except Exception as e:
+            worker.log.warning("预热缓存失败: %s", e)
+
+    def worker_exit(self, server, worker):
+        """工作进程退出前停止后台线程并释放资源"""
+        from app import shutdown
+        shutdown()
+
+
+def build_options(args):
+    """将命令行参数转换为 gunicorn 配置项"""
+    if args.asgi:
+        worker_class = 'uvicorn.workers.UvicornWorker'
+    else:
+        # 多线程时使用 gthread 工作进程
+        worker_class = 'gthread' if args.threads > 1 else 'sync'
+    return {
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': worker_class,
+        'timeout': args.timeout,
+        'graceful_timeout': args.graceful_timeout,
+        'keepalive': args.keepalive,
+        'max_requests': args.max_requests,
+        'max_requests_jitter': args.max_requests // 10 if args.max_requests else 0,
+        'accesslog': args.access_log,
+        'preload_app': False,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='以 gunicorn 运行AI行业洞察网站（生产环境）')
+    parser.add_argument('--bind', default=DEFAULT_BIND, help='监听地址，例如 0.0.0.0:5000 或 unix:/tmp/insights.sock')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='工作进程数')
+    parser.add_argument('--threads', type=int, default=DEFAULT_THREADS, help='每个工作进程的线程数')
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT, help='请求处理超时（秒），超时的工作进程会被重启')
+    parser.add_argument('--graceful-timeout', type=int, default=DEFAULT_GRACEFUL_TIMEOUT,
+                        help='收到 SIGTERM 后等待正在处理的请求完成的最长时间（秒）')
+    parser.add_argument('--keepalive', type=int, default=5, help='keep-alive 连接的空闲超时（秒）')
+    parser.add_argument('--max-requests', type=int, default=0, help='工作进程处理多少个请求后重启（0 表示不重启）')
+    parser.add_argument('--warm-days', type=int, default=int(os.environ.get('WARM_CACHE_DAYS', 7)),
+                        help='每个工作进程启动后预热的最近日期数量（0 表示不预热）')
+    parser.add_argument('--asgi', action='store_true', help='使用 uvicorn 工作进程运行异步入口（需要安装 uvicorn 和 asgiref）')
+    parser.add_argument('--access-log', default=None, help="访问日志文件，'-' 表示输出到标准输出")
+    args = parser.parse_args()
+
+    if not GUNICORN_AVAILABLE:
+        print("错误: gunicorn未安装，请执行 pip install gunicorn（开发环境可使用 python app.py）")
+        sys.exit(1)
+
+    print("=" * 60)
+    print("AI行业洞察每日汇总网站（生产模式）")
+    if args.asgi:
+        print(f"监听地址: {args.bind}，工作进程: {args.workers}（ASGI）")
+    else:
+        print(f"监听地址: {args.bind}，工作进程: {args.workers}，每进程线程: {args.threads}")
+    print("=" * 60)
+    if args.asgi:
+        os.environ['WARM_CACHE_DAYS'] = str(args.warm_days)
+    InsightsApplication(build_options(args), warm_days=args.warm_days, asgi=args.asgi).run()
+
+
+if __name__ == '__main__':
+    main()
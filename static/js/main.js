@@ -49,33 +49,259 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
-    // 根据日期加载数据（直接刷新页面）
-    function loadDataByDate(dateStr) {
-        window.location.href = `/?date=${dateStr}`;
+    // 板块key与页面中section id的对应关系
+    const SECTION_ANCHORS = {
+        enterprise_ai: 'enterprise-ai',
+        ai_agents: 'ai-agents',
+        semiconductor: 'semiconductor',
+        gpu_computing: 'gpu-computing',
+        ai_research: 'ai-research',
+        ai_experts: 'ai-experts'
+    };
+    const MAX_ITEMS_PER_SECTION = 8;
+    
+    // 本地缓存：每个日期保存 {etag, data, savedAt}，最多保留 CACHE_MAX_DATES 个日期
+    const CACHE_PREFIX = 'insights:';
+    const CACHE_INDEX_KEY = 'insights:index';
+    const CACHE_MAX_DATES = 30;
+    const memoryCache = new Map();
+    const pendingRequests = new Map();
+    
+    function readCache(dateStr) {
+        if (memoryCache.has(dateStr)) {
+            return memoryCache.get(dateStr);
+        }
+        try {
+            const raw = window.localStorage.getItem(CACHE_PREFIX + dateStr);
+            if (raw) {
+                const entry = JSON.parse(raw);
+                memoryCache.set(dateStr, entry);
+                return entry;
+            }
+        } catch (e) {
+            // localStorage不可用（例如隐私模式）时只使用内存缓存
+        }
+        return null;
+    }
+    
+    function writeCache(dateStr, entry) {
+        memoryCache.set(dateStr, entry);
+        try {
+            // 按最近使用顺序维护日期列表，超出上限时删除最早的日期
+            let index = JSON.parse(window.localStorage.getItem(CACHE_INDEX_KEY) || '[]');
+            index = index.filter(d => d !== dateStr);
+            index.push(dateStr);
+            while (index.length > CACHE_MAX_DATES) {
+                window.localStorage.removeItem(CACHE_PREFIX + index.shift());
+            }
+            window.localStorage.setItem(CACHE_PREFIX + dateStr, JSON.stringify(entry));
+            window.localStorage.setItem(CACHE_INDEX_KEY, JSON.stringify(index));
+        } catch (e) {
+            // 存储空间不足时只使用内存缓存
+        }
+    }
+    
+    // 获取某一天的洞察数据：带上缓存的ETag重新验证，未变化时（304）直接使用缓存
+    function fetchInsights(dateStr) {
+        if (pendingRequests.has(dateStr)) {
+            return pendingRequests.get(dateStr);
+        }
+        const cached = readCache(dateStr);
+        const headers = {};
+        if (cached && cached.etag) {
+            headers['If-None-Match'] = cached.etag;
+        }
+        const request = fetch(`/api/insights?date=${encodeURIComponent(dateStr)}`, {
+            headers: headers,
+            cache: 'no-store'
+        }).then(response => {
+            if (response.status === 304 && cached) {
+                return cached.data;
+            }
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            const etag = response.headers.get('ETag');
+            return response.json().then(data => {
+                writeCache(dateStr, {etag: etag, data: data, savedAt: Date.now()});
+                return data;
+            });
+        }).catch(error => {
+            // 网络错误时使用缓存（如有）
+            if (cached) {
+                return cached.data;
+            }
+            throw error;
+        }).finally(() => {
+            pendingRequests.delete(dateStr);
+        });
+        pendingRequests.set(dateStr, request);
+        return request;
+    }
+    
+    // 创建一个洞察条目的DOM节点（使用textContent，避免插入HTML）
+    function createItemElement(item) {
+        const element = document.createElement('div');
+        element.className = 'insight-item' + (item.highlight ? ' highlight' : '');
+        
+        const header = document.createElement('div');
+        header.className = 'item-header';
+        const title = document.createElement('h3');
+        title.className = 'item-title';
+        title.textContent = item.title || '';
+        header.appendChild(title);
+        if (item.highlight) {
+            const badge = document.createElement('span');
+            badge.className = 'badge';
+            badge.textContent = '重要';
+            header.appendChild(badge);
+        }
+        element.appendChild(header);
+        
+        const description = document.createElement('p');
+        description.className = 'item-description';
+        description.textContent = item.description || '';
+        element.appendChild(description);
+        
+        const meta = document.createElement('div');
+        meta.className = 'item-meta';
+        const parts = [
+            ['meta-label', '影响：'], ['meta-value', item.impact || ''], ['meta-separator', '|'],
+            ['meta-label', '来源：'], ['meta-value', item.source || ''], ['meta-separator', '|'],
+            ['meta-date', item.date || '']
+        ];
+        parts.forEach(([className, text]) => {
+            const span = document.createElement('span');
+            span.className = className;
+            span.textContent = text;
+            meta.appendChild(span);
+        });
+        element.appendChild(meta);
+        return element;
+    }
+    
+    // 用洞察数据原地更新页面（只替换内容有变化的板块）
+    function renderInsights(data) {
+        if (!data || !data.sections) {
+            return;
+        }
+        Object.keys(SECTION_ANCHORS).forEach(key => {
+            const container = document.querySelector(`#${SECTION_ANCHORS[key]} .insight-items`);
+            if (!container) {
+                return;
+            }
+            const items = ((data.sections[key] || {}).items || []).slice(0, MAX_ITEMS_PER_SECTION);
+            const signature = JSON.stringify(items);
+            if (container.dataset.signature === signature) {
+                return;
+            }
+            container.dataset.signature = signature;
+            const fragment = document.createDocumentFragment();
+            items.forEach(item => fragment.appendChild(createItemElement(item)));
+            container.replaceChildren(fragment);
+            animateItems(container.querySelectorAll('.insight-item'));
+        });
+        if (data.date) {
+            if (currentDateDisplay) {
+                currentDateDisplay.textContent = data.date;
+            }
+            const footerDate = document.querySelector('.footer p:last-child');
+            if (footerDate) {
+                footerDate.textContent = `更新时间：${data.date}`;
+            }
+            document.title = `${data.date} - AI行业洞察每日汇总`;
+        }
+    }
+    
+    function formatDate(date) {
+        const year = date.getFullYear();
+        const month = String(date.getMonth() + 1).padStart(2, '0');
+        const day = String(date.getDate()).padStart(2, '0');
+        return `${year}-${month}-${day}`;
+    }
+    
+    // 空闲时预取前一天和后一天（不超过今天）的数据
+    function prefetchAdjacentDates(dateStr) {
+        const schedule = window.requestIdleCallback || (callback => setTimeout(callback, 200));
+        schedule(() => {
+            const current = new Date(`${dateStr}T00:00:00`);
+            const todayStr = formatDate(new Date());
+            [-1, 1].forEach(offset => {
+                const adjacent = new Date(current);
+                adjacent.setDate(current.getDate() + offset);
+                const adjacentStr = formatDate(adjacent);
+                if (adjacentStr <= todayStr && !readCache(adjacentStr)) {
+                    fetchInsights(adjacentStr).catch(() => {});
+                }
+            });
+        });
+    }
+    
+    let currentDate = datePicker ? datePicker.value : null;
+    
+    // 根据日期加载数据：先显示本地缓存，再向服务器验证并更新，不刷新整个页面
+    function loadDataByDate(dateStr, pushHistory = true) {
+        if (!window.fetch) {
+            window.location.href = `/?date=${dateStr}`;
+            return;
+        }
+        currentDate = dateStr;
+        if (pushHistory) {
+            history.pushState({date: dateStr}, '', `/?date=${dateStr}`);
+        }
+        const cached = readCache(dateStr);
+        if (cached) {
+            renderInsights(cached.data);
+        }
+        fetchInsights(dateStr).then(data => {
+            // 请求返回前已切换到其他日期时不更新页面
+            if (currentDate === dateStr) {
+                renderInsights(data);
+            }
+        }).catch(() => {
+            if (!cached) {
+                window.location.href = `/?date=${dateStr}`;
+            }
+        });
+        prefetchAdjacentDates(dateStr);
     }
     
     // 浏览器前进/后退按钮支持
     window.addEventListener('popstate', function(event) {
         const urlParams = new URLSearchParams(window.location.search);
-        const date = urlParams.get('date');
-        if (date && datePicker) {
+        const date = (event.state && event.state.date) || urlParams.get('date') || formatDate(new Date());
+        if (datePicker) {
             datePicker.value = date;
-            loadDataByDate(date);
         }
+        loadDataByDate(date, false);
     });
     
-    // 为每个洞察项添加动画效果
-    const insightItems = document.querySelectorAll('.insight-item');
-    insightItems.forEach((item, index) => {
-        item.style.opacity = '0';
-        item.style.transform = 'translateY(20px)';
-        
-        setTimeout(() => {
-            item.style.transition = 'opacity 0.5s ease, transform 0.5s ease';
-            item.style.opacity = '1';
-            item.style.transform = 'translateY(0)';
-        }, index * 100);
-    });
+    // 为洞察项添加动画效果
+    function animateItems(items) {
+        items.forEach((item, index) => {
+            item.style.opacity = '0';
+            item.style.transform = 'translateY(20px)';
+            
+            setTimeout(() => {
+                item.style.transition = 'opacity 0.5s ease, transform 0.5s ease';
+                item.style.opacity = '1';
+                item.style.transform = 'translateY(0)';
+            }, index * 100);
+            
+            // 重要内容的徽标闪烁提示
+            const badge = item.querySelector('.badge');
+            if (badge) {
+                badge.style.animation = 'pulse 2s infinite';
+            }
+        });
+    }
+    animateItems(document.querySelectorAll('.insight-item'));
+    
+    // 记录首屏日期，便于后退时恢复，并预取相邻日期
+    if (currentDate) {
+        history.replaceState({date: currentDate}, '', window.location.href);
+        prefetchAdjacentDates(currentDate);
+    }
 
     // 目录导航链接的平滑滚动
     document.querySelectorAll('.toc-link').forEach(link => {
@@ -148,16 +374,6 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // 页面加载时高亮当前section
     highlightTocOnScroll();
-
-    // 高亮重要内容
-    const highlightItems = document.querySelectorAll('.insight-item.highlight');
-    highlightItems.forEach(item => {
-        // 添加闪烁动画提示
-        const badge = item.querySelector('.badge');
-        if (badge) {
-            badge.style.animation = 'pulse 2s infinite';
-        }
-    });
 });
 
 // CSS动画定义（通过JavaScript添加）
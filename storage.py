@@ -0,0 +1,644 @@
+#!/usr/bin/env python3
+"""
+洞察数据存储层
+定义统一的按日期读写接口，提供两种实现：
+- JSONFileStorage: 每天一个 insights_YYYY-MM-DD.json 文件（默认）
+- SQLiteStorage: 单个SQLite数据库（WAL模式），条目按行存储，
+  并按日期、板块、来源建立索引，便于跨日期查询
+"""
+
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import metrics
+from codec import CODECS, codec_for_path, get_codec, loads, read_mapped
+from dates import display_date, parse_date
+
+try:
+    import fcntl
+except ImportError:
+    # 非POSIX系统没有fcntl，只能在进程内加锁
+    fcntl = None
+
+DATE_FILE_PATTERN = re.compile(r'^insights_(\d{4}-\d{2}-\d{2})\.(?:json|msgpack)$')
+
+# 条目的标准字段，其余字段保存在 extra 中
+ITEM_FIELDS = ('title', 'description', 'who', 'impact', 'date', 'source', 'highlight')
+
+
+def parse_date_filename(filename):
+    """从数据文件名中提取日期（'YYYY-MM-DD'），不是有效的日期文件时返回 None"""
+    match = DATE_FILE_PATTERN.match(filename)
+    if not match:
+        return None
+    date_part = match.group(1)
+    # 验证日期有效（例如排除 2024-02-30）
+    if parse_date(date_part) is None:
+        return None
+    return date_part
+
+
+def merge_section_items(items, new_items):
+    """将新条目合并到条目列表中：标题相同的条目更新字段，其余追加到末尾"""
+    positions = {item.get('title'): index for index, item in enumerate(items)}
+    for new_item in new_items:
+        index = positions.get(new_item.get('title'))
+        if index is None:
+            positions[new_item.get('title')] = len(items)
+            items.append(dict(new_item))
+        else:
+            merged = dict(items[index])
+            merged.update(new_item)
+            items[index] = merged
+    return items
+
+
+def merge_into_day(data, date_str, sections, section_meta=None):
+    """将按板块分组的新条目合并到某一天的数据中
+    Args:
+        data: 该日期已有的数据，不存在时为 None
+        sections: {板块: [条目, ...]} 字典
+        section_meta: {板块: {'title', 'icon'}}，新建板块时使用
+    Returns:
+        合并后的数据
+    """
+    section_meta = section_meta or {}
+    data = data or {'date': display_date(date_str), 'sections': {}}
+    data_sections = data.setdefault('sections', {})
+    for section_key, items in sections.items():
+        section_data = data_sections.get(section_key)
+        if section_data is None:
+            section_data = dict(section_meta.get(section_key, {}))
+            section_data['items'] = []
+            data_sections[section_key] = section_data
+        merge_section_items(section_data.setdefault('items', []), items)
+    return data
+
+
+def write_json_file(filepath, data):
+    """原子写入JSON文件"""
+    write_data_file(filepath, data)
+
+
+def _current_umask():
+    """读取进程的umask（Linux从 /proc 读取，避免修改umask；其他系统临时设置后恢复）"""
+    try:
+        with open('/proc/self/status', 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+def target_file_mode(filepath):
+    """原子替换后文件应有的权限：目标已存在时沿用其权限，否则与 open('w') 新建文件相同（0o666 & ~umask）
+    tempfile.mkstemp 创建的临时文件权限为0600，替换前需要改为该权限，否则其他用户（nginx、备份）无法读取
+    """
+    try:
+        return os.stat(filepath).st_mode & 0o7777
+    except OSError:
+        return 0o666 & ~_current_umask()
+
+
+def write_data_file(filepath, data):
+    """原子写入数据文件（格式由扩展名决定：.json 或 .msgpack）
+    先写入同目录下的临时文件并fsync，再用 os.replace 替换目标文件，
+    读取方看到的要么是旧文件、要么是完整的新文件，不会读到写了一半的内容
+    """
+    encoded = codec_for_path(filepath).encode(data)
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(filepath)}.", suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(encoded)
+            f.flush()
+            if hasattr(os, 'fchmod'):
+                os.fchmod(f.fileno(), target_file_mode(filepath))
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def _fsync_directory(directory):
+    """fsync目录，确保替换操作本身也已落盘（不支持的系统上忽略）"""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+_process_locks = {}
+_process_locks_guard = threading.Lock()
+
+
+@contextmanager
+def file_lock(lock_path):
+    """跨进程的排他锁（基于 flock，多个gunicorn worker之间同样有效）
+    没有fcntl的系统上退化为进程内的锁
+    """
+    with _process_locks_guard:
+        thread_lock = _process_locks.setdefault(lock_path, threading.Lock())
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def read_json_file(filepath):
+    """读取JSON文件（分别统计读取和解析的耗时）"""
+    with metrics.stage('file_read'):
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+    with metrics.stage('json_parse'):
+        return loads(raw)
+
+
+def read_data_file(filepath):
+    """读取数据文件（格式由扩展名决定，msgpack文件通过内存映射解码）"""
+    if codec_for_path(filepath) is CODECS['msgpack']:
+        with metrics.stage('msgpack_decode'):
+            return read_mapped(filepath)
+    return read_json_file(filepath)
+
+
+class InsightsStorage:
+    """洞察数据存储接口（按日期读写一整天的数据）"""
+
+    name = 'base'
+
+    def load_day(self, date_str):
+        """读取指定日期的数据，不存在时返回 None"""
+        raise NotImplementedError
+
+    def save_day(self, date_str, data):
+        """保存指定日期的数据"""
+        raise NotImplementedError
+
+    def signature(self, date_str):
+        """返回指定日期数据的版本签名（数据变化时签名随之变化），不存在时返回 None"""
+        raise NotImplementedError
+
+    def list_dates(self):
+        """返回已存储的全部日期（升序）"""
+        raise NotImplementedError
+
+    def dates_signature(self):
+        """返回日期集合的版本签名，用于检测外部新增或删除的日期"""
+        raise NotImplementedError
+
+    def merge_items(self, batch, section_meta=None):
+        """将新条目合并到对应日期和板块中（标题相同的条目更新，其余追加）
+        Args:
+            batch: {日期: {板块: [条目, ...]}} 字典
+            section_meta: {板块: {'title', 'icon'}}，新建板块时使用
+        Returns:
+            更新的日期列表
+        """
+        for date_str, sections in batch.items():
+            data = merge_into_day(self.load_day(date_str), date_str, sections, section_meta)
+            self.save_day(date_str, data)
+        return list(batch)
+
+    def query_items(self, date_from=None, date_to=None, section=None, source=None, limit=None):
+        """跨日期查询条目
+        Returns:
+            (日期, 板块, 条目字典) 元组列表，按日期升序
+        """
+        results = []
+        for date_str in self.list_dates():
+            if (date_from and date_str < date_from) or (date_to and date_str > date_to):
+                continue
+            data = self.load_day(date_str) or {}
+            for section_key, section_data in data.get('sections', {}).items():
+                if section and section_key != section:
+                    continue
+                for item in section_data.get('items', []):
+                    if source and item.get('source') != source:
+                        continue
+                    results.append((date_str, section_key, item))
+                    if limit is not None and len(results) >= limit:
+                        return results
+        return results
+
+    def close(self):
+        """释放存储占用的资源"""
+
+
+class JSONFileStorage(InsightsStorage):
+    """每天一个数据文件的存储（默认JSON格式，可选msgpack格式）
+
+    写入时先持有该日期的跨进程锁，再原子替换文件；读取不加锁，
+    因此写入不会阻塞读取，读取也不会看到写了一半的文件
+    """
+
+    name = 'json'
+
+    def __init__(self, data_dir, file_format=None):
+        """
+        Args:
+            data_dir: 数据目录
+            file_format: 写入的文件格式（'json' 或 'msgpack'），默认读取环境变量 INSIGHTS_FILE_FORMAT；
+                读取时两种格式的文件都可以识别，优先读取该格式
+        """
+        self.data_dir = data_dir
+        self.lock_dir = os.path.join(data_dir, '.locks')
+        self.codec = get_codec(file_format)
+        # 读取时依次尝试的扩展名（写入格式优先）
+        self._extensions = [self.codec.extension] + [
+            codec.extension for codec in CODECS.values() if codec is not self.codec]
+
+    def path_for(self, date_str):
+        """写入时使用的文件路径"""
+        return os.path.join(self.data_dir, f"insights_{date_str}{self.codec.extension}")
+
+    def existing_path(self, date_str):
+        """已存在的数据文件路径（任一格式），不存在时返回 None"""
+        for extension in self._extensions:
+            path = os.path.join(self.data_dir, f"insights_{date_str}{extension}")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _write_day(self, date_str, data):
+        """写入数据文件并删除该日期其他格式的旧文件（需持有该日期的写入锁）"""
+        path = self.path_for(date_str)
+        write_data_file(path, data)
+        for extension in self._extensions[1:]:
+            stale = os.path.join(self.data_dir, f"insights_{date_str}{extension}")
+            if os.path.exists(stale):
+                os.remove(stale)
+
+    def lock_day(self, date_str):
+        """获取指定日期的写入锁（跨进程）"""
+        os.makedirs(self.lock_dir, exist_ok=True)
+        return file_lock(os.path.join(self.lock_dir, f"insights_{date_str}.lock"))
+
+    def load_day(self, date_str):
+        path = self.existing_path(date_str)
+        if path is None:
+            return None
+        return read_data_file(path)
+
+    def save_day(self, date_str, data):
+        os.makedirs(self.data_dir, exist_ok=True)
+        with self.lock_day(date_str):
+            self._write_day(date_str, data)
+        return True
+
+    def merge_items(self, batch, section_meta=None):
+        """在日期写入锁内读取、合并并写回，避免并发合并相互覆盖"""
+        os.makedirs(self.data_dir, exist_ok=True)
+        for date_str, sections in batch.items():
+            with self.lock_day(date_str):
+                data = merge_into_day(self.load_day(date_str), date_str, sections, section_meta)
+                self._write_day(date_str, data)
+        return list(batch)
+
+    def signature(self, date_str):
+        path = self.existing_path(date_str)
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (path, stat.st_mtime_ns, stat.st_size)
+
+    def list_dates(self):
+        if not os.path.isdir(self.data_dir):
+            return []
+        dates = set()
+        for filename in os.listdir(self.data_dir):
+            date_part = parse_date_filename(filename)
+            if date_part:
+                dates.add(date_part)
+        return sorted(dates)
+
+    def dates_signature(self):
+        # 目录中增删文件会改变目录的修改时间
+        try:
+            return os.stat(self.data_dir).st_mtime_ns
+        except OSError:
+            return None
+
+
+class SQLiteStorage(InsightsStorage):
+    """单文件SQLite存储（WAL模式，条目按行存储）"""
+
+    name = 'sqlite'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS days (
+            date TEXT PRIMARY KEY,
+            meta TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 1,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS sections (
+            date TEXT NOT NULL,
+            section TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            meta TEXT NOT NULL,
+            PRIMARY KEY (date, section)
+        );
+        CREATE TABLE IF NOT EXISTS items (
+            id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            section TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            title TEXT,
+            description TEXT,
+            who TEXT,
+            impact TEXT,
+            item_date TEXT,
+            source TEXT,
+            highlight INTEGER,
+            extra TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_items_date_section ON items (date, section, position);
+        CREATE INDEX IF NOT EXISTS idx_items_section_date ON items (section, date);
+        CREATE INDEX IF NOT EXISTS idx_items_source ON items (source, date);
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(self.SCHEMA)
+        conn.commit()
+
+    def _connection(self):
+        """每个线程使用独立的连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def load_day(self, date_str):
+        conn = self._connection()
+        row = conn.execute('SELECT meta FROM days WHERE date = ?', (date_str,)).fetchone()
+        if row is None:
+            return None
+        data = loads(row[0])
+        sections = {}
+        for section_key, meta in conn.execute(
+                'SELECT section, meta FROM sections WHERE date = ? ORDER BY position', (date_str,)):
+            section_data = loads(meta)
+            section_data['items'] = []
+            sections[section_key] = section_data
+        for row in conn.execute(
+                'SELECT section, title, description, who, impact, item_date, source, highlight, extra '
+                'FROM items WHERE date = ? ORDER BY section, position', (date_str,)):
+            section_data = sections.setdefault(row[0], {'items': []})
+            section_data['items'].append(self._row_to_item(row[1:]))
+        data['sections'] = sections
+        return data
+
+    @staticmethod
+    def _row_to_item(row):
+        title, description, who, impact, item_date, source, highlight, extra = row
+        item = {}
+        for field, value in zip(ITEM_FIELDS, (title, description, who, impact, item_date, source)):
+            if value is not None:
+                item[field] = value
+        if highlight is not None:
+            item['highlight'] = bool(highlight)
+        if extra:
+            item.update(loads(extra))
+        return item
+
+    @staticmethod
+    def _item_to_row(date_str, section_key, position, item):
+        extra = {k: v for k, v in item.items() if k not in ITEM_FIELDS}
+        highlight = item.get('highlight')
+        return (
+            date_str, section_key, position,
+            item.get('title'), item.get('description'), item.get('who'), item.get('impact'),
+            item.get('date'), item.get('source'),
+            None if highlight is None else int(bool(highlight)),
+            json.dumps(extra, ensure_ascii=False) if extra else None,
+        )
+
+    def _write_day(self, conn, date_str, data):
+        """在当前事务中写入一天的数据（覆盖已有数据）"""
+        meta = {k: v for k, v in data.items() if k != 'sections'}
+        conn.execute('DELETE FROM items WHERE date = ?', (date_str,))
+        conn.execute('DELETE FROM sections WHERE date = ?', (date_str,))
+        conn.execute(
+            'INSERT INTO days (date, meta, version, updated_at) VALUES (?, ?, 1, ?) '
+            'ON CONFLICT(date) DO UPDATE SET meta = excluded.meta, '
+            'version = days.version + 1, updated_at = excluded.updated_at',
+            (date_str, json.dumps(meta, ensure_ascii=False), time.time()))
+        section_rows = []
+        item_rows = []
+        for position, (section_key, section_data) in enumerate((data.get('sections') or {}).items()):
+            section_meta = {k: v for k, v in section_data.items() if k != 'items'}
+            section_rows.append((date_str, section_key, position, json.dumps(section_meta, ensure_ascii=False)))
+            for item_position, item in enumerate(section_data.get('items', [])):
+                item_rows.append(self._item_to_row(date_str, section_key, item_position, item))
+        conn.executemany('INSERT INTO sections (date, section, position, meta) VALUES (?, ?, ?, ?)', section_rows)
+        conn.executemany(
+            'INSERT INTO items (date, section, position, title, description, who, impact, '
+            'item_date, source, highlight, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', item_rows)
+
+    def save_day(self, date_str, data):
+        conn = self._connection()
+        with conn:
+            self._write_day(conn, date_str, data)
+        return True
+
+    def save_days(self, days):
+        """在一个事务中批量保存多天的数据
+        Args:
+            days: (日期, 数据) 元组的可迭代对象
+        Returns:
+            保存的天数
+        """
+        conn = self._connection()
+        count = 0
+        with conn:
+            for date_str, data in days:
+                self._write_day(conn, date_str, data)
+                count += 1
+        return count
+
+    def merge_items(self, batch, section_meta=None):
+        """在一个事务中合并多个日期的新条目，只写入变化的行"""
+        section_meta = section_meta or {}
+        conn = self._connection()
+        now = time.time()
+        with conn:
+            for date_str, sections in batch.items():
+                cursor = conn.execute(
+                    'UPDATE days SET version = version + 1, updated_at = ? WHERE date = ?', (now, date_str))
+                if cursor.rowcount == 0:
+                    conn.execute(
+                        'INSERT INTO days (date, meta, version, updated_at) VALUES (?, ?, 1, ?)',
+                        (date_str, json.dumps({'date': display_date(date_str)}, ensure_ascii=False), now))
+                for section_key, items in sections.items():
+                    exists = conn.execute(
+                        'SELECT 1 FROM sections WHERE date = ? AND section = ?', (date_str, section_key)).fetchone()
+                    if exists is None:
+                        position = conn.execute(
+                            'SELECT COALESCE(MAX(position) + 1, 0) FROM sections WHERE date = ?',
+                            (date_str,)).fetchone()[0]
+                        conn.execute(
+                            'INSERT INTO sections (date, section, position, meta) VALUES (?, ?, ?, ?)',
+                            (date_str, section_key, position,
+                             json.dumps(section_meta.get(section_key, {}), ensure_ascii=False)))
+                    existing = {}
+                    next_position = 0
+                    for row in conn.execute(
+                            'SELECT id, position, title, description, who, impact, item_date, source, '
+                            'highlight, extra FROM items WHERE date = ? AND section = ?',
+                            (date_str, section_key)):
+                        existing[row[2]] = (row[0], self._row_to_item(row[2:]))
+                        next_position = max(next_position, row[1] + 1)
+                    # 先合并同一批次中标题相同的条目
+                    for item in merge_section_items([], items):
+                        current = existing.get(item.get('title'))
+                        if current is None:
+                            row = self._item_to_row(date_str, section_key, next_position, item)
+                            conn.execute(
+                                'INSERT INTO items (date, section, position, title, description, who, impact, '
+                                'item_date, source, highlight, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', row)
+                            next_position += 1
+                        else:
+                            item_id, merged = current
+                            merged.update(item)
+                            row = self._item_to_row(date_str, section_key, 0, merged)
+                            conn.execute(
+                                'UPDATE items SET description = ?, who = ?, impact = ?, item_date = ?, '
+                                'source = ?, highlight = ?, extra = ? WHERE id = ?',
+                                row[4:] + (item_id,))
+        return list(batch)
+
+    def signature(self, date_str):
+        row = self._connection().execute(
+            'SELECT version, updated_at FROM days WHERE date = ?', (date_str,)).fetchone()
+        return tuple(row) if row else None
+
+    def list_dates(self):
+        return [row[0] for row in self._connection().execute('SELECT date FROM days ORDER BY date')]
+
+    def dates_signature(self):
+        return tuple(self._connection().execute('SELECT COUNT(*), MAX(updated_at) FROM days').fetchone())
+
+    def query_items(self, date_from=None, date_to=None, section=None, source=None, limit=None):
+        sql = ('SELECT date, section, title, description, who, impact, item_date, source, highlight, extra '
+               'FROM items WHERE 1 = 1')
+        params = []
+        if date_from:
+            sql += ' AND date >= ?'
+            params.append(date_from)
+        if date_to:
+            sql += ' AND date <= ?'
+            params.append(date_to)
+        if section:
+            sql += ' AND section = ?'
+            params.append(section)
+        if source:
+            sql += ' AND source = ?'
+            params.append(source)
+        sql += ' ORDER BY date, section, position'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [(row[0], row[1], self._row_to_item(row[2:]))
+                for row in self._connection().execute(sql, params)]
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def import_json_directory(data_dir, storage, batch_size=200):
+    """将数据目录中的 insights_YYYY-MM-DD.json 文件批量导入到存储中
+    Args:
+        data_dir: JSON数据目录
+        storage: 目标存储（SQLiteStorage 时按批次在单个事务中写入）
+        batch_size: 每个事务写入的天数
+    Returns:
+        (导入天数, 失败的文件列表)
+    """
+    source = JSONFileStorage(data_dir)
+    imported = 0
+    failed = []
+    batch = []
+
+    def flush():
+        nonlocal imported
+        if not batch:
+            return
+        if hasattr(storage, 'save_days'):
+            imported += storage.save_days(batch)
+        else:
+            for date_str, data in batch:
+                storage.save_day(date_str, data)
+                imported += 1
+        batch.clear()
+
+    for date_str in source.list_dates():
+        try:
+            batch.append((date_str, source.load_day(date_str)))
+        except Exception as e:
+            failed.append((source.existing_path(date_str), str(e)))
+            continue
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return imported, failed
+
+
+def create_storage(backend=None, data_dir='data', db_path=None):
+    """根据配置创建存储
+    Args:
+        backend: 'json' 或 'sqlite'，默认读取环境变量 INSIGHTS_STORAGE
+        data_dir: JSON数据目录
+        db_path: SQLite数据库路径，默认读取环境变量 INSIGHTS_DB（默认 data/insights.db）
+    """
+    backend = backend or os.environ.get('INSIGHTS_STORAGE', 'json')
+    if backend == 'sqlite':
+        db_path = db_path or os.environ.get('INSIGHTS_DB', os.path.join(data_dir, 'insights.db'))
+        return SQLiteStorage(db_path)
+    if backend != 'json':
+        print(f"警告: 未知的存储类型 {backend}，使用JSON文件存储")
+    return JSONFileStorage(data_dir)